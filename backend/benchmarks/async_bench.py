@@ -0,0 +1,113 @@
+"""Sync (WSGI) vs async (ASGI) read endpoints under concurrent load.
+
+Drives the same read endpoints through Django's WSGI handler from a thread pool
+and through the ASGI handler from a single event loop, at the same concurrency,
+and reports throughput and latency percentiles. The async path needs a real
+MongoDB server (PyMongo's async client cannot talk to mongomock):
+
+    python -m benchmarks.async_bench --mongo-uri mongodb://localhost:27017 --requests 2000 --concurrency 100
+
+--db (default bench_products) is filled with a --products catalog from
+product.seeds.catalog unless it already holds that many products. With --threads below --concurrency the sync side is
+limited to that many in-flight requests, as a WSGI server would be.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+
+import django
+
+django.setup()
+
+import mongoengine
+from django.conf import settings
+from django.test import AsyncClient, Client
+
+from product.models import Product, ProductCategory
+from product.seeds.catalog import CatalogGenerator, seed_catalog
+
+
+def seed(products):
+    """Make sure the benchmark database holds a `products`-product catalog."""
+    if Product.objects.count() != products:
+        seed_catalog(CatalogGenerator(products, categories=max(1, products // 200)))
+    # The first category is the largest one
+    return ProductCategory.objects.order_by('id').first(), Product.objects.only('id').first()
+
+
+def summarize(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"  {label:<6} {len(latencies) / elapsed:>9,.0f} req/s   p50 {p50:>7.2f} ms   p99 {p99:>7.2f} ms")
+
+
+def run_sync(path, requests, threads):
+    client = Client()
+
+    def call(_):
+        started = time.perf_counter()
+        response = client.get(path)
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(call, range(requests)))
+    return latencies, time.perf_counter() - started
+
+
+async def run_async(path, requests, concurrency):
+    client = AsyncClient()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with gate:
+            started = time.perf_counter()
+            response = await client.get(path)
+            assert response.status_code == 200, response.status_code
+            return time.perf_counter() - started
+
+    await call()  # open the async client's connection pool before timing
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(call() for _ in range(requests)))
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="bench_products")
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threads", type=int, help="Sync worker threads (default: --concurrency).")
+    args = parser.parse_args()
+
+    settings.MONGO_URI, settings.MONGO_DB_NAME = args.mongo_uri, args.db
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    mongoengine.disconnect_all()
+    mongoengine.connect(db=args.db, host=args.mongo_uri)
+
+    category, product = seed(args.products)
+    paths = [
+        "products/?page=3&page_size=20&count=exact",
+        f"products/{product.id}/",
+        "categories/",
+        f"categories/{category.id}/products/",
+    ]
+
+    print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}")
+    for path in paths:
+        print(f"/api/{path}")
+        summarize("sync", *run_sync(f"/api/{path}", args.requests, args.threads or args.concurrency))
+        summarize("async", *asyncio.run(run_async(f"/api/async/{path}", args.requests, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Encode time and bytes on the wire per product list page.
+
+Times JSON encoding of list pages with the stdlib encoder and with orjson (when
+installed), then compresses each page with gzip and brotli (when installed) at
+the levels CompressionMiddleware uses. Pages are built in memory, so no server
+is needed:
+
+    python -m benchmarks.render_bench --page-sizes 10 100 1000 --repeat 20
+"""
+import argparse
+import gzip
+import time
+from unittest.mock import patch
+
+from benchmarks.serialization_bench import make_raw_products
+from django.conf import settings
+
+from product import fast_serializers
+from product.fast_serializers import dumps, product_to_dict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def encode_stdlib(page):
+    with patch.object(fast_serializers, 'orjson', None):
+        return dumps(page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    docs, _ = make_raw_products(max(args.page_sizes))
+    quality = settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+    print(f"best of {args.repeat}; orjson {'on' if fast_serializers.orjson else 'not installed'}, "
+          f"brotli {'quality %d' % quality if brotli else 'not installed'}, "
+          f"compression threshold {settings.RESPONSE_COMPRESSION_MIN_SIZE} bytes")
+
+    for page_size in args.page_sizes:
+        page = {"count": len(docs), "results": [product_to_dict(doc) for doc in docs[:page_size]]}
+        stdlib, body = best_time(lambda: encode_stdlib(page), args.repeat)
+        print(f"page of {page_size}: {len(body):,} bytes of JSON")
+        print(f"  encode  stdlib  {stdlib * 1000:8.3f} ms")
+        if fast_serializers.orjson:
+            fast, fast_body = best_time(lambda: dumps(page), args.repeat)
+            assert fast_body == body, "encoders disagree"
+            print(f"  encode  orjson  {fast * 1000:8.3f} ms   ({stdlib / fast:.1f}x faster)")
+
+        elapsed, compressed = best_time(lambda: gzip.compress(body, compresslevel=6), args.repeat)
+        print(f"  gzip    {elapsed * 1000:8.3f} ms   {len(compressed):>9,} bytes ({len(compressed) / len(body):.0%})")
+        if brotli:
+            elapsed, compressed = best_time(lambda: brotli.compress(body, quality=quality), args.repeat)
+            print(f"  brotli  {elapsed * 1000:8.3f} ms   {len(compressed):>9,} bytes ({len(compressed) / len(body):.0%})")
+
+
+if __name__ == '__main__':
+    main()
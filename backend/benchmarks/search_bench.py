@@ -0,0 +1,84 @@
+"""Latency of product search queries.
+
+Builds a synthetic catalog (product.seeds.catalog) and times ProductService.search_products against the
+in-memory inverted index, so no server is needed:
+
+    python -m benchmarks.search_bench --products 50000 --queries 500
+
+With --mongo-uri the same catalog is loaded into --db (replacing its products)
+and the same queries also run through the MongoDB text index.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+
+import django
+
+django.setup()
+
+import mongoengine
+
+from product.models import Product
+from product.repositories.product_repository import ProductRepository
+from product.search import InMemorySearchIndex
+from product.seeds.catalog import ADJECTIVES, BRANDS, NOUNS, CatalogGenerator
+from product.services.product_service import ProductService
+
+
+def make_catalog(products, seed=42):
+    return list(CatalogGenerator(products, categories=20, seed=seed).iter_products())
+
+
+def make_queries(queries, seed=7):
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(ADJECTIVES + NOUNS + BRANDS, rng.randrange(1, 4))) for _ in range(queries)]
+
+
+def time_queries(queries, page_size):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        ProductService.search_products(query, page_size)
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def summarize(label, latencies):
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"  {label:<10} p50 {p50:>8.3f} ms   p99 {p99:>8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--mongo-uri', help="Also time MongoDB's text index on this server")
+    parser.add_argument('--db', default='bench_products')
+    args = parser.parse_args()
+
+    catalog, queries = make_catalog(args.products), make_queries(args.queries)
+    print(f"{args.products} products, {args.queries} queries, page size {args.page_size}")
+
+    started = time.perf_counter()
+    ProductService.search_backend = InMemorySearchIndex(catalog)
+    print(f"  in-memory index built in {time.perf_counter() - started:.2f} s")
+    summarize("in-memory", time_queries(queries, args.page_size))
+
+    if args.mongo_uri:
+        mongoengine.disconnect()
+        mongoengine.connect(db=args.db, host=args.mongo_uri)
+        Product.drop_collection()
+        Product.ensure_indexes()
+        ProductRepository.insert_many(catalog)
+        ProductService.search_backend = ProductRepository()
+        summarize("mongodb", time_queries(queries, args.page_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Per-row CPU cost of the product read serialization paths.
+
+Compares the Document path (MongoEngine document -> ProductSerializer ->
+FastJSONRenderer) with the raw path used by the read endpoints
+(as_pymongo dict -> product_to_dict -> dumps). Rows are synthesized in memory;
+the serializer only needs a database handle to build its unique validators, so
+the benchmark connects to mongomock (pip install mongomock) unless --mongo-uri
+points at a real server:
+
+    python -m benchmarks.serialization_bench --rows 5000 --repeat 5
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+
+import django
+
+django.setup()
+
+import mongoengine
+from bson import ObjectId
+from product.fast_serializers import dumps, product_to_dict
+from product.models import Product, ProductCategory
+from product.renderers import FastJSONRenderer
+from product.serializers import ProductSerializer
+
+
+def make_raw_products(rows, seed=42):
+    """Build documents shaped exactly like those stored in the products collection."""
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+    category_ids = [ObjectId() for _ in range(20)]
+    docs = []
+    for i in range(rows):
+        created = now - timedelta(seconds=rng.randrange(10_000_000))
+        docs.append({
+            '_id': ObjectId(),
+            'name': f"Product {i}",
+            'description': "Lorem ipsum dolor sit amet " * rng.randrange(1, 8),
+            'category': rng.choice(category_ids),
+            'price': float(Decimal(rng.randrange(1, 500_000)) / 100),
+            'brand': rng.choice(["Dell", "HP", "Apple", "Samsung", "Sony"]),
+            'quantity': rng.randrange(1, 1000),
+            'created_at': created,
+            'updated_at': created + timedelta(seconds=rng.randrange(1_000_000)),
+        })
+    categories = {cid: ProductCategory(id=cid, name=f"Category {n}", description="d") for n, cid in enumerate(category_ids)}
+    return docs, categories
+
+
+def document_path(docs, categories):
+    """Baseline: what the endpoints did before the raw read path."""
+    data = []
+    for son in docs:
+        product = Product._from_son(son)
+        product._data['category'] = categories[son['category']]  # as resolved by ProductService
+        data.append(ProductSerializer(product).data)
+    return FastJSONRenderer().render(data)
+
+
+def raw_path(docs, categories):
+    """Current read endpoints: raw dicts straight to JSON bytes."""
+    return dumps([product_to_dict(son) for son in docs])
+
+
+def best_cpu_time(func, docs, categories, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        func(docs, categories)
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--mongo-uri', help="MongoDB to connect to instead of mongomock")
+    args = parser.parse_args()
+
+    mongoengine.disconnect()
+    if args.mongo_uri:
+        mongoengine.connect(host=args.mongo_uri)
+    else:
+        import mongomock
+        mongoengine.connect("benchmarks", host="mongodb://localhost", mongo_client_class=mongomock.MongoClient)
+
+    docs, categories = make_raw_products(args.rows)
+    assert document_path(docs[:50], categories) == raw_path(docs[:50], categories), "response shapes differ"
+
+    baseline = best_cpu_time(document_path, docs, categories, args.repeat)
+    fast = best_cpu_time(raw_path, docs, categories, args.repeat)
+    per_row = lambda seconds: seconds / args.rows * 1e6
+
+    print(f"rows: {args.rows}, best of {args.repeat} (CPU time)")
+    print(f"  document path: {per_row(baseline):8.2f} us/row")
+    print(f"  raw path:      {per_row(fast):8.2f} us/row")
+    print(f"  saved:         {per_row(baseline - fast):8.2f} us/row ({baseline / fast:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""Latency, throughput and MongoDB round-trips of the API hot paths.
+
+Each operation goes through the whole stack (URL routing, controller, service,
+repository) via Django's test client, against a local mongod or, by default,
+mongomock:
+
+    python -m benchmarks.suite --sizes 1000 100000 1000000 --mongo-uri mongodb://localhost:27017
+    python -m benchmarks.suite --sizes 1000 --save benchmarks/baselines/mongomock.json
+    python -m benchmarks.suite --sizes 1000 --compare benchmarks/baselines/mongomock.json
+
+Every catalog size gets its own database (<db>_<size>), filled by
+product.seeds.catalog on first use and reused afterwards, so large catalogs are
+only generated once. For each operation the suite reports p50/p99 latency,
+operations per second (one client, back to back) and MongoDB commands per
+operation. mongomock does not emit command events, so round-trips are only
+reported against a real server.
+
+--save writes the results as JSON; --compare diffs a run against such a file
+and exits with status 1 when an operation's p50 or round-trips regressed by
+more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+
+import django
+
+django.setup()
+
+import mongoengine
+from django.conf import settings
+from django.test import Client
+from pymongo import monitoring
+
+from product.models import Product, ProductCategory
+from product.seeds.catalog import CatalogGenerator, seed_catalog
+from product.services.product_category_service import ProductCategoryService
+from product.services.product_count_service import ProductCountService
+from product.services.product_facet_service import ProductFacetService
+
+PAGE_SIZE = 20
+PRODUCTS_PER_CATEGORY = 200
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts the commands sent to the server (each one a round-trip)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def connect(mongo_uri, db, counter):
+    mongoengine.disconnect_all()
+    if mongo_uri:
+        mongoengine.connect(db=db, host=mongo_uri, event_listeners=[counter])
+    else:
+        import mongomock
+        mongoengine.connect(db, host="mongodb://localhost", mongo_client_class=mongomock.MongoClient)
+    # Caches must not carry results over from another catalog
+    ProductCategoryService.invalidate_cache()
+    ProductCountService.invalidate()
+    ProductFacetService.invalidate_cache()
+
+
+def seed(size, seed):
+    """Fill the connected database with a `size`-product catalog unless it already holds one."""
+    if Product.objects.count() == size:
+        return
+    generator = CatalogGenerator(size, max(1, size // PRODUCTS_PER_CATEGORY), seed)
+    seconds = seed_catalog(
+        generator, on_progress=lambda done: print(f"  seeded {done:,}/{size:,} products", end="\r", file=sys.stderr)
+    )
+    print(f"  seeded {size:,} products in {seconds:.1f} s", file=sys.stderr)
+
+
+def operations(size, rng):
+    """Name -> callable(client) issuing one request; each checks its status code."""
+    product_ids = [str(doc['_id']) for doc in Product.objects.only('id').as_pymongo().limit(1000)]
+    category_ids = [str(doc['_id']) for doc in ProductCategory.objects.only('id').as_pymongo().limit(1000)]
+    deep_page = max(1, int(size * 0.9) // PAGE_SIZE)
+    created = iter(range(10 ** 9))
+
+    def call(method, path, expected, **kwargs):
+        def run(client):
+            response = getattr(client, method)(path() if callable(path) else path, **kwargs)
+            assert response.status_code == expected, (path, response.status_code)
+        return run
+
+    def create(client):
+        response = client.post("/api/products/", {
+            "name": f"Bench new {os.getpid()}-{time.time_ns()}-{next(created)}", "description": "Created by the suite",
+            "category": rng.choice(category_ids), "price": "19.99", "brand": "Bench", "quantity": 5,
+        }, content_type="application/json")
+        assert response.status_code == 201, response.status_code
+
+    def update(client):
+        response = client.put(
+            f"/api/products/{rng.choice(product_ids)}/", {"quantity": rng.randrange(1, 1000)}, content_type="application/json"
+        )
+        assert response.status_code == 200, response.status_code
+
+    return {
+        "list_first_page": call("get", f"/api/products/?page=1&page_size={PAGE_SIZE}", 200),
+        "list_deep_offset": call("get", f"/api/products/?page={deep_page}&page_size={PAGE_SIZE}", 200),
+        "detail": call("get", lambda: f"/api/products/{rng.choice(product_ids)}/", 200),
+        "create": create,
+        "update": update,
+        "category_products": call("get", lambda: f"/api/categories/{rng.choice(category_ids)}/products/", 200),
+        "category_list": call("get", "/api/categories/", 200),
+    }
+
+
+def measure(operation, client, counter, ops, warmup):
+    for _ in range(warmup):
+        operation(client)
+    latencies, commands = [], counter.count
+    started = time.perf_counter()
+    for _ in range(ops):
+        begun = time.perf_counter()
+        operation(client)
+        latencies.append(time.perf_counter() - begun)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+        "ops_per_sec": round(ops / elapsed, 1),
+        "round_trips": round((counter.count - commands) / ops, 2),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the change of each metric against a baseline run; return whether anything regressed."""
+    regressed = False
+    for size, operations_ in results.items():
+        for name, current in operations_.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if previous is None:
+                continue
+            changes = []
+            for metric in ("p50_ms", "p99_ms", "ops_per_sec", "round_trips"):
+                before, after = previous.get(metric), current.get(metric)
+                if before in (None, 0) or after is None:
+                    continue
+                change = (after - before) / before
+                # Lower is better except for throughput; p99 is too noisy to fail a run on
+                worse = -change if metric == "ops_per_sec" else change
+                flag = " !" if worse > threshold and metric in ("p50_ms", "round_trips") else ""
+                regressed = regressed or bool(flag)
+                changes.append(f"{metric} {change:+.0%}{flag}")
+            print(f"  {size:>9} {name:<18} {'   '.join(changes)}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--ops", type=int, default=200, help="Timed operations per benchmark")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", nargs="+", help="Run only these operations")
+    parser.add_argument("--mongo-uri", help="Benchmark this server instead of mongomock")
+    parser.add_argument("--db", default="bench_suite", help="Database name prefix")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Diff against results saved by an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    counter, client = CommandCounter(), Client()
+    backend = "mongodb" if args.mongo_uri else "mongomock"
+    results = {}
+
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        connect(args.mongo_uri, f"{args.db}_{size}", counter)
+        seed(size, args.seed)
+        print(f"{size:,} products ({backend}), {args.ops} ops each")
+        print(f"  {'operation':<18} {'p50 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'round-trips':>12}")
+        results[str(size)] = {}
+        for name, operation in operations(size, rng).items():
+            if args.only and name not in args.only:
+                continue
+            result = measure(operation, client, counter, args.ops, args.warmup)
+            if not args.mongo_uri:
+                result["round_trips"] = None
+            results[str(size)][name] = result
+            round_trips = "n/a" if result["round_trips"] is None else f"{result['round_trips']:.2f}"
+            print(f"  {name:<18} {result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['ops_per_sec']:>9,.0f} {round_trips:>12}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({
+                "meta": {
+                    "backend": backend, "ops": args.ops, "page_size": PAGE_SIZE, "seed": args.seed,
+                    "python": platform.python_version(), "machine": platform.machine(),
+                    "recorded_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                },
+                "results": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Against {args.compare} ({baseline.get('meta', {}).get('backend')}):")
+        if compare(results, baseline, args.threshold):
+            print(f"Regressions beyond {args.threshold:.0%} are marked with !")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
-from mongoengine import connect
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,7 +45,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its total covers every other middleware; removes itself unless INSTRUMENTATION_ENABLED
+    "product.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Compresses the finished response, so it must run after every middleware that edits the body
+    "product.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -55,6 +59,36 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
 ]
 
+# Per-request timing of the controller/service/repository/serialize layers and MongoDB
+# commands, reported in a Server-Timing header and a JSON line on the product.instrumentation
+# logger. Read at startup: when off, nothing is wrapped and the middleware is not installed.
+INSTRUMENTATION_ENABLED = os.environ.get("INSTRUMENTATION_ENABLED", "false").lower() in ("1", "true", "yes")
+INSTRUMENTATION_SERVER_TIMING = True  # Set False to keep the header from clients and only log
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "product.instrumentation": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+# DRF responses are encoded by fast_serializers.dumps (orjson when installed), which renders
+# datetimes in IST, Decimals as strings and ObjectIds as hex ids
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "product.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes are compressed: brotli when the
+# client accepts it and the brotli package is installed, gzip otherwise
+RESPONSE_COMPRESSION_MIN_SIZE = 1024  # bytes
+RESPONSE_COMPRESSION_BROTLI = True
+RESPONSE_COMPRESSION_BROTLI_QUALITY = 4  # 0-11; 4 compresses about as well as gzip -6, faster
+
 CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
     "http://localhost:3000",
@@ -91,18 +125,69 @@ WSGI_APPLICATION = "django_app.wsgi.application"
 #     }
 # }
 
-# MongoDB connection configuration
-MONGO_DB_NAME = "products_db"
-MONGO_HOST = "localhost"
-MONGO_PORT = 27018
-MONGO_USERNAME = "root"
-MONGO_PASSWORD = "example"
+# MongoDB connection configuration (override through the environment)
+MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME", "products_db")
+MONGO_HOST = os.environ.get("MONGO_HOST", "localhost")
+MONGO_PORT = int(os.environ.get("MONGO_PORT", 27018))
+MONGO_USERNAME = os.environ.get("MONGO_USERNAME", "root")
+MONGO_PASSWORD = os.environ.get("MONGO_PASSWORD", "example")
 
-connect(
-    db=MONGO_DB_NAME,
-    host=f"mongodb://{MONGO_USERNAME}:{MONGO_PASSWORD}@{MONGO_HOST}:{MONGO_PORT}/?authSource=admin"
+MONGO_URI = os.environ.get(
+    "MONGO_URI",
+    f"mongodb://{MONGO_USERNAME}:{MONGO_PASSWORD}@{MONGO_HOST}:{MONGO_PORT}/?authSource=admin",
 )
 
+# Client options for every process's MongoDB clients; None / "" leaves the driver default.
+# Each worker process opens its own pool, so the server sees up to workers * MONGO_MAX_POOL_SIZE
+# connections (plus the async views' pool under ASGI). Utilization: GET /api/db/pool-stats/.
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": int(os.environ.get("MONGO_MAX_POOL_SIZE", 100)),
+    "minPoolSize": int(os.environ.get("MONGO_MIN_POOL_SIZE", 0)),
+    "maxIdleTimeMS": os.environ.get("MONGO_MAX_IDLE_TIME_MS"),
+    "waitQueueTimeoutMS": os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+    "connectTimeoutMS": os.environ.get("MONGO_CONNECT_TIMEOUT_MS"),
+    "serverSelectionTimeoutMS": os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS"),
+    "socketTimeoutMS": os.environ.get("MONGO_SOCKET_TIMEOUT_MS"),
+    "compressors": os.environ.get("MONGO_COMPRESSORS"),  # e.g. "zstd,snappy,zlib"
+    "readConcernLevel": os.environ.get("MONGO_READ_CONCERN"),  # e.g. "local", "majority"
+}
+
+# Connections are registered lazily in ProductConfig.ready() and reset after fork (see product.db)
+
+# Total counts for paginated product listings: exact | estimated | cached | incremental | none
+# (see product.services.product_count_service). Clients may override per request with ?count=.
+PRODUCT_COUNT_MODE = "cached"
+PRODUCT_COUNT_TTL = 30  # seconds
+
+# Filtered listings: the most matches a query may sort in memory when no index gives its order
+# (see product.query_planner); beyond it the listing falls back to an index scan or is refused.
+PRODUCT_QUERY_SORT_CAP = 10000
+
+# GET /api/products/facets/: results cached per filter and dropped on product writes;
+# price histogram bucket lower bounds (the last bucket is open-ended) and the most categories/brands listed
+PRODUCT_FACET_CACHE_SIZE = 256
+PRODUCT_FACET_CACHE_TTL = 60  # seconds
+PRODUCT_FACET_PRICE_BOUNDARIES = (0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+PRODUCT_FACET_LIMIT = 50
+
+# Products written per insert_many by bulk creation (POST /api/products/ with a JSON array or NDJSON body)
+PRODUCT_BULK_CHUNK_SIZE = 1000
+
+# Documents per cursor batch when streaming GET /api/products/export/
+PRODUCT_EXPORT_BATCH_SIZE = 1000
+
+# Category deletes: up to CATEGORY_DELETE_INLINE_LIMIT products are removed in the request;
+# larger cascades return 202 and run on BACKGROUND_JOB_WORKERS threads in batches of
+# CATEGORY_DELETE_BATCH_SIZE, pausing CATEGORY_DELETE_PAUSE seconds between batches
+CATEGORY_DELETE_INLINE_LIMIT = 1000
+CATEGORY_DELETE_BATCH_SIZE = 1000
+CATEGORY_DELETE_PAUSE = 0.05  # seconds
+BACKGROUND_JOB_WORKERS = 1
+
+# In-process category cache (LRU + TTL), cleared on every category write
+CATEGORY_CACHE_SIZE = 1024
+CATEGORY_CACHE_TTL = 60  # seconds
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ProductConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'product'
+
+    def ready(self):
+        # Lazy: no socket is opened until the first query, so this is safe before a pre-fork server forks
+        from product import db
+        db.connect()
@@ -0,0 +1,57 @@
+"""HTTP validators (ETag / Last-Modified) for conditional GETs.
+
+Controllers compute validators from a projection-only query (``_id`` and
+``updated_at``) or from cached data, and answer 304 before fetching or
+serializing the full resource when the client's copy is still current.
+
+Only single documents get Last-Modified. A page's newest updated_at does not
+move when a row is deleted or older rows shift into it, so collection pages are
+validated by ETag alone. List ETags cover the total but not its count_type
+label, which the cached count mode flips between exact and estimated.
+"""
+import hashlib
+from calendar import timegm
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# Projection that is enough to compute product validators; _id is always included
+VERSION_FIELDS = ('updated_at',)
+
+
+def is_conditional(request):
+    """Whether the request carries validators worth checking before a full fetch."""
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def make_etag(*parts):
+    """Strong ETag derived from the given values."""
+    return quote_etag(hashlib.md5(repr(parts).encode('utf-8'), usedforsecurity=False).hexdigest())
+
+
+def versions_etag(documents, *extra):
+    """ETag for raw documents projected to _id and updated_at, plus any extra page state."""
+    return make_etag(*extra, *[(str(doc['_id']), doc.get('updated_at')) for doc in documents])
+
+
+def last_modified(documents):
+    """Latest updated_at among raw documents, as a POSIX timestamp (None if unknown)."""
+    stamps = [doc['updated_at'] for doc in documents if doc.get('updated_at')]
+    return timegm(max(stamps).utctimetuple()) if stamps else None
+
+
+def not_modified(request, etag, modified=None):
+    """Return a 304 carrying the validators if the client's copy is current, else None."""
+    response = get_conditional_response(request, etag=etag, last_modified=modified)
+    if isinstance(response, HttpResponseNotModified):
+        return set_validators(response, etag, modified)
+    return None
+
+
+def set_validators(response, etag, modified=None):
+    """Attach ETag (and Last-Modified when known) to a response."""
+    response['ETag'] = etag
+    if modified is not None:
+        response['Last-Modified'] = http_date(modified)
+    return response
@@ -0,0 +1,8 @@
+from django.conf import settings
+
+
+def get_setting(name, default):
+    """Read an optional project setting, falling back to the default outside a configured Django process."""
+    if not settings.configured:
+        return default
+    return getattr(settings, name, default)
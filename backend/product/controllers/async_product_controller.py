@@ -0,0 +1,101 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.views import View
+from rest_framework import status
+from product.services.async_product_service import AsyncProductService, AsyncProductCategoryService
+from product.services.product_count_service import ProductCountService
+from product.fast_serializers import category_to_dict, json_response, product_to_dict
+from product.conditional import last_modified, make_etag, not_modified, set_validators, versions_etag
+from product.db import close_async_client
+from bson import ObjectId
+from urllib.parse import urlencode
+
+# Plain async Django views: DRF's APIView is sync-only, and these read paths must not hold a thread
+# while waiting on MongoDB. Responses match the sync endpoints byte for byte.
+
+def validated(request, response, etag, modified=None):
+    """Answer 304 if the client's validators match, else attach them to the response."""
+    return not_modified(request, etag, modified) or set_validators(response, etag, modified)
+
+class AsyncMongoView(View):
+    """Async view that does not leave a MongoDB client behind on a single-use event loop."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        finally:
+            # Under WSGI, async_to_sync gives each request a new loop; its client would never be reused
+            if not isinstance(request, ASGIRequest):
+                await close_async_client()
+
+class AsyncProductController(AsyncMongoView):
+    """Async product list and detail reads."""
+
+    async def get(self, request, product_id=None):
+        """Fetch all products or a single product by ID."""
+        try:
+            if product_id:
+                if not ObjectId.is_valid(product_id):
+                    return json_response({"error": "Invalid product ID."}, status=status.HTTP_400_BAD_REQUEST)
+                product = await AsyncProductService.get_product_by_id(product_id)
+                if not product:
+                    return json_response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
+                response = json_response(product_to_dict(product), status=status.HTTP_200_OK)
+                return validated(request, response, versions_etag([product]), last_modified([product]))
+
+            if "cursor" in request.GET:
+                return await self._get_by_cursor(request)
+
+            page = int(request.GET.get("page", 1))
+            page_size = int(request.GET.get("page_size", 5))
+            products, has_next = await AsyncProductService.get_all_products(page=page, page_size=page_size)
+            total_count, count_type = await ProductCountService.aget_count(request.GET.get("count"))
+
+            response = json_response({
+                "count": total_count,
+                "count_type": count_type,
+                "next": f"{request.build_absolute_uri(request.path)}?page={page + 1}" if has_next else None,
+                "previous": f"{request.build_absolute_uri(request.path)}?page={page - 1}" if page > 1 else None,
+                "results": [product_to_dict(product) for product in products]
+            }, status=status.HTTP_200_OK)
+            return validated(request, response, versions_etag(products, total_count, has_next))
+
+        except ValueError as e:
+            return json_response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    async def _get_by_cursor(self, request):
+        """Fetch a keyset page of products addressed by an opaque cursor."""
+        page_size = int(request.GET.get("page_size", 5))
+        products, next_cursor, prev_cursor = await AsyncProductService.get_products_by_cursor(
+            cursor=request.GET.get("cursor") or None,
+            page_size=page_size,
+            sort_by=request.GET.get("sort_by"),
+            order=request.GET.get("order", "asc"),
+        )
+
+        base_url = request.build_absolute_uri(request.path)
+        response = json_response({
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "next": f"{base_url}?{urlencode({'cursor': next_cursor, 'page_size': page_size})}" if next_cursor else None,
+            "previous": f"{base_url}?{urlencode({'cursor': prev_cursor, 'page_size': page_size})}" if prev_cursor else None,
+            "results": [product_to_dict(product) for product in products]
+        }, status=status.HTTP_200_OK)
+        return validated(request, response, versions_etag(products, next_cursor, prev_cursor))
+
+class AsyncProductCategoryController(AsyncMongoView):
+    """Async category list and products-by-category reads."""
+
+    async def get(self, request, category_id=None, products=False):
+        """Retrieve all categories or the products of one category."""
+        if products and category_id:
+            if not ObjectId.is_valid(category_id):
+                return json_response({"error": "Invalid category ID."}, status=status.HTTP_400_BAD_REQUEST)
+            products_list = await AsyncProductService.get_product_by_category(category_id)
+            if not products_list:
+                return json_response({"message": "No products found for this category"}, status=status.HTTP_404_NOT_FOUND)
+            response = json_response([product_to_dict(product) for product in products_list], status=status.HTTP_200_OK)
+            return validated(request, response, versions_etag(products_list))
+
+        categories = [category_to_dict(category) for category in await AsyncProductCategoryService.get_all_categories()]
+        etag = make_etag(*[(category['id'], category['name'], category['description']) for category in categories])
+        return validated(request, json_response(categories, status=status.HTTP_200_OK), etag)
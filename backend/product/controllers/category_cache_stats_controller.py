@@ -0,0 +1,11 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from product.services.product_category_service import ProductCategoryService
+
+class CategoryCacheStatsController(APIView):
+    """Reports the in-process category cache's hit rate for the serving process."""
+
+    def get(self, request):
+        """Hits, misses and size of the category cache."""
+        return Response(ProductCategoryService.cache_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,15 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from product.services.product_category_service import ProductCategoryService
+from product.fast_serializers import deletion_job_to_dict
+
+class CategoryDeletionJobController(APIView):
+    """Reports the progress of background category deletes."""
+
+    def get(self, request, job_id):
+        """Status, products deleted so far and errors of a category delete job."""
+        job = ProductCategoryService.get_deletion_job(job_id)
+        if job is None:
+            return Response({"error": "Deletion job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(deletion_job_to_dict(job), status=status.HTTP_200_OK)
@@ -0,0 +1,11 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from product import db
+
+class DatabasePoolController(APIView):
+    """Reports MongoDB connection pool utilization for the serving process."""
+
+    def get(self, request):
+        """Open / checked-out connections and checkout waits per server, for sizing workers."""
+        return Response(db.pool_stats(), status=status.HTTP_200_OK)
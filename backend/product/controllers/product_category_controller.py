@@ -4,63 +4,107 @@ from rest_framework import status
 
 from product.services.product_category_service import ProductCategoryService
 from product.serializers import ProductCategorySerializer
-from product.serializers import ProductSerializer
+from product.fast_serializers import deletion_job_to_dict, json_response, parse_fields, product_to_dict, read_fields
+from product.models import CategoryDeletionJob
+from django.urls import reverse
+from product.conditional import (
+    VERSION_FIELDS, is_conditional, make_etag, not_modified, set_validators, versions_etag,
+)
 from ..services.product_service import ProductService 
-import pytz
 
-# Function to convert UTC to IST
-def convert_utc_to_ist(utc_time):
-    kolkata_timezone = pytz.timezone('Asia/Kolkata')
-    # Ensure the datetime is in UTC before conversion
-    utc_time = utc_time.replace(tzinfo=pytz.utc)
-    # Convert to IST
-    return utc_time.astimezone(kolkata_timezone)
+DELETION_WINDOW_NOTE = (
+    "The category is no longer returned by category endpoints. Its products are deleted in batches and "
+    "remain visible in product listings, search, exports and facets until the job reports 'done'."
+)
+
+def category_etag(*categories):
+    """ETag over the category fields that make up the response body."""
+    return make_etag(*[(str(category.id), category.name, category.description) for category in categories])
 
 class ProductCategoryController(APIView):
     """Controller layer for handling product category HTTP requests."""
 
     def get(self, request, category_id=None, products=False):
         """Retrieve all categories, a specific one by ID, or products by category."""
-
         if products and category_id:
+            try:
+                fields = parse_fields(request.GET.get("fields"))
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            variant = (fields,) if fields else ()
+
+            if is_conditional(request):
+                # Decide 304 from a projection of _id/updated_at before loading the products
+                versions = list(ProductService.get_product_by_category(category_id, raw=True, fields=VERSION_FIELDS))
+                unchanged = versions and not_modified(request, versions_etag(versions, *variant))
+                if unchanged:
+                    return unchanged
+
             # Fetch products belonging to the category using the service layer
-            products = ProductService.get_product_by_category(category_id)
-            products_data = []
-            for product in products:
-                product_data = ProductSerializer(product).data
-                product_data["created_at"] = convert_utc_to_ist(product.created_at).strftime("%Y-%m-%d %H:%M:%S")
-                product_data["updated_at"] = convert_utc_to_ist(product.updated_at).strftime("%Y-%m-%d %H:%M:%S")
-                products_data.append(product_data)
-
-            if not products:
+            products_list = list(ProductService.get_product_by_category(category_id, raw=True, fields=read_fields(fields)))
+
+            if not products_list:
                 return Response({"message": "No products found for this category"}, status=status.HTTP_404_NOT_FOUND)
 
-            return Response(products_data, status=status.HTTP_200_OK)
+            response = json_response([product_to_dict(product, fields) for product in products_list], status=status.HTTP_200_OK)
+            return set_validators(response, versions_etag(products_list, *variant))
 
+        # Categories are served from the in-process cache, so validators cost no database call
         if category_id:
             category = ProductCategoryService.get_category_by_id(category_id)
 
             if category:
+                etag = category_etag(category)
+                unchanged = not_modified(request, etag)
+                if unchanged:
+                    return unchanged
                 serializer = ProductCategorySerializer(category)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                return set_validators(Response(serializer.data, status=status.HTTP_200_OK), etag)
 
             return Response({"error": "Category not found"}, status=status.HTTP_404_NOT_FOUND)
 
         categories = ProductCategoryService.get_all_categories()
+        etag = category_etag(*categories)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
         serializer = ProductCategorySerializer(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), etag)
     
     def post(self, request):
         """Create one or multiple categories."""
+        if isinstance(request.data, list):
+            return self._bulk_create(request)
+
         serializer = ProductCategorySerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        categories = ProductCategoryService.create_category(serializer.validated_data)
+        try:
+            categories = ProductCategoryService.create_category(serializer.validated_data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         if categories:
             return Response(ProductCategorySerializer(categories).data, status=status.HTTP_200_OK)
         else:
             return Response({"message": "No new categories inserted (duplicates skipped)"}, status=status.HTTP_200_OK)
+
+    def _bulk_create(self, request):
+        """Create many categories; ?skip_duplicates=true skips existing names instead of failing."""
+        # Items are validated by the service rather than ProductCategorySerializer, whose
+        # unique-name validator would query MongoDB once per item.
+        skip_duplicates = request.GET.get("skip_duplicates", "").lower() in ("1", "true", "yes")
+        try:
+            categories, skipped = ProductCategoryService.create_categories(request.data, skip_duplicates=skip_duplicates)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not categories:
+            return Response({"message": "No new categories inserted (duplicates skipped)", "skipped": skipped}, status=status.HTTP_200_OK)
+        return Response({
+            "inserted": ProductCategorySerializer(categories, many=True).data,
+            "skipped": skipped,
+        }, status=status.HTTP_200_OK)
     
     def put(self, request, category_id):
         """Update a category."""
@@ -81,9 +125,19 @@ class ProductCategoryController(APIView):
         return Response({"error": "Failed to update category"}, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, category_id):
-        """Delete a category."""
+        """Delete a category; large cascades answer 202 with a job to poll.
+
+        While the job runs the category is gone from category reads, but its
+        remaining products still appear in product listings, search, exports and
+        facets until their batch is deleted; the 202 body says so.
+        """
         deleted = ProductCategoryService.delete_category(category_id)
 
+        if isinstance(deleted, CategoryDeletionJob):
+            status_url = request.build_absolute_uri(reverse('category_deletion_job', args=[str(deleted.id)]))
+            data = dict(deletion_job_to_dict(deleted), status_url=status_url, note=DELETION_WINDOW_NOTE)
+            return Response(data, status=status.HTTP_202_ACCEPTED, headers={"Location": status_url})
+
         if deleted:
             return Response({"message": "Category deleted"}, status=status.HTTP_204_NO_CONTENT)
 
@@ -1,98 +1,170 @@
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
-from product.services.product_service import ProductService
-from product.serializers import ProductSerializer
+from rest_framework.settings import api_settings
+from product.services.product_service import ProductService, ProductNotFoundError
+from product.services.product_count_service import ProductCountService
+from product.serializers import ProductSerializer, ProductUpdateSerializer
+from product.fast_serializers import json_response, parse_fields, product_to_dict, read_fields
+from product.conditional import VERSION_FIELDS, is_conditional, last_modified, not_modified, set_validators, versions_etag
+from product.parsers import NDJSONParser
+from product.query_planner import FILTER_PARAMS, parse_filters
 from mongoengine import DoesNotExist, ValidationError, NotUniqueError
 from bson import ObjectId
-import pytz
-from datetime import datetime
-
-# Function to convert UTC to IST
-def convert_utc_to_ist(utc_time):
-    kolkata_timezone = pytz.timezone('Asia/Kolkata')
-    # Ensure the datetime is in UTC before conversion
-    utc_time = utc_time.replace(tzinfo=pytz.utc)
-    # Convert to IST
-    return utc_time.astimezone(kolkata_timezone)
+from urllib.parse import urlencode
 
 class ProductController(APIView):
     """Handles HTTP requests for product management."""
 
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [NDJSONParser]
+
     def get(self, request, product_id=None):
-        """Fetch all products or a single product by ID."""
+        """Fetch all products or a single product by ID; ?fields=a,b returns only those fields."""
         try:
+            # Sparse fieldsets are projected in MongoDB; the ETag varies with the fieldset
+            fields = parse_fields(request.GET.get("fields"))
+            variant = (fields,) if fields else ()
+
             if product_id:
                 if not ObjectId.is_valid(product_id):
                     return Response({"error": "Invalid product ID."}, status=status.HTTP_400_BAD_REQUEST)
 
-                product = ProductService.get_product_by_id(str(product_id))
+                if is_conditional(request):
+                    # Decide 304 from a projection of _id/updated_at before loading the product
+                    version = ProductService.get_product_by_id(str(product_id), raw=True, fields=VERSION_FIELDS)
+                    if not version:
+                        return Response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
+                    unchanged = not_modified(request, versions_etag([version], *variant), last_modified([version]))
+                    if unchanged:
+                        return unchanged
+
+                # Reads go through the raw path: BSON dict -> response dict -> JSON bytes
+                product = ProductService.get_product_by_id(str(product_id), raw=True, fields=read_fields(fields))
                 if product:
-                    # Convert timestamps to IST before returning
-                    created_at_ist = convert_utc_to_ist(product.created_at).strftime("%Y-%m-%d %H:%M:%S")
-                    updated_at_ist = convert_utc_to_ist(product.updated_at).strftime("%Y-%m-%d %H:%M:%S")
-                    data = ProductSerializer(product).data
-                    data["created_at"] = created_at_ist
-                    data["updated_at"] = updated_at_ist
-                    return Response(data, status=status.HTTP_200_OK)
+                    response = json_response(product_to_dict(product, fields), status=status.HTTP_200_OK)
+                    return set_validators(response, versions_etag([product], *variant), last_modified([product]))
                 return Response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
 
+            # Filters and sort apply to both pagination modes
+            filters = parse_filters(request.GET)
+
+            # Keyset pagination: ?cursor= (empty for the first page) switches to cursor mode
+            if "cursor" in request.GET:
+                return self._get_by_cursor(request, filters, fields)
+
             # Handle pagination parameters
             page = int(request.GET.get("page", 1))
             page_size = int(request.GET.get("page_size", 5))
-
-            # Fetch paginated products and metadata
-            products, total_count = ProductService.get_all_products(page=page, page_size=page_size)
-            total_pages = (total_count + page_size - 1) // page_size
-
-            # Convert timestamps for each product to IST
-            products_data = []
-            for product in products:
-                product_data = ProductSerializer(product).data
-                product_data["created_at"] = convert_utc_to_ist(product.created_at).strftime("%Y-%m-%d %H:%M:%S")
-                product_data["updated_at"] = convert_utc_to_ist(product.updated_at).strftime("%Y-%m-%d %H:%M:%S")
-                products_data.append(product_data)
-
-            return Response({
+            listing = {
+                "page": page,
+                "page_size": page_size,
+                "sort_by": request.GET.get("sort_by"),
+                "order": request.GET.get("order", "asc"),
+                "filters": filters,
+            }
+
+            # The total comes from the count subsystem (?count=exact|estimated|none)
+            total_count, count_type = ProductCountService.get_count(request.GET.get("count"), query=filters)
+
+            if is_conditional(request):
+                versions, has_next = ProductService.get_all_products(**listing, raw=True, fields=VERSION_FIELDS)
+                unchanged = not_modified(request, versions_etag(versions, *variant, total_count, has_next))
+                if unchanged:
+                    return unchanged
+
+            products, has_next = ProductService.get_all_products(**listing, raw=True, fields=read_fields(fields))
+            response = json_response({
                 "count": total_count,
-                "next": f"{request.build_absolute_uri(request.path)}?page={page + 1}" if (page * page_size) < total_count else None,
-                "previous": f"{request.build_absolute_uri(request.path)}?page={page - 1}" if page > 1 else None,
-                "results": products_data
+                "count_type": count_type,
+                "next": self._page_link(request, page + 1) if has_next else None,
+                "previous": self._page_link(request, page - 1) if page > 1 else None,
+                "results": [product_to_dict(product, fields) for product in products]
             }, status=status.HTTP_200_OK)
+            return set_validators(response, versions_etag(products, *variant, total_count, has_next))
 
         except (ValidationError, DoesNotExist, ValueError) as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @staticmethod
+    def _page_link(request, page):
+        """URL of another page of the same listing, keeping its filters and sort."""
+        params = request.GET.copy()
+        params["page"] = page
+        return f"{request.build_absolute_uri(request.path)}?{params.urlencode()}"
+
+    def _get_by_cursor(self, request, filters, fields=None):
+        """Fetch a keyset page of products addressed by an opaque cursor."""
+        page_size = int(request.GET.get("page_size", 5))
+        query = {
+            "cursor": request.GET.get("cursor") or None,
+            "page_size": page_size,
+            "sort_by": request.GET.get("sort_by"),
+            "order": request.GET.get("order", "asc"),
+            "filters": filters,
+        }
+        # Cursors pin the sort but not the filters or fieldset, so links carry those parameters along
+        link_params = {name: request.GET[name] for name in (*FILTER_PARAMS, "fields") if request.GET.get(name)}
+        variant = (fields,) if fields else ()
+
+        if is_conditional(request):
+            versions, next_cursor, prev_cursor = ProductService.get_products_by_cursor(**query, raw=True, fields=VERSION_FIELDS)
+            unchanged = not_modified(request, versions_etag(versions, *variant, next_cursor, prev_cursor))
+            if unchanged:
+                return unchanged
+
+        products, next_cursor, prev_cursor = ProductService.get_products_by_cursor(**query, raw=True, fields=read_fields(fields))
+
+        base_url = request.build_absolute_uri(request.path)
+        response = json_response({
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "next": f"{base_url}?{urlencode({'cursor': next_cursor, 'page_size': page_size, **link_params})}" if next_cursor else None,
+            "previous": f"{base_url}?{urlencode({'cursor': prev_cursor, 'page_size': page_size, **link_params})}" if prev_cursor else None,
+            "results": [product_to_dict(product, fields) for product in products]
+        }, status=status.HTTP_200_OK)
+        return set_validators(response, versions_etag(products, *variant, next_cursor, prev_cursor))
+
     def post(self, request):
-        """Create a new product."""
+        """Create a new product, or many from a JSON array / NDJSON body."""
+        if isinstance(request.data, list):
+            return self._bulk_create(request.data)
         try:
             serializer = ProductSerializer(data=request.data)
             if not serializer.is_valid():
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+            fields = parse_fields(request.GET.get("fields"))
             product = ProductService.create_product(serializer.validated_data)
-            # Convert timestamps to IST before returning
-            created_at_ist = convert_utc_to_ist(product.created_at).strftime("%Y-%m-%d %H:%M:%S")
-            updated_at_ist = convert_utc_to_ist(product.updated_at).strftime("%Y-%m-%d %H:%M:%S")
-            data = ProductSerializer(product).data
-            data["created_at"] = created_at_ist
-            data["updated_at"] = updated_at_ist
-            return Response(data, status=status.HTTP_201_CREATED)
+            return Response(ProductSerializer(product, fields=fields).data, status=status.HTTP_201_CREATED)
 
         except (ValidationError, NotUniqueError, ValueError) as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    def _bulk_create(self, items):
+        """Create many products and report the outcome for each input position."""
+        if not items:
+            return Response({"error": "No products provided."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = ProductService.bulk_create_products(items)
+        inserted = sum(1 for result in results if "id" in result)
+        failed = len(results) - inserted
+
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif inserted:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return json_response({"inserted": inserted, "failed": failed, "results": results}, status=response_status)
+
     def put(self, request, product_id):
-        """Update an existing product."""
+        """Update an existing product with only the fields sent."""
         try:
             if not ObjectId.is_valid(product_id):
                 return Response({"error": "Invalid product ID."}, status=status.HTTP_400_BAD_REQUEST)
 
-            product = ProductService.get_product_by_id(product_id)
-            if not product:
-                return Response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
-
-            serializer = ProductSerializer(product, data=request.data, partial=True)
+            fields = parse_fields(request.GET.get("fields"))
+            serializer = ProductUpdateSerializer(data=request.data, partial=True)
             if not serializer.is_valid():
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -101,15 +173,10 @@ class ProductController(APIView):
                 del serializer.validated_data['created_at']
 
             updated_product = ProductService.update_product(product_id, serializer.validated_data)
+            return Response(ProductSerializer(updated_product, fields=fields).data, status=status.HTTP_200_OK)
 
-            # Convert timestamps to IST before returning
-            created_at_ist = convert_utc_to_ist(updated_product.created_at).strftime("%Y-%m-%d %H:%M:%S")
-            updated_at_ist = convert_utc_to_ist(updated_product.updated_at).strftime("%Y-%m-%d %H:%M:%S")
-            data = ProductSerializer(updated_product).data
-            data["created_at"] = created_at_ist
-            data["updated_at"] = updated_at_ist
-            return Response(data, status=status.HTTP_200_OK)
-
+        except ProductNotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
         except (ValidationError, NotUniqueError, ValueError) as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -0,0 +1,32 @@
+from django.http import StreamingHttpResponse
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from product.services.product_service import ProductService
+from product.fast_serializers import csv_chunks, ndjson_chunks
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_chunks, 'application/x-ndjson'),
+    'csv': (csv_chunks, 'text/csv; charset=utf-8'),
+}
+
+class ProductExportController(APIView):
+    """Streams the full product catalog as NDJSON or CSV."""
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= picks the export format here, not a DRF renderer, so errors always render as JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        """Export every product; ?format=ndjson (default) or csv."""
+        export_format = request.GET.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"Invalid format '{export_format}'. Allowed: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        chunks, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(chunks(ProductService.stream_products()), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="products.{export_format}"'
+        return response
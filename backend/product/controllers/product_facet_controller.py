@@ -0,0 +1,17 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from product.services.product_facet_service import ProductFacetService
+from product.query_planner import parse_filters
+from product.fast_serializers import json_response
+
+class ProductFacetController(APIView):
+    """Category, brand and price histogram counts for the product listing filters."""
+
+    def get(self, request):
+        """Facets for the same filter parameters as GET /api/products/."""
+        try:
+            facets = ProductFacetService.get_facets(parse_filters(request.GET))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(facets, status=status.HTTP_200_OK)
@@ -0,0 +1,26 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from product.services.product_service import ProductService
+from product.fast_serializers import json_response, product_to_dict
+from urllib.parse import urlencode
+
+class ProductSearchController(APIView):
+    """Full-text product search ranked by relevance."""
+
+    def get(self, request):
+        """Search name, brand and description with ?q=; pages follow next_cursor."""
+        try:
+            query = request.GET.get("q", "")
+            page_size = int(request.GET.get("page_size", 10))
+            hits, next_cursor = ProductService.search_products(query, page_size, request.GET.get("cursor") or None)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        base_url = request.build_absolute_uri(request.path)
+        return json_response({
+            "query": query,
+            "next_cursor": next_cursor,
+            "next": f"{base_url}?{urlencode({'q': query, 'cursor': next_cursor, 'page_size': page_size})}" if next_cursor else None,
+            "results": [dict(product_to_dict(hit), score=hit["score"]) for hit in hits]
+        }, status=status.HTTP_200_OK)
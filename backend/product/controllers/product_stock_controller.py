@@ -0,0 +1,51 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.settings import api_settings
+from product.parsers import NDJSONParser
+from product.services.product_service import ProductService, ProductNotFoundError, InsufficientStockError
+from bson import ObjectId
+
+class ProductStockController(APIView):
+    """Handles atomic stock adjustments for one product or a batch of products."""
+
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [NDJSONParser]
+
+    def post(self, request, product_id=None):
+        """Increment or decrement stock with {"delta": n}; never drives quantity negative."""
+        if product_id is None:
+            return self._bulk_adjust(request.data)
+        if not ObjectId.is_valid(product_id):
+            return Response({"error": "Invalid product ID."}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(request.data, dict):
+            return Response({"error": "Expected a JSON object."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            quantity = ProductService.adjust_stock(product_id, request.data.get("delta"))
+            return Response({"id": product_id, "quantity": quantity}, status=status.HTTP_200_OK)
+
+        except ProductNotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except InsufficientStockError as e:
+            return Response({"error": str(e), "quantity": e.quantity}, status=status.HTTP_409_CONFLICT)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _bulk_adjust(self, operations):
+        """Apply a JSON array / NDJSON stream of {id|name, delta|set} operations."""
+        if not isinstance(operations, list) or not operations:
+            return Response({"error": "Expected a non-empty array of operations."}, status=status.HTTP_400_BAD_REQUEST)
+
+        matched, modified, failures = ProductService.bulk_adjust_stock(operations)
+        if not failures:
+            response_status = status.HTTP_200_OK
+        elif matched:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            "matched": matched,
+            "modified": modified,
+            "failed": len(failures),
+            "failures": failures,
+        }, status=response_status)
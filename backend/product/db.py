@@ -0,0 +1,196 @@
+"""MongoDB clients, pool settings and pool monitoring.
+
+MongoEngine (sync views) gets its default connection registered lazily by
+ProductConfig.ready(): the MongoClient is only built, and its sockets and
+monitor threads only opened, on the first query. A client must never be shared
+across fork, so after os.fork() the child drops whatever its parent created
+and registers a fresh connection; a pre-fork server (gunicorn --preload) can
+therefore load the app in the master and still get one pool per worker.
+
+MongoEngine only speaks the blocking driver, so the async repositories use
+PyMongo's AsyncMongoClient against the same database (MONGO_URI /
+MONGO_DB_NAME). A client is bound to the event loop it was created on, so one
+client is kept per running loop. Under ASGI that is the server's loop, shared
+for the life of the process. Under WSGI, Django runs every async view on a new
+loop that ends with the request, so the async controllers close that loop's
+client with close_async_client() before returning.
+
+Both kinds of client share MONGO_CLIENT_OPTIONS and report pool events to a
+PoolStatsListener, which GET /api/db/pool-stats/ exposes. With request
+instrumentation on, they also report commands to product.instrumentation.
+"""
+import asyncio
+import os
+import threading
+import weakref
+
+import mongoengine
+from mongoengine import connection as mongoengine_connection
+from pymongo import AsyncMongoClient, monitoring
+
+from product import instrumentation
+from product.conf import get_setting
+
+DEFAULT_MONGO_URI = 'mongodb://localhost:27017'
+
+_clients = weakref.WeakKeyDictionary()
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connections and checkout waits per server address for one kind of client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def reset(self):
+        with self._lock:
+            self._pools = {}
+
+    def _pool(self, address):
+        key = '%s:%s' % address
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = {
+                'open': 0, 'checked_out': 0, 'max_checked_out': 0, 'checkouts': 0,
+                'checkout_failures': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0, 'cleared': 0,
+            }
+        return pool
+
+    def _waited(self, pool, duration):
+        duration = duration or 0.0
+        pool['wait_seconds'] += duration
+        pool['max_wait_seconds'] = max(pool['max_wait_seconds'], duration)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address)['open'] += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._pool(event.address)['open'] -= 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool['checkouts'] += 1
+            pool['checked_out'] += 1
+            pool['max_checked_out'] = max(pool['max_checked_out'], pool['checked_out'])
+            self._waited(pool, event.duration)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool['checkout_failures'] += 1
+            self._waited(pool, event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._pool(event.address)['checked_out'] -= 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address)['cleared'] += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def snapshot(self, max_pool_size):
+        """Per-address counters with average / max checkout wait in ms and utilization of the pool."""
+        with self._lock:
+            pools = {address: dict(pool) for address, pool in self._pools.items()}
+        for pool in pools.values():
+            attempts = pool['checkouts'] + pool['checkout_failures']
+            pool['avg_wait_ms'] = round(pool.pop('wait_seconds') * 1000 / attempts, 3) if attempts else 0.0
+            pool['max_wait_ms'] = round(pool.pop('max_wait_seconds') * 1000, 3)
+            pool['utilization'] = round(pool['checked_out'] / max_pool_size, 3) if max_pool_size else None
+        return pools
+
+
+sync_pool_stats = PoolStatsListener()
+async_pool_stats = PoolStatsListener()
+
+
+def client_options():
+    """MONGO_CLIENT_OPTIONS without the unset entries, which keep the driver defaults."""
+    options = get_setting('MONGO_CLIENT_OPTIONS', {})
+    return {name: value for name, value in options.items() if value not in (None, '')}
+
+
+def connect():
+    """Register MongoEngine's default connection; the client is created on first use."""
+    mongoengine.register_connection(
+        mongoengine.DEFAULT_CONNECTION_NAME,
+        db=get_setting('MONGO_DB_NAME', 'products_db'),
+        host=get_setting('MONGO_URI', DEFAULT_MONGO_URI),
+        connect=False,
+        event_listeners=[sync_pool_stats, *instrumentation.event_listeners()],
+        **client_options(),
+    )
+
+
+def reset_after_fork():
+    """In a forked child, forget the parent's clients and register fresh, lazy ones."""
+    _clients.clear()
+    sync_pool_stats.reset()
+    async_pool_stats.reset()
+    if mongoengine.DEFAULT_CONNECTION_NAME not in mongoengine_connection._connection_settings:
+        return
+    # Drop the inherited client without close(): closing would end the parent's server
+    # sessions and shut sockets it still uses. disconnect() then detaches cached collections.
+    mongoengine_connection._connections.pop(mongoengine.DEFAULT_CONNECTION_NAME, None)
+    mongoengine.disconnect()
+    connect()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_after_fork)
+
+
+def pool_stats():
+    """Pool utilization of this process's sync and async clients."""
+    max_pool_size = client_options().get('maxPoolSize', 100)
+    return {
+        'pid': os.getpid(),
+        'max_pool_size': max_pool_size,
+        'sync': sync_pool_stats.snapshot(max_pool_size),
+        'async': async_pool_stats.snapshot(max_pool_size),
+    }
+
+
+def get_async_client():
+    """AsyncMongoClient for the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = AsyncMongoClient(
+            get_setting('MONGO_URI', DEFAULT_MONGO_URI),
+            event_listeners=[async_pool_stats, *instrumentation.event_listeners()],
+            **client_options(),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Close and forget the running loop's AsyncMongoClient, if it has one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def get_async_db():
+    """The products database on the running loop's async client."""
+    return get_async_client()[get_setting('MONGO_DB_NAME', 'products_db')]
@@ -0,0 +1,189 @@
+"""Read-path serialization straight from raw MongoDB documents.
+
+The list and detail endpoints fetch products with ``as_pymongo()`` and a
+projection, then build the response here instead of instantiating MongoEngine
+documents and running them through ``ProductSerializer``. The output matches
+``ProductSerializer`` with IST timestamps, byte for byte with
+``product.renderers.FastJSONRenderer``, which encodes through dumps() as well.
+
+dumps() uses orjson when it is installed and the stdlib encoder otherwise. Both
+render datetimes as IST timestamps, Decimals as strings and ObjectIds/DBRefs
+as their hex id, so serializers can hand those values over unformatted.
+"""
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+import pytz
+from bson import DBRef, ObjectId
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib encoder produces the same bytes
+    orjson = None
+
+from product.conditional import VERSION_FIELDS
+from product.instrumentation import timed
+
+IST = pytz.timezone('Asia/Kolkata')  # Resolved once instead of on every conversion
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_CENTS = Decimal('0.01')
+
+# Column order of the CSV export; matches the keys of product_to_dict
+EXPORT_FIELDS = ('id', 'name', 'description', 'category', 'price', 'brand', 'quantity', 'created_at', 'updated_at')
+
+
+def format_timestamp(value):
+    """Render a naive UTC (or aware) datetime as an IST timestamp string."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = pytz.utc.localize(value)
+    return value.astimezone(IST).strftime(TIMESTAMP_FORMAT)
+
+
+def format_price(value):
+    """Render a stored price the way DecimalField(precision=2) and DRF do."""
+    if value is None:
+        return None
+    return str(Decimal('%s' % value).quantize(_CENTS, rounding=ROUND_HALF_UP))
+
+
+def parse_fields(value):
+    """Response fields named by a ?fields= parameter, in response order; None (every field) when absent."""
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    if not requested:
+        raise ValueError("fields must name at least one field.")
+    unknown = requested.difference(EXPORT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(EXPORT_FIELDS)}.")
+    return tuple(field for field in EXPORT_FIELDS if field in requested)
+
+
+def read_fields(fields):
+    """Stored fields to project for a sparse response; the validators always need updated_at."""
+    if fields is None:
+        return None
+    stored = [field for field in fields if field != 'id']  # _id is always returned
+    return (*stored, *(field for field in VERSION_FIELDS if field not in stored))
+
+
+@timed('serialize')
+def product_to_dict(doc, fields=None):
+    """Convert a raw product document into the public response shape, limited to fields if given."""
+    category = doc.get('category')
+    if isinstance(category, DBRef):
+        category = category.id
+    data = {
+        'id': str(doc['_id']),
+        'name': doc.get('name'),
+        'description': doc.get('description'),
+        'category': str(category) if category is not None else None,
+        'price': format_price(doc.get('price')),
+        'brand': doc.get('brand'),
+        'quantity': doc.get('quantity'),
+        'created_at': format_timestamp(doc.get('created_at')),
+        'updated_at': format_timestamp(doc.get('updated_at')),
+    }
+    if fields is None:
+        return data
+    return {field: data[field] for field in fields}
+
+
+def category_to_dict(doc):
+    """Convert a raw category document into the ProductCategorySerializer shape."""
+    return {
+        'id': str(doc['_id']),
+        'name': doc.get('name'),
+        'description': doc.get('description'),
+    }
+
+
+def deletion_job_to_dict(job):
+    """Public shape of a CategoryDeletionJob, with progress as a fraction of the products to delete."""
+    return {
+        'id': str(job.id),
+        'category': str(job.category),
+        'category_name': job.category_name,
+        'status': job.status,
+        'total': job.total,
+        'deleted': job.deleted,
+        'progress': round(min(job.deleted / job.total, 1.0), 4) if job.total else (1.0 if job.status == 'done' else 0.0),
+        'error': job.error,
+        'created_at': format_timestamp(job.created_at),
+        'started_at': format_timestamp(job.started_at),
+        'finished_at': format_timestamp(job.finished_at),
+    }
+
+
+def encode_default(value):
+    """JSON form of the values the encoders do not handle natively."""
+    if isinstance(value, datetime):
+        return format_timestamp(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, DBRef):
+        return str(value.id)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# JavaScript line terminators, escaped as DRF's JSONRenderer does
+_LINE_TERMINATORS = ('\u2028'.encode('utf-8'), '\u2029'.encode('utf-8'))
+
+
+@timed('serialize')
+def dumps(data):
+    """Encode to compact UTF-8 JSON bytes, as DRF's JSONRenderer lays them out."""
+    if orjson is not None:
+        # Datetimes pass through to encode_default, which renders them in IST
+        encoded = orjson.dumps(data, default=encode_default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+    else:
+        encoded = json.dumps(data, default=encode_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if _LINE_TERMINATORS[0] in encoded or _LINE_TERMINATORS[1] in encoded:
+        encoded = encoded.replace(_LINE_TERMINATORS[0], b'\\u2028').replace(_LINE_TERMINATORS[1], b'\\u2029')
+    return encoded
+
+
+def json_response(data, status=200):
+    """HttpResponse carrying pre-encoded JSON, skipping DRF's renderer."""
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def ndjson_chunks(documents, rows_per_chunk=500):
+    """Yield raw product documents as NDJSON, several rows per chunk."""
+    rows = []
+    for doc in documents:
+        rows.append(dumps(product_to_dict(doc)))
+        if len(rows) >= rows_per_chunk:
+            yield b'\n'.join(rows) + b'\n'
+            rows = []
+    if rows:
+        yield b'\n'.join(rows) + b'\n'
+
+
+class _LineBuffer:
+    """File-like sink that hands back what csv.writer writes instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(documents, rows_per_chunk=500):
+    """Yield raw product documents as CSV (with a header row), several rows per chunk."""
+    writer = csv.writer(_LineBuffer())
+    rows = [writer.writerow(EXPORT_FIELDS)]
+    for doc in documents:
+        data = product_to_dict(doc)
+        rows.append(writer.writerow([data[field] for field in EXPORT_FIELDS]))
+        if len(rows) >= rows_per_chunk:
+            yield ''.join(rows).encode('utf-8')
+            rows = []
+    if rows:
+        yield ''.join(rows).encode('utf-8')
@@ -0,0 +1,161 @@
+"""Streaming bulk import of products from CSV or NDJSON files.
+
+Rows are read lazily, validated with the ProductService rules in chunks and
+written with unordered insert_many calls from a small thread pool. After each
+chunk that completes in file order, the number of rows consumed is saved to a
+checkpoint file, so an interrupted import resumes after the last chunk it knows
+was written. Rows re-sent after a crash are rejected by the unique name index
+and reported as failures rather than duplicated.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from product.services.product_category_service import ProductCategoryService
+from product.services.product_count_service import ProductCountService
+from product.services.product_facet_service import ProductFacetService
+from product.services.product_service import ProductService
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+def detect_format(path):
+    """Guess the file format from its extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('ndjson', 'jsonl'):
+        return 'ndjson'
+    if extension == 'csv':
+        return 'csv'
+    raise ValueError(f"Cannot tell the format of '{path}'; pass --format csv|ndjson.")
+
+
+def iter_rows(handle, file_format):
+    """Yield (line_number, row) pairs; unparsable NDJSON lines yield an error string as row."""
+    if file_format == 'csv':
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+
+
+def category_maps():
+    """Categories from one cached query: by id, and category ids by name or id string."""
+    by_id, lookup = {}, {}
+    for category in ProductCategoryService.get_all_categories():
+        by_id[category.id] = category
+        lookup[category.name] = lookup[str(category.id)] = category.id
+    return by_id, lookup
+
+
+class ProductImporter:
+    """Imports rows in chunks, tracking progress in a checkpoint file."""
+
+    def __init__(self, chunk_size=1000, workers=4, checkpoint_path=None, on_progress=None, on_error=None):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.on_progress = on_progress or (lambda importer: None)
+        self.on_error = on_error or (lambda line_number, error: None)
+        self.rows_done = self.inserted = self.failed = 0
+        self.started_at = None
+        self._resumed_at = 0
+
+    @property
+    def rows_per_second(self):
+        """Throughput of this run, not counting rows skipped from a checkpoint."""
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        return (self.rows_done - self._resumed_at) / elapsed if elapsed else 0.0
+
+    def load_checkpoint(self):
+        """Resume counters from the checkpoint file; returns the number of rows to skip."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path) as checkpoint:
+            state = json.load(checkpoint)
+        self.rows_done, self.inserted, self.failed = state['rows_done'], state['inserted'], state['failed']
+        return self.rows_done
+
+    def save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        # Write then rename so a crash never leaves a half-written checkpoint
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, 'w') as checkpoint:
+            json.dump({'rows_done': self.rows_done, 'inserted': self.inserted, 'failed': self.failed}, checkpoint)
+        os.replace(temporary, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def run(self, rows, skip=0):
+        """Import (line_number, row) pairs, skipping the first `skip` rows."""
+        self.started_at, self._resumed_at = time.monotonic(), self.rows_done
+        categories = category_maps()
+        rows = islice(rows, skip, None)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                lines, documents, invalid = self._build_chunk(chunk, categories)
+                future = pool.submit(ProductService.product_repository.insert_many, documents)
+                pending.append((future, len(chunk), lines, len(documents), invalid))
+                # Bound the chunks in flight so memory does not grow with the file
+                if len(pending) >= self.workers * 2:
+                    self._complete(pending.popleft())
+            while pending:
+                self._complete(pending.popleft())
+
+        self.clear_checkpoint()
+        return self
+
+    def _build_chunk(self, chunk, categories):
+        """Validate a chunk, returning (line numbers, documents) to insert and the invalid count."""
+        by_id, lookup = categories
+        lines, documents, invalid = [], [], 0
+        for line_number, row in chunk:
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError(row if isinstance(row, str) else "Each row must be a JSON object.")
+                # Rows may name their category or give its id
+                category_id = lookup.get(str(row.get('category', '')).strip())
+                if category_id is not None:
+                    row = dict(row, category=str(category_id))
+                documents.append(ProductService.build_product_document(row, by_id))
+                lines.append(line_number)
+            except (ValueError, ArithmeticError) as e:
+                # ArithmeticError covers decimal.InvalidOperation and OverflowError from unstorable numbers
+                invalid += 1
+                self.on_error(line_number, str(e))
+        return lines, documents, invalid
+
+    def _complete(self, entry):
+        """Wait for the oldest chunk, account for it and checkpoint past it."""
+        future, row_count, lines, attempted, invalid = entry
+        errors = future.result()
+        for position, message in errors.items():
+            self.on_error(lines[position], message)
+        inserted = attempted - len(errors)
+        self.rows_done += row_count
+        self.inserted += inserted
+        self.failed += invalid + len(errors)
+        if inserted:
+            ProductCountService.record_created(inserted)
+            ProductFacetService.invalidate_cache()
+        self.save_checkpoint()
+        self.on_progress(self)
+
@@ -0,0 +1,221 @@
+"""Per-request timing of the controller, service, repository and serialization layers.
+
+With INSTRUMENTATION_ENABLED, InstrumentationMiddleware opens a RequestTimings
+for each request in a context variable. Functions wrapped by timed() (or
+every method of a class decorated with instrument()) add their wall time to
+their layer, and command_timer, a pymongo CommandListener registered on both
+clients, counts MongoDB commands and their server time. The response gets a
+Server-Timing header and one JSON log line on the ``product.instrumentation``
+logger.
+
+Layer times are self times: a service call's time excludes the repository
+calls it makes, so the layers add up to the instrumented part of the request.
+MongoDB time is reported separately and is included in the time of the layer
+that sent the command (normally the repository). "controller" is whatever the
+other layers do not account for: routing, middleware, views and DRF.
+
+When the setting is off, timed() and instrument() return what they are given,
+the middleware removes itself and the listener is not registered, so the code
+paths are exactly the uninstrumented ones.
+"""
+import contextvars
+import inspect
+import json
+import logging
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from pymongo import monitoring
+
+from product.conf import get_setting
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_timings', default=None)
+
+
+def enabled():
+    return get_setting('INSTRUMENTATION_ENABLED', False)
+
+
+class RequestTimings:
+    """Wall time and calls per layer, and MongoDB commands, of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.layers = {}  # layer -> [self seconds, calls]
+        self.mongo_commands = 0
+        self.mongo_seconds = 0.0
+        self._children = []  # time spent in nested timed calls, one entry per open call
+
+    def enter(self):
+        self._children.append(0.0)
+
+    def leave(self, layer, elapsed):
+        children = self._children.pop()
+        totals = self.layers.setdefault(layer, [0.0, 0])
+        totals[0] += elapsed - children
+        totals[1] += 1
+        if self._children:
+            self._children[-1] += elapsed
+
+    def summary(self, total=None):
+        """Milliseconds and calls per layer, with the unaccounted time as 'controller'."""
+        total = time.perf_counter() - self.started if total is None else total
+        layers = {layer: {'ms': round(seconds * 1000, 3), 'calls': calls} for layer, (seconds, calls) in self.layers.items()}
+        accounted = sum(seconds for seconds, _ in self.layers.values())
+        layers['controller'] = {'ms': round(max(total - accounted, 0.0) * 1000, 3), 'calls': 1}
+        return {
+            'total_ms': round(total * 1000, 3),
+            'layers': layers,
+            'mongo': {'commands': self.mongo_commands, 'ms': round(self.mongo_seconds * 1000, 3)},
+        }
+
+
+@contextmanager
+def record_timings():
+    """Collect timings for the code run inside the block."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current_timings():
+    """The RequestTimings being collected, or None."""
+    return _current.get()
+
+
+def timed(layer, force=False):
+    """Decorator adding a function's wall time to a layer of the current request.
+
+    Returns the function unchanged unless instrumentation is enabled (or force=True).
+    """
+    def decorate(func):
+        if not (force or enabled()):
+            return func
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timings = _current.get()
+                if timings is None:
+                    return await func(*args, **kwargs)
+                timings.enter()
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    timings.leave(layer, time.perf_counter() - started)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            timings.enter()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.leave(layer, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def instrument(layer, force=False):
+    """Class decorator timing every method (plain, static or class) under one layer."""
+    def decorate(cls):
+        if not (force or enabled()):
+            return cls
+        wrap = timed(layer, force=True)
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith('__'):
+                continue
+            if isinstance(attribute, staticmethod):
+                setattr(cls, name, staticmethod(wrap(attribute.__func__)))
+            elif isinstance(attribute, classmethod):
+                setattr(cls, name, classmethod(wrap(attribute.__func__)))
+            elif inspect.isfunction(attribute):
+                setattr(cls, name, wrap(attribute))
+        return cls
+    return decorate
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Counts the MongoDB commands of the current request and their duration."""
+
+    def started(self, event):
+        timings = _current.get()
+        if timings is not None:
+            timings.mongo_commands += 1
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+    @staticmethod
+    def _finished(event):
+        timings = _current.get()
+        if timings is not None:
+            timings.mongo_seconds += event.duration_micros / 1e6
+
+
+command_timer = MongoCommandTimer()
+
+
+def event_listeners():
+    """Listeners to register on MongoDB clients for request instrumentation."""
+    return [command_timer] if enabled() else []
+
+
+def server_timing(summary):
+    """Server-Timing header value of a timings summary."""
+    entries = [f"{layer};dur={values['ms']}" for layer, values in summary['layers'].items()]
+    entries.append(f"mongo;dur={summary['mongo']['ms']};desc=\"{summary['mongo']['commands']} commands\"")
+    entries.append(f"total;dur={summary['total_ms']}")
+    return ', '.join(entries)
+
+
+class InstrumentationMiddleware:
+    """Collect per-layer timings of each request and report them; removed when instrumentation is off."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_timings() as timings:
+            response = self.get_response(request)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request):
+        with record_timings() as timings:
+            response = await self.get_response(request)
+        return self.report(request, response, timings)
+
+    @staticmethod
+    def report(request, response, timings):
+        summary = timings.summary()
+        if get_setting('INSTRUMENTATION_SERVER_TIMING', True):
+            response['Server-Timing'] = server_timing(summary)
+        logger.info(json.dumps({
+            'method': request.method, 'path': request.path, 'status': response.status_code, **summary,
+        }, separators=(',', ':')))
+        return response
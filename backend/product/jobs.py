@@ -0,0 +1,35 @@
+"""In-process background execution for long-running work such as category cascades.
+
+Jobs run on a small thread pool (BACKGROUND_JOB_WORKERS threads) created on
+first use. Their progress is stored in MongoDB, so any process can report it,
+and `manage.py resume_category_deletions` finishes jobs whose process died.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from product.conf import get_setting
+
+_executor = None
+_lock = threading.Lock()
+
+
+def submit(function, *args):
+    """Run function(*args) on the background pool."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_setting('BACKGROUND_JOB_WORKERS', 1), thread_name_prefix='product-jobs'
+            )
+    return _executor.submit(function, *args)
+
+
+def _reset_after_fork():
+    # Threads do not survive fork; a child starts its own pool on first submit
+    global _executor, _lock
+    _executor, _lock = None, threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,67 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from product.conf import get_setting
+from product.importer import IMPORT_FORMATS, ProductImporter, detect_format, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Import products from a CSV or NDJSON file in chunks, resuming from a checkpoint if one exists."
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help="CSV (with a header row) or NDJSON file of products.")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help="File format; guessed from the extension by default.")
+        parser.add_argument('--chunk-size', type=int, default=get_setting('PRODUCT_BULK_CHUNK_SIZE', 1000),
+                            help="Rows per insert_many.")
+        parser.add_argument('--workers', type=int, default=4, help="Concurrent insert_many calls.")
+        parser.add_argument('--checkpoint', help="Checkpoint file (default: <file>.checkpoint).")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint and start over.")
+        parser.add_argument('--errors', help="Write rejected rows to this NDJSON file as {line, error}.")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1 or options['workers'] < 1:
+            raise CommandError("--chunk-size and --workers must be positive.")
+        try:
+            file_format = options['format'] or detect_format(options['file'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        errors_file = open(options['errors'], 'a') if options['errors'] else None
+
+        def on_error(line_number, error):
+            if errors_file:
+                errors_file.write(json.dumps({'line': line_number, 'error': error}) + '\n')
+
+        def on_progress(importer):
+            self.stdout.write(
+                f"{importer.rows_done} rows  inserted {importer.inserted}  failed {importer.failed}  "
+                f"{importer.rows_per_second:,.0f} rows/s"
+            )
+
+        importer = ProductImporter(
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            checkpoint_path=options['checkpoint'] or f"{options['file']}.checkpoint",
+            on_progress=on_progress,
+            on_error=on_error,
+        )
+        if options['restart']:
+            importer.clear_checkpoint()
+        skip = importer.load_checkpoint()
+        if skip:
+            self.stdout.write(f"Resuming after row {skip}.")
+
+        try:
+            with open(options['file'], newline='', encoding='utf-8') as handle:
+                importer.run(iter_rows(handle, file_format), skip=skip)
+        except OSError as e:
+            raise CommandError(str(e))
+        finally:
+            if errors_file:
+                errors_file.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {importer.inserted} products, {importer.failed} rejected "
+            f"({importer.rows_per_second:,.0f} rows/s)."
+        ))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from product.services.product_category_service import ProductCategoryService
+
+
+class Command(BaseCommand):
+    help = "Finish category deletes whose background job stopped, e.g. because its server process exited."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--idle', type=int, default=300,
+                            help="Only take over jobs that reported no progress for this many seconds.")
+
+    def handle(self, *args, **options):
+        job_repository = ProductCategoryService.deletion_job_repository
+        stalled = job_repository.unfinished(options['idle'])
+        active = {job.category for job in job_repository.unfinished()}
+
+        # Categories hidden without a job were left behind between hiding and queueing
+        for category in ProductCategoryService.product_category_repository.get_hidden():
+            if category.id not in active:
+                stalled.append(job_repository.create(category, 0))
+
+        for job in stalled:
+            self.stdout.write(f"Deleting category {job.category_name} ({job.category})...")
+            ProductCategoryService.run_deletion_job(job.id)
+            job.reload()
+            if job.status == 'done':
+                self.stdout.write(f"  removed {job.deleted} products")
+            else:
+                self.stdout.write(self.style.ERROR(f"  {job.status}: {job.error}"))
+
+        self.stdout.write(self.style.SUCCESS(f"Resumed {len(stalled)} category deletes."))
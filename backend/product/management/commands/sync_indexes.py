@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from product.models import CategoryDeletionJob, Product, ProductCategory
+
+INDEXED_MODELS = (Product, ProductCategory, CategoryDeletionJob)
+
+
+class Command(BaseCommand):
+    help = "Build the indexes declared on the product models and drop indexes that are no longer declared."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report the changes without applying them.")
+        parser.add_argument('--keep-extra', action='store_true', help="Do not drop indexes missing from the models.")
+
+    def handle(self, *args, **options):
+        for model in INDEXED_MODELS:
+            # Use the raw collection so MongoEngine's auto index creation does not hide missing indexes
+            collection = model._get_db()[model._get_collection_name()]
+            declared = [self._normalize(keys) for keys in model.list_indexes()]
+            existing = {name: self._key_spec(info) for name, info in collection.index_information().items()}
+
+            missing = [keys for keys in declared if keys not in existing.values()]
+            # The _id index can never be dropped
+            stale = [name for name, keys in existing.items() if keys not in declared and name != '_id_']
+
+            for keys in missing:
+                self.stdout.write(f"{collection.name}: create {self._describe(keys)}")
+            if missing and not options['dry_run']:
+                model.ensure_indexes()
+
+            for name in stale:
+                if options['keep_extra']:
+                    self.stdout.write(f"{collection.name}: keep undeclared index {name}")
+                    continue
+                self.stdout.write(f"{collection.name}: drop {name}")
+                if not options['dry_run']:
+                    collection.drop_index(name)
+
+            if not missing and not stale:
+                self.stdout.write(f"{collection.name}: indexes up to date")
+
+        self.stdout.write(self.style.SUCCESS("Dry run complete." if options['dry_run'] else "Indexes synced."))
+
+    @staticmethod
+    def _key_spec(info):
+        """Index key list in the form returned by Document.list_indexes(), normalized like _normalize()."""
+        keys = [tuple(key) for key in info['key'] if key[0] not in ('_fts', '_ftsx')]
+        # Text indexes are stored as _fts/_ftsx; compare them by their weighted fields instead
+        return Command._normalize(keys + [(field, 'text') for field in info.get('weights', {})])
+
+    @staticmethod
+    def _normalize(keys):
+        """Key list with the text fields last and sorted: MongoDB keeps text weights by field name, not declared order."""
+        keys = [tuple(key) for key in keys]
+        return [key for key in keys if key[1] != 'text'] + sorted(key for key in keys if key[1] == 'text')
+
+    @staticmethod
+    def _describe(keys):
+        return ", ".join(f"{field}:{direction}" for field, direction in keys)
@@ -0,0 +1,104 @@
+"""Response compression for the API.
+
+CompressionMiddleware compresses bodies of at least RESPONSE_COMPRESSION_MIN_SIZE
+bytes with brotli when the client accepts it and the optional ``brotli``
+package is installed, and with gzip otherwise. Smaller bodies go out as they
+are: below about a kilobyte the saved bytes do not pay for the CPU. Streaming
+responses (the exports) are compressed chunk by chunk.
+"""
+import re
+
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+from product.conf import get_setting
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip is always available
+    brotli = None
+
+_CODING = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    for part in (header or '').split(','):
+        match = _CODING.match(part)
+        if match:
+            try:
+                quality = float(match.group(2) or 1)
+            except ValueError:
+                continue
+            if quality > 0:
+                accepted.add(match.group(1).lower())
+    return accepted
+
+
+def choose_encoding(header):
+    """Best coding this server can produce for an Accept-Encoding header, or None."""
+    accepted = accepted_encodings(header)
+    if brotli is not None and get_setting('RESPONSE_COMPRESSION_BROTLI', True) and ({'br', '*'} & accepted):
+        return 'br'
+    if {'gzip', '*'} & accepted:
+        return 'gzip'
+    return None
+
+
+def brotli_sequence(sequence, quality):
+    """Compress an iterable of byte chunks as one brotli stream."""
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in sequence:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+        data = compressor.flush()  # Stream rows out as they are produced
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress large responses with brotli or gzip, whichever the client prefers."""
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 304):
+            return response
+        if response.streaming and response.is_async:
+            return response  # No async streams are served; leave any as they are
+        if not response.streaming and len(response.content) < get_setting('RESPONSE_COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if encoding == 'br':
+                response.streaming_content = brotli_sequence(
+                    response.streaming_content, get_setting('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4)
+                )
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            if encoding == 'br':
+                compressed = brotli.compress(
+                    response.content, quality=get_setting('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4)
+                )
+            else:
+                compressed = compress_string(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The ETag names the uncompressed representation; a compressed one is only weakly equal
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
@@ -1,6 +1,9 @@
 from decimal import Decimal 
 from datetime import datetime
-from mongoengine import Document, StringField, DecimalField, IntField, ReferenceField, DateTimeField, CASCADE
+from product.search import SEARCH_WEIGHTS
+from mongoengine import (
+    Document, StringField, DecimalField, IntField, ReferenceField, DateTimeField, BooleanField, ObjectIdField, CASCADE,
+)
 
 class ProductCategory(Document):
     """MongoDB model for product categories using MongoEngine ORM."""
@@ -8,6 +11,10 @@ class ProductCategory(Document):
     name = StringField(max_length=100, required=True, unique=True)
     description = StringField()
 
+    # Set when a delete starts; the category is hidden from reads while its products are removed
+    deleting = BooleanField(default=False)
+
+    # The unique index on name comes from the field; `manage.py sync_indexes` builds and prunes indexes
     meta = {'collection': 'product_categories'}  # Collection name in MongoDB
 
     def __str__(self):
@@ -29,7 +36,26 @@ class Product(Document):
     created_at = DateTimeField(default=datetime.utcnow)
     updated_at = DateTimeField(default=datetime.utcnow)
 
-    meta = {'collection': 'products'}  # Collection name in MongoDB
+    meta = {
+        'collection': 'products',  # Collection name in MongoDB
+        # Declared index set, one per access pattern in ProductRepository (name is unique via the field).
+        # `manage.py sync_indexes` builds missing indexes and drops stale ones.
+        'indexes': [
+            ('category', 'id'),    # products of a category, cascade deletes
+            ('price', 'id'),       # sort/seek by price
+            ('created_at', 'id'),  # sort/seek by creation time
+            ('updated_at', 'id'),  # sort/seek by modification time, incremental scans
+            # Filtered listings (see product.query_planner): equality field, then sort key
+            ('category', 'price', 'id'),
+            ('category', 'created_at', 'id'),
+            ('brand', 'price', 'id'),
+            {                      # full-text search, ranked by textScore
+                'fields': [f'${field}' for field in SEARCH_WEIGHTS],
+                'weights': SEARCH_WEIGHTS,
+                'name': 'product_text',
+            },
+        ],
+    }
 
     def save(self, *args, **kwargs):
         """Auto-update the updated_at timestamp on every save and preserve created_at."""
@@ -42,3 +68,29 @@ class Product(Document):
         return self.name
 
 
+
+class CategoryDeletionJob(Document):
+    """Progress of a category delete whose products are removed in the background."""
+
+    STATUSES = ('pending', 'running', 'done', 'failed')
+
+    # The category document is gone once the job is done, so keep its id and name by value
+    category = ObjectIdField(required=True)
+    category_name = StringField()
+    status = StringField(choices=STATUSES, default='pending')
+    total = IntField(default=0)  # products in the category when the delete started
+    deleted = IntField(default=0)
+    error = StringField()
+
+    created_at = DateTimeField(default=datetime.utcnow)
+    started_at = DateTimeField()
+    finished_at = DateTimeField()
+    updated_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'category_deletion_jobs',
+        'indexes': [
+            ('category', 'status'),  # active job of a category
+            ('status', 'updated_at'),  # unfinished jobs to resume
+        ],
+    }
@@ -0,0 +1,90 @@
+import base64
+import binascii
+from bson import json_util
+from bson.errors import InvalidId
+
+# Sort keys allowed in cursor mode, mapped to their MongoDB field names.
+# Every key except the unique ones is paired with _id as a tie-breaker and
+# backed by a compound (key, _id) index declared on the Product model.
+CURSOR_SORT_FIELDS = {
+    'id': '_id',
+    'name': 'name',
+    'price': 'price',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+UNIQUE_SORT_FIELDS = {'_id', 'name'}
+
+
+def resolve_sort_field(sort_by):
+    """Map a public sort key onto its MongoDB field name."""
+    if not sort_by:
+        return '_id'
+    if sort_by not in CURSOR_SORT_FIELDS:
+        raise ValueError(f"Cannot paginate by '{sort_by}'. Allowed: {', '.join(CURSOR_SORT_FIELDS)}.")
+    return CURSOR_SORT_FIELDS[sort_by]
+
+
+def encode_cursor(sort_field, order, direction, value, last_id):
+    """Build an opaque, URL-safe cursor pointing just past a document."""
+    payload = json_util.dumps({'k': sort_field, 'o': order, 'd': direction, 'v': value, 'i': last_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_field, order, direction = data['k'], data['o'], data['d']
+        value, last_id = data['v'], data['i']
+    except (ValueError, TypeError, KeyError, InvalidId, binascii.Error):
+        raise ValueError("Invalid cursor.")
+
+    if sort_field not in CURSOR_SORT_FIELDS.values() or order not in ('asc', 'desc') or direction not in ('next', 'prev'):
+        raise ValueError("Invalid cursor.")
+    return sort_field, order, direction, value, last_id
+
+
+def seek_filter(sort_field, order, direction, value, last_id):
+    """Range filter selecting the documents after (or before) the cursor position."""
+    # Walking backwards over an ascending listing is a descending scan and vice versa.
+    ascending = (order == 'asc') == (direction == 'next')
+    op = '$gt' if ascending else '$lt'
+
+    if sort_field in UNIQUE_SORT_FIELDS:
+        return {sort_field: {op: value}}
+    return {'$or': [
+        {sort_field: {op: value}},
+        {sort_field: value, '_id': {op: last_id}},
+    ]}
+
+
+def seek_sort(sort_field, order, direction):
+    """order_by() keys matching seek_filter for the given walk direction."""
+    ascending = (order == 'asc') == (direction == 'next')
+    prefix = '' if ascending else '-'
+    field_name = 'id' if sort_field == '_id' else sort_field
+    if sort_field in UNIQUE_SORT_FIELDS:
+        return [f"{prefix}{field_name}"]
+    return [f"{prefix}{field_name}", f"{prefix}id"]
+
+
+def encode_search_cursor(query, score, last_id):
+    """Opaque cursor pointing just past a search hit, bound to its query."""
+    payload = json_util.dumps({'q': query, 's': score, 'i': last_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_search_cursor(token, query):
+    """Decode a cursor produced by encode_search_cursor into (score, last_id)."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_query, score, last_id = data['q'], float(data['s']), data['i']
+    except (ValueError, TypeError, KeyError, InvalidId, binascii.Error):
+        raise ValueError("Invalid cursor.")
+
+    if cursor_query != query:
+        raise ValueError("Cursor does not belong to this search.")
+    return score, last_id
@@ -0,0 +1,148 @@
+"""Filters for product listings and the index each filter/sort combination uses.
+
+Listing filters are parsed from query parameters into a raw MongoDB filter.
+plan_query() then picks a declared index for the filter and sort, following the
+equality-sort-range rule: equality fields first, then the sort key (plus _id),
+so the index returns documents already in order and a page stops after
+page_size matches. The chosen index is passed to the server as a hint, so the
+plan does not change as the data distribution shifts.
+
+When no index serves both, the plan narrows the matches through an index and
+sorts them in memory. ProductService caps how many matches that sort may take
+(PRODUCT_QUERY_SORT_CAP). Combinations that would sort the whole collection in
+memory are refused.
+"""
+from collections import namedtuple
+from datetime import datetime, time, timezone
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from bson import ObjectId
+from django.utils.dateparse import parse_date, parse_datetime
+
+from product.models import Product
+from product.pagination import CURSOR_SORT_FIELDS, UNIQUE_SORT_FIELDS
+
+# Query parameters that filter a listing
+EQUALITY_FILTERS = ('category', 'brand')
+RANGE_FILTERS = {
+    'min_price': ('price', '$gte'),
+    'max_price': ('price', '$lte'),
+    'created_after': ('created_at', '$gte'),
+    'created_before': ('created_at', '$lt'),
+    'updated_after': ('updated_at', '$gte'),
+    'updated_before': ('updated_at', '$lt'),
+}
+FILTER_PARAMS = (*EQUALITY_FILTERS, *RANGE_FILTERS, 'in_stock')
+
+# index: key names to hint; blocking_sort: the server sorts the matches in memory;
+# fallback: an order-preserving plan to use instead when the matches exceed the sort cap
+QueryPlan = namedtuple('QueryPlan', ('index', 'blocking_sort', 'fallback'))
+
+
+def parse_filters(params):
+    """Build a raw MongoDB filter from listing query parameters, rejecting invalid values."""
+    query = {}
+    category = params.get('category')
+    if category:
+        if not ObjectId.is_valid(category):
+            raise ValueError("Invalid category ID.")
+        query['category'] = ObjectId(category)
+    if params.get('brand'):
+        query['brand'] = params['brand']
+
+    for param, (field, operator) in RANGE_FILTERS.items():
+        if params.get(param):
+            parse = _parse_price if field == 'price' else _parse_timestamp
+            query.setdefault(field, {})[operator] = parse(param, params[param])
+
+    in_stock = params.get('in_stock')
+    if in_stock:
+        if in_stock not in ('true', 'false'):
+            raise ValueError("in_stock must be 'true' or 'false'.")
+        query['quantity'] = {'$gt': 0} if in_stock == 'true' else {'$lte': 0}
+
+    price = query.get('price', {})
+    if '$gte' in price and '$lte' in price and price['$gte'] > price['$lte']:
+        raise ValueError("min_price cannot be greater than max_price.")
+    return query
+
+
+def _parse_price(param, value):
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"{param} must be a number.")
+    if not price.is_finite():
+        raise ValueError(f"{param} must be a number.")
+    return Product._fields['price'].to_mongo(price)
+
+
+def _parse_timestamp(param, value):
+    """ISO 8601 date or datetime as the naive UTC datetime stored on products."""
+    try:
+        parsed = parse_datetime(value) or parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"{param} must be an ISO 8601 date or datetime.")
+    if not isinstance(parsed, datetime):
+        return datetime.combine(parsed, time.min)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+@lru_cache(maxsize=None)
+def declared_indexes():
+    """Key names of the B-tree indexes declared on Product."""
+    return tuple(
+        tuple(key for key, _ in spec) for spec in Product.list_indexes()
+        if all(direction in (1, -1) for _, direction in spec)
+    )
+
+
+def sort_keys(sort_field):
+    """Index keys a sort needs: the field, then _id as tie-breaker unless the field is unique."""
+    return (sort_field,) if sort_field in UNIQUE_SORT_FIELDS else (sort_field, '_id')
+
+
+def plan_query(query, sort_field='_id', indexes=None):
+    """Choose the index for a filter and sort; raise ValueError if only a collection sort would do."""
+    indexes = declared_indexes() if indexes is None else indexes
+    plan = _plan(query, sort_field, indexes)
+    if plan is None:
+        sortable = [name for name, field in CURSOR_SORT_FIELDS.items() if _plan(query, field, indexes)]
+        raise ValueError(
+            f"Cannot sort by '{public_sort_name(sort_field)}' with these filters without sorting the whole collection. "
+            f"Sortable: {', '.join(sortable) or 'none'}."
+        )
+    return plan
+
+
+def _plan(query, sort_field, indexes):
+    equality = {field for field, value in query.items() if not isinstance(value, dict)}
+
+    # Indexes that return matches in sort order, preferring the longest equality prefix
+    candidates = []
+    for index in indexes:
+        prefix = 0
+        while prefix < len(index) and index[prefix] in equality:
+            prefix += 1
+        if index[prefix:prefix + len(sort_keys(sort_field))] == sort_keys(sort_field):
+            candidates.append((-prefix, len(index), index))
+    in_order = QueryPlan(min(candidates)[2], False, None) if candidates else None
+    if in_order and (min(candidates)[0] < 0 or not equality):
+        return in_order
+
+    # Otherwise narrow by an index on a filtered field and sort those matches in memory;
+    # an in-order scan that filters as it goes remains the fallback for large match sets
+    narrowing = [index for index in indexes if index[0] in equality] or [index for index in indexes if index[0] in query]
+    if narrowing:
+        return QueryPlan(min(narrowing, key=len), True, in_order)
+    return in_order
+
+
+def public_sort_name(sort_field):
+    """Query parameter name of a MongoDB sort field."""
+    return next(name for name, field in CURSOR_SORT_FIELDS.items() if field == sort_field)
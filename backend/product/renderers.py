@@ -0,0 +1,22 @@
+import json
+
+from rest_framework.renderers import JSONRenderer
+
+from product.fast_serializers import dumps, encode_default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes through fast_serializers.dumps (orjson when installed).
+
+    Datetimes, Decimals and ObjectIds are rendered by the encoder, so serializers
+    can return them unformatted; datetimes come out as IST timestamps.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type or '', renderer_context or {})
+        if indent:
+            # Indented output (e.g. for the browsable API) is rare enough for the stdlib encoder
+            return json.dumps(data, default=encode_default, ensure_ascii=False, indent=indent).encode('utf-8')
+        return dumps(data)
@@ -0,0 +1,90 @@
+# accessing data from MongoDB with PyMongo's async driver, for the async read views
+from product.db import get_async_db
+from product.models import Product, ProductCategory
+from product.pagination import seek_filter, seek_sort
+from product.repositories.product_repository import PRODUCT_READ_FIELDS
+from product.instrumentation import instrument
+from bson import ObjectId
+
+PRODUCT_PROJECTION = dict.fromkeys(PRODUCT_READ_FIELDS, True)
+
+def _mongo_sort(keys):
+    """Convert order_by()-style keys ('-price', 'id') into a PyMongo sort list."""
+    sort = []
+    for key in keys:
+        direction = -1 if key.startswith('-') else 1
+        name = key.lstrip('-')
+        sort.append(('_id' if name == 'id' else name, direction))
+    return sort
+
+@instrument('repository')
+class AsyncProductRepository:
+    """Async counterpart of ProductRepository's read methods, returning raw documents."""
+
+    @staticmethod
+    def _collection():
+        return get_async_db()[Product._get_collection_name()]
+
+    @staticmethod
+    async def get_all_paginated(page, page_size, sort_by=None, order='asc'):
+        """Fetch a page (and whether another follows) with the same ordering as ProductRepository."""
+        if sort_by:
+            direction = '-' if order == 'desc' else ''
+            keys = [f"{direction}{sort_by}"] if sort_by in ('id', 'name') else [f"{direction}{sort_by}", f"{direction}id"]
+        else:
+            keys = ['id']
+        cursor = AsyncProductRepository._collection().find(
+            {}, PRODUCT_PROJECTION, sort=_mongo_sort(keys), skip=(page - 1) * page_size, limit=page_size + 1
+        )
+        products = await cursor.to_list()
+        return products[:page_size], len(products) > page_size
+
+    @staticmethod
+    async def get_page_after(page_size, sort_field='_id', order='asc', direction='next', value=None, last_id=None):
+        """Fetch one keyset page seeking on (sort_field, _id); see ProductRepository.get_page_after."""
+        query = seek_filter(sort_field, order, direction, value, last_id) if last_id is not None else {}
+        cursor = AsyncProductRepository._collection().find(
+            query, PRODUCT_PROJECTION, sort=_mongo_sort(seek_sort(sort_field, order, direction)), limit=page_size + 1
+        )
+        products = await cursor.to_list()
+        has_more = len(products) > page_size
+        products = products[:page_size]
+        if direction == 'prev':
+            products.reverse()
+        return products, has_more
+
+    @staticmethod
+    async def get_by_id(product_id):
+        """Fetch a product by ID."""
+        return await AsyncProductRepository._collection().find_one({'_id': ObjectId(product_id)}, PRODUCT_PROJECTION)
+
+    @staticmethod
+    async def get_by_category(category_id):
+        """Fetch all products belonging to a specific category."""
+        cursor = AsyncProductRepository._collection().find({'category': ObjectId(category_id)}, PRODUCT_PROJECTION)
+        return await cursor.to_list()
+
+    @staticmethod
+    async def count():
+        """Exact number of products in the collection."""
+        return await AsyncProductRepository._collection().count_documents({})
+
+    @staticmethod
+    async def estimated_count():
+        """Approximate number of products read from collection metadata."""
+        return await AsyncProductRepository._collection().estimated_document_count()
+
+@instrument('repository')
+class AsyncProductCategoryRepository:
+    """Async counterpart of ProductCategoryRepository's read methods, returning raw documents."""
+
+    @staticmethod
+    def _collection():
+        return get_async_db()[ProductCategory._get_collection_name()]
+
+    @staticmethod
+    async def get_all():
+        """Fetch all categories in _id order, leaving out those being deleted."""
+        return await AsyncProductCategoryRepository._collection().find(
+            {'deleting': {'$ne': True}}, sort=[('_id', 1)]
+        ).to_list()
@@ -0,0 +1,52 @@
+from product.models import CategoryDeletionJob
+from product.instrumentation import instrument
+from bson import ObjectId
+from datetime import datetime, timedelta
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+@instrument('repository')
+class CategoryDeletionJobRepository:
+    """Repository layer for the progress records of background category deletes."""
+
+    @staticmethod
+    def create(category, total):
+        """Record a pending delete of a category holding `total` products."""
+        return CategoryDeletionJob(category=category.id, category_name=category.name, total=total).save()
+
+    @staticmethod
+    def get(job_id):
+        if not ObjectId.is_valid(job_id):
+            return None
+        return CategoryDeletionJob.objects(id=job_id).first()
+
+    @staticmethod
+    def get_active(category_id):
+        """The pending or running job of a category, if any."""
+        if not ObjectId.is_valid(category_id):
+            return None
+        return CategoryDeletionJob.objects(category=ObjectId(category_id), status__in=ACTIVE_STATUSES).first()
+
+    @staticmethod
+    def unfinished(idle_seconds=0):
+        """Pending or running jobs that have not reported progress for idle_seconds."""
+        cutoff = datetime.utcnow() - timedelta(seconds=idle_seconds)
+        return list(CategoryDeletionJob.objects(status__in=ACTIVE_STATUSES, updated_at__lte=cutoff))
+
+    @staticmethod
+    def start(job_id):
+        now = datetime.utcnow()
+        return CategoryDeletionJob.objects(id=job_id).modify(
+            set__status='running', set__started_at=now, set__updated_at=now, new=True
+        )
+
+    @staticmethod
+    def record_batch(job_id, deleted):
+        CategoryDeletionJob.objects(id=job_id).update_one(inc__deleted=deleted, set__updated_at=datetime.utcnow())
+
+    @staticmethod
+    def finish(job_id, status, error=None):
+        now = datetime.utcnow()
+        CategoryDeletionJob.objects(id=job_id).update_one(
+            set__status=status, set__error=error, set__finished_at=now, set__updated_at=now
+        )
@@ -1,7 +1,10 @@
 from product.models import ProductCategory
+from product.instrumentation import instrument
 from mongoengine import ValidationError, NotUniqueError
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
 
+@instrument('repository')
 class ProductCategoryRepository:
     """Repository layer to handle product category database operations."""
 
@@ -10,14 +13,7 @@ class ProductCategoryRepository:
         """Create a single or multiple product categories."""
         try:
             if isinstance(data, list):  # Bulk insertion
-                categories = [ProductCategory(**item) for item in data]
-                
-                # Check for duplicates in bulk
-                for category_data in data:
-                    if ProductCategory.objects(name=category_data['name']).first():
-                        raise ValueError(f"Category '{category_data['name']}' already exists.")
-                
-                ProductCategory.objects.insert(categories, load_bulk=False)
+                categories, _ = ProductCategoryRepository.create_many(data)
                 return categories
             
             elif isinstance(data, dict):  # Single insertion
@@ -36,20 +32,93 @@ class ProductCategoryRepository:
         except ValidationError as e:
             raise ValueError(str(e))
         
+    @staticmethod
+    def create_many(items, skip_duplicates=False):
+        """Insert many categories using set-based duplicate detection.
+
+        Duplicates within the batch and names already stored (found with one $in
+        query) are either rejected up front or, with skip_duplicates, left out and
+        reported. The rest go in with one unordered insert_many; the unique index
+        on name catches anything inserted concurrently. Returns (inserted, skipped names).
+        """
+        seen, unique_items, skipped = set(), [], []
+        for item in items:
+            # Keep the first occurrence of each name in the batch
+            if item['name'] in seen:
+                skipped.append(item['name'])
+                continue
+            seen.add(item['name'])
+            unique_items.append(item)
+
+        existing = set(ProductCategory.objects(name__in=list(seen)).distinct('name'))
+        if not skip_duplicates and (skipped or existing):
+            duplicate = skipped[0] if skipped else next(item['name'] for item in unique_items if item['name'] in existing)
+            raise ValueError(f"Category '{duplicate}' already exists.")
+
+        categories = []
+        for item in unique_items:
+            if item['name'] in existing:
+                skipped.append(item['name'])
+                continue
+            category = ProductCategory(name=item['name'], description=item['description'])
+            try:
+                category.validate()
+            except ValidationError as e:
+                raise ValueError(str(e))
+            category.id = ObjectId()
+            categories.append(category)
+
+        if not categories:
+            return [], skipped
+
+        try:
+            ProductCategory._get_collection().insert_many([category.to_mongo() for category in categories], ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if not skip_duplicates or any(error['code'] != 11000 for error in errors):
+                raise ValueError("One or more categories already exist.")
+            rejected = {error['index'] for error in errors}
+            skipped.extend(categories[index].name for index in sorted(rejected))
+            categories = [category for index, category in enumerate(categories) if index not in rejected]
+
+        return categories, skipped
+
+    @staticmethod
+    def _visible():
+        """Categories not being deleted; a hidden category is gone as far as reads are concerned."""
+        return ProductCategory.objects(deleting__ne=True)
+
+    @staticmethod
+    def _lookup(value):
+        """Query arguments matching a category by ObjectId or by name."""
+        return {'id': value} if ObjectId.is_valid(value) else {'name': value}
+
     @staticmethod
     def get_by_name_or_id(value):
         """Retrieve a ProductCategory by name or ObjectId."""
-        if ObjectId.is_valid(value):
-            # Search by ObjectId
-            return ProductCategory.objects(id=value).first()
-        else:
-            # Search by category name
-            return ProductCategory.objects(name=value).first()
+        return ProductCategoryRepository._visible()(**ProductCategoryRepository._lookup(value)).first()
+
+    @staticmethod
+    def get_by_ids(category_ids):
+        """Retrieve the categories with the given ids in a single $in query, keyed by id."""
+        return {category.id: category for category in ProductCategoryRepository._visible()(id__in=list(category_ids))}
 
     @staticmethod
     def get_all():
         """Retrieve all product categories."""
-        return ProductCategory.objects.all()
+        return ProductCategoryRepository._visible().order_by('id')
+
+    @staticmethod
+    def hide(value):
+        """Atomically mark a visible category (by name or ObjectId) as being deleted; returns it, or None."""
+        return ProductCategoryRepository._visible()(**ProductCategoryRepository._lookup(value)).modify(
+            set__deleting=True, new=True
+        )
+
+    @staticmethod
+    def get_hidden():
+        """Categories whose delete has started but not finished."""
+        return list(ProductCategory.objects(deleting=True))
 
     @staticmethod
     def update(category_id, data):
@@ -68,8 +137,8 @@ class ProductCategoryRepository:
 
     @staticmethod
     def delete(category_id):
-        """Delete a product category."""
-        category = ProductCategoryRepository.get_by_name_or_id(category_id)
+        """Delete a product category, hidden or not, cascading to its products."""
+        category = ProductCategory.objects(**ProductCategoryRepository._lookup(category_id)).first()
 
         if not category:
             return False
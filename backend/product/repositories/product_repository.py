@@ -1,12 +1,41 @@
 # accessing data from MongoDB using MongoEngine ORM
 from product.models import Product
-from mongoengine import DoesNotExist
+from product.pagination import seek_filter, seek_sort
+from product.instrumentation import instrument
+from mongoengine import DoesNotExist, NotUniqueError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from bson import ObjectId
 from datetime import datetime
 
+# Fields projected by the raw (as_pymongo) read path; _id is always included
+PRODUCT_READ_FIELDS = ('name', 'description', 'category', 'price', 'brand', 'quantity', 'created_at', 'updated_at')
+
+@instrument('repository')
 class ProductRepository:
     """Repository layer for interacting with MongoDB using MongoEngine."""
 
+    @staticmethod
+    def _queryset(raw=False, fields=None):
+        """Base queryset for reads.
+
+        raw=True yields plain BSON dicts limited to fields (PRODUCT_READ_FIELDS by
+        default), skipping Document construction entirely; otherwise documents are
+        loaded without dereferencing their category.
+        """
+        if raw:
+            return Product.objects.only(*(fields or PRODUCT_READ_FIELDS)).as_pymongo()
+        return Product.objects.no_dereference()
+
+    @staticmethod
+    def _filtered(queryset, query=None, hint=None):
+        """Apply a raw listing filter and force the planned index (key names, all ascending)."""
+        if query:
+            queryset = queryset(__raw__=query)
+        if hint:
+            queryset = queryset.hint([(key, 1) for key in hint])
+        return queryset
+
     @staticmethod
     def create(product_data):
         """Create a new product in MongoDB."""
@@ -18,28 +47,157 @@ class ProductRepository:
             raise ValueError(f"Error creating product: {str(e)}")
 
     @staticmethod
-    def get_all_paginated(page, page_size, sort_by=None, order='asc'):
-        """Fetch paginated and sorted products from MongoDB."""
+    def insert_many(documents):
+        """Insert raw product documents with a single unordered insert_many.
+
+        Returns a mapping of position -> error message for the documents the
+        server rejected; every other document was inserted.
+        """
+        if not documents:
+            return {}
+        try:
+            Product._get_collection().insert_many(documents, ordered=False)
+            return {}
+        except BulkWriteError as e:
+            return {
+                error['index']: "A product with this name already exists." if error['code'] == 11000 else error['errmsg']
+                for error in e.details.get('writeErrors', [])
+            }
+
+    @staticmethod
+    def get_all_paginated(page, page_size, sort_by=None, order='asc', raw=False, fields=None, query=None, hint=None):
+        """Fetch paginated and sorted products from MongoDB.
+
+        Returns the page and whether another page follows it. Totals are served
+        separately by ProductCountService so a page costs a single query.
+        Categories are left as references (DBRefs), which is all serializing needs.
+        query and hint are a raw filter and the index planned for it.
+        """
         skip = (page - 1) * page_size
-        sort_order = 1 if order == 'asc' else -1  # 1 for ascending, -1 for descending
-        
-        # If sort_by is provided, sort by that field
+
+        # Fetch one extra document to learn whether a next page exists
+        # If sort_by is provided, sort by that field; otherwise walk the _id index so pages are stable
         if sort_by:
-            queryset = Product.objects.skip(skip).limit(page_size).order_by(f"{'-' if order == 'desc' else ''}{sort_by}")
+            direction = '-' if order == 'desc' else ''
+            # Non-unique keys get _id as tie-breaker, matching their (key, _id) index
+            keys = [f"{direction}{sort_by}"] if sort_by in ('id', 'name') else [f"{direction}{sort_by}", f"{direction}id"]
         else:
-            queryset = Product.objects.skip(skip).limit(page_size)
-        
-        total_count = Product.objects.count()
-        return list(queryset), total_count
+            keys = ['id']
+        queryset = ProductRepository._filtered(ProductRepository._queryset(raw, fields), query, hint)
+        queryset = queryset.skip(skip).limit(page_size + 1).order_by(*keys)
+
+        products = list(queryset)
+        return products[:page_size], len(products) > page_size
+
+    @staticmethod
+    def stream_all(batch_size):
+        """Iterate every product as a raw document from one server-side cursor.
+
+        no_cache() keeps the queryset from holding on to documents it has yielded,
+        so memory is bounded by batch_size however large the catalog is.
+        """
+        return ProductRepository._queryset(raw=True).no_cache().order_by('id').batch_size(batch_size)
+
+    @staticmethod
+    def facets(query, price_boundaries, limit):
+        """Counts per category, per brand and per price bucket of the matching products, in one $facet aggregation.
+
+        Category and brand counts are the `limit` largest, ties broken by value;
+        prices at or above the last boundary fall in the 'other' bucket.
+        """
+        pipeline = [{'$match': query}] if query else []
+        pipeline += [
+            # Carry only the faceted fields through to $facet
+            {'$project': {'_id': 0, 'category': 1, 'brand': 1, 'price': 1}},
+            {'$facet': {
+                'total': [{'$count': 'count'}],
+                'categories': [
+                    {'$group': {'_id': '$category', 'count': {'$sum': 1}}},
+                    {'$sort': {'count': -1, '_id': 1}},
+                    {'$limit': limit},
+                ],
+                'brands': [
+                    {'$group': {'_id': '$brand', 'count': {'$sum': 1}}},
+                    {'$sort': {'count': -1, '_id': 1}},
+                    {'$limit': limit},
+                ],
+                'price': [{'$bucket': {
+                    'groupBy': '$price',
+                    'boundaries': list(price_boundaries),
+                    'default': 'other',
+                    'output': {'count': {'$sum': 1}},
+                }}],
+            }},
+        ]
+        return next(Product._get_collection().aggregate(pipeline))
+
+    @staticmethod
+    def count(query=None, hint=None, limit=None):
+        """Exact number of products, or of those matching a raw filter (counting stops at limit)."""
+        if query is None:
+            return Product.objects.count()
+        options = {'limit': limit} if limit else {}
+        if hint:
+            options['hint'] = [(key, 1) for key in hint]
+        return Product._get_collection().count_documents(query, **options)
+
+    @staticmethod
+    def estimated_count():
+        """Approximate number of products read from collection metadata."""
+        return Product._get_collection().estimated_document_count()
 
     @staticmethod
-    def get_by_id(product_id):
+    def get_page_after(page_size, sort_field='_id', order='asc', direction='next', value=None, last_id=None, raw=False, fields=None,
+                       query=None, hint=None):
+        """Fetch one keyset page seeking on (sort_field, _id) instead of skipping.
+
+        Returns the page in listing order and whether more documents lie beyond it
+        in the walk direction. query and hint are a raw filter and its planned index.
+        """
+        if fields and sort_field != '_id' and sort_field not in fields:
+            fields = (*fields, sort_field)  # Cursors are built from the sort key
+        if last_id is not None:
+            seek = seek_filter(sort_field, order, direction, value, last_id)
+            query = {'$and': [query, seek]} if query else seek
+        queryset = ProductRepository._filtered(ProductRepository._queryset(raw, fields), query, hint)
+
+        # Fetch one extra document to learn whether another page follows
+        products = list(queryset.order_by(*seek_sort(sort_field, order, direction)).limit(page_size + 1))
+        has_more = len(products) > page_size
+        products = products[:page_size]
+
+        if direction == 'prev':
+            products.reverse()
+        return products, has_more
+
+    @staticmethod
+    def search_text(query, limit, after=None):
+        """Raw documents matching a $text search, best textScore first, each with a 'score'.
+
+        after is the (score, _id) of the last hit already returned. Scores are not
+        indexed, so every page still scores all matches; the keyset filter and the
+        top-k $sort + $limit keep each page's sort and transfer bounded.
+        """
+        pipeline = [
+            {'$match': {'$text': {'$search': query}}},
+            {'$project': {**{field: True for field in PRODUCT_READ_FIELDS}, 'score': {'$meta': 'textScore'}}},
+        ]
+        if after is not None:
+            score, last_id = after
+            pipeline.append({'$match': {'$or': [{'score': {'$lt': score}}, {'score': score, '_id': {'$gt': last_id}}]}})
+        pipeline += [{'$sort': {'score': -1, '_id': 1}}, {'$limit': limit}]
+        return list(Product._get_collection().aggregate(pipeline))
+
+    @staticmethod
+    def get_by_id(product_id, raw=False, fields=None):
         """Fetch a product by ID from MongoDB."""
         try:
             # Convert product_id to ObjectId if it's a string
             if isinstance(product_id, str):
                 product_id = ObjectId(product_id)
 
+            if raw:
+                return ProductRepository._queryset(raw, fields)(id=product_id).first()
             return Product.objects(id=product_id).first()
         
         except DoesNotExist:
@@ -48,9 +206,9 @@ class ProductRepository:
             raise ValueError(f"Error fetching product: {str(e)}")
         
     @staticmethod
-    def get_by_category(category_id):
+    def get_by_category(category_id, raw=False, fields=None):
         """Fetch all products belonging to a specific category."""
-        return Product.objects(category=category_id)
+        return ProductRepository._queryset(raw, fields)(category=category_id)
 
     @staticmethod
     def find_by_name(name):
@@ -59,16 +217,92 @@ class ProductRepository:
 
     @staticmethod
     def update(product_id, update_data):
-        """Update a product by ID in MongoDB."""
+        """Update a product by ID in MongoDB.
+
+        Sends a $set of only the given fields plus updated_at in a single
+        find_one_and_update and returns the product as stored afterwards, or None
+        if no product has this id. A name clash raises NotUniqueError from the
+        unique index.
+        """
+        changes = dict(update_data, updated_at=datetime.utcnow())
         try:
-            product = Product.objects.get(id=product_id)
-            update_data['updated_at'] = datetime.utcnow()  # Ensure 'updated_at' gets set
-            product.update(**update_data)
-            return Product.objects.get(id=product_id)  # Return the updated product
-        except DoesNotExist:
-            return None
+            document = Product._get_collection().find_one_and_update(
+                {'_id': ObjectId(product_id)},
+                {'$set': {Product._fields[field].db_field: Product._fields[field].to_mongo(value) for field, value in changes.items()}},
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError as e:
+            raise NotUniqueError(str(e))
         except Exception as e:
             raise ValueError(f"Error updating product: {str(e)}")
+        # Categories are left as references (DBRefs), which is all serializing needs
+        return Product._from_son(document, _auto_dereference=False) if document else None
+
+    @staticmethod
+    def adjust_stock(product_id, delta):
+        """Atomically add delta to a product's quantity without letting it go negative.
+
+        A single conditional $inc: decrements only match while quantity >= -delta,
+        so concurrent writers can never oversell. Returns the new quantity, or None
+        if the product does not exist or has too little stock.
+        """
+        query = {'_id': ObjectId(product_id)}
+        if delta < 0:
+            query['quantity'] = {'$gte': -delta}
+        document = Product._get_collection().find_one_and_update(
+            query,
+            {'$inc': {'quantity': delta}, '$set': {'updated_at': datetime.utcnow()}},
+            projection={'quantity': True},
+            return_document=ReturnDocument.AFTER,
+        )
+        return document['quantity'] if document else None
+
+    @staticmethod
+    def bulk_update(operations):
+        """Apply (filter, update) pairs with a single unordered bulk_write of UpdateOne ops.
+
+        Returns (matched, modified, errors) where errors maps position -> message
+        for the operations the server rejected.
+        """
+        if not operations:
+            return 0, 0, {}
+        requests = [UpdateOne(query, update) for query, update in operations]
+        try:
+            result = Product._get_collection().bulk_write(requests, ordered=False)
+            return result.matched_count, result.modified_count, {}
+        except BulkWriteError as e:
+            return e.details.get('nMatched', 0), e.details.get('nModified', 0), {
+                error['index']: error['errmsg'] for error in e.details.get('writeErrors', [])
+            }
+
+    @staticmethod
+    def get_stock_levels(ids=(), names=()):
+        """Raw {_id, name, quantity, updated_at} documents for the given ids and names in one query."""
+        clauses = []
+        if ids:
+            clauses.append({'_id': {'$in': list(ids)}})
+        if names:
+            clauses.append({'name': {'$in': list(names)}})
+        if not clauses:
+            return []
+        return list(Product.objects(__raw__={'$or': clauses}).only('name', 'quantity', 'updated_at').as_pymongo())
+
+    @staticmethod
+    def delete_category_batch(category_id, batch_size):
+        """Delete up to batch_size products of a category with one delete_many; returns how many went.
+
+        The ids come from the (category, _id) index alone, so each batch touches
+        only the documents it removes.
+        """
+        collection = Product._get_collection()
+        ids = [
+            document['_id'] for document in collection.find(
+                {'category': category_id}, {'_id': True}, hint=[('category', 1), ('_id', 1)], limit=batch_size
+            )
+        ]
+        if not ids:
+            return 0
+        return collection.delete_many({'_id': {'$in': ids}}).deleted_count
 
     @staticmethod
     def delete(product_id):
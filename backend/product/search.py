@@ -0,0 +1,118 @@
+"""Full-text product search.
+
+Production search runs on MongoDB's weighted text index over name, brand and
+description (ProductRepository.search_text). InMemorySearchIndex answers the
+same calls from an inverted index built over raw product documents, so the
+search service can be tested and benchmarked without a server. Its tokenizer
+and score approximate MongoDB's (stop words dropped, plurals folded, weighted
+term frequency), so rankings agree on the whole but scores are not identical.
+"""
+import heapq
+import math
+import re
+from collections import defaultdict
+
+# Field weights of the Product text index; a name match outranks a brand match, which outranks the description
+SEARCH_WEIGHTS = {'name': 10, 'brand': 5, 'description': 1}
+
+_WORD = re.compile(r"\w+")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def stem(token):
+    """Fold the common English plural endings so 'laptops' matches 'laptop'."""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Lower-cased, stemmed terms of a text with stop words removed."""
+    return [stem(word) for word in _WORD.findall((text or '').lower()) if word not in STOP_WORDS]
+
+
+def parse_query(query):
+    """Split a $text-style search string into (terms, excluded terms); a leading '-' excludes."""
+    terms, excluded = set(), set()
+    for chunk in (query or '').split():
+        target = excluded if chunk.startswith('-') else terms
+        target.update(tokenize(chunk))
+    return terms, excluded
+
+
+def after_cursor(score, document_id, after):
+    """Whether a hit sorts after the (score, _id) cursor position in (-score, _id) order."""
+    if after is None:
+        return True
+    after_score, after_id = after
+    return score < after_score or (score == after_score and document_id > after_id)
+
+
+class InMemorySearchIndex:
+    """Inverted index over raw product documents with the ProductRepository.search_text interface."""
+
+    def __init__(self, documents=()):
+        self._documents = {}
+        self._postings = defaultdict(dict)  # term -> {_id: weighted score}
+        for document in documents:
+            self.add(document)
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add(self, document):
+        """Index (or re-index) one raw product document."""
+        self.remove(document['_id'])
+        self._documents[document['_id']] = document
+        for term, score in self._field_scores(document).items():
+            self._postings[term][document['_id']] = score
+
+    def remove(self, document_id):
+        document = self._documents.pop(document_id, None)
+        if document is None:
+            return
+        for term in self._field_scores(document):
+            postings = self._postings[term]
+            postings.pop(document_id, None)
+            if not postings:
+                del self._postings[term]
+
+    @staticmethod
+    def _field_scores(document):
+        """Per-term score of a document: sum over fields of weight x damped term frequency."""
+        scores = defaultdict(float)
+        for field, weight in SEARCH_WEIGHTS.items():
+            tokens = tokenize(document.get(field))
+            counts = defaultdict(int)
+            for token in tokens:
+                counts[token] += 1
+            for token, count in counts.items():
+                # Longer fields dilute each occurrence, as in MongoDB's textScore
+                scores[token] += weight * (1 + math.log(count)) / (0.5 + 0.5 * math.sqrt(len(tokens)))
+        return scores
+
+    def search_text(self, query, limit, after=None):
+        """Up to `limit` documents matching any term, best first, each with a 'score'.
+
+        after is the (score, _id) of the last hit already returned.
+        """
+        terms, excluded = parse_query(query)
+        scores = defaultdict(float)
+        for term in terms:
+            for document_id, score in self._postings.get(term, {}).items():
+                scores[document_id] += score
+        for term in excluded:
+            for document_id in self._postings.get(term, {}):
+                scores.pop(document_id, None)
+
+        # Top-k selection, like the $sort + $limit the server pipeline runs
+        hits = heapq.nsmallest(
+            limit,
+            (item for item in scores.items() if after_cursor(item[1], item[0], after)),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return [dict(self._documents[document_id], score=score) for document_id, score in hits]
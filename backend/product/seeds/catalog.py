@@ -0,0 +1,184 @@
+"""Deterministic synthetic catalogs for load tests and benchmarks.
+
+CatalogGenerator yields raw category and product documents (the shapes stored
+in MongoDB) with skewed, realistic distributions:
+
+  - products per category and products per brand follow Zipf-like curves, so a
+    few categories and brands hold most of the catalog;
+  - prices are log-normal around a per-category level and end in .99/.49/.00;
+  - quantities are mostly small, with a long tail of bulk stock;
+  - description lengths are log-normal, from a one-liner to a few paragraphs;
+  - created_at spreads over the last two years, updated_at follows it.
+
+Each batch is generated from its own Random(seed, first position), and _ids
+are derived from created_at and the product's position, so a seed and batch
+size give the same catalog however many workers insert it. seed_catalog() writes one with
+unordered insert_many calls from a thread pool, building the indexes after the
+data is in; `manage.py seed_catalog` wraps it.
+"""
+import math
+import random
+import struct
+import time
+from bisect import bisect
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from bson import ObjectId
+
+from product.models import CategoryDeletionJob, Product, ProductCategory
+
+DEPARTMENTS = [
+    "Laptops", "Phones", "Audio", "Cameras", "Monitors", "Keyboards", "Wearables", "Gaming", "Networking", "Storage",
+    "Kitchen", "Furniture", "Lighting", "Garden", "Tools", "Fitness", "Outdoor", "Toys", "Books", "Stationery",
+    "Footwear", "Menswear", "Womenswear", "Bags", "Watches", "Beauty", "Grocery", "Pet Supplies", "Automotive", "Baby",
+]
+STYLES = ["Essentials", "Pro", "Premium", "Budget", "Kids", "Outlet", "Refurbished", "Eco", "Travel", "Home"]
+BRANDS = [
+    "Dell", "HP", "Apple", "Samsung", "Sony", "Lenovo", "Bose", "Canon", "Asus", "Acer", "LG", "Philips", "Logitech",
+    "Xiaomi", "Nike", "Adidas", "Puma", "IKEA", "Bosch", "Makita", "Lego", "Hasbro", "Nikon", "JBL", "Garmin",
+    "Casio", "Braun", "Dyson", "Tefal", "Anker", "Razer", "Corsair", "Kingston", "Seagate", "Netgear", "TP-Link",
+    "Levi's", "H&M", "Zara", "Uniqlo",
+]
+ADJECTIVES = [
+    "wireless", "portable", "compact", "ergonomic", "smart", "rugged", "slim", "premium", "classic", "solar",
+    "waterproof", "foldable", "lightweight", "heavy-duty", "vintage", "modular", "silent", "rechargeable", "organic",
+    "adjustable",
+]
+NOUNS = [
+    "laptop", "speaker", "keyboard", "monitor", "charger", "backpack", "lamp", "camera", "headphones", "watch",
+    "chair", "desk", "kettle", "blender", "drill", "jacket", "sneakers", "router", "tablet", "mouse", "bottle",
+    "tent", "stroller", "notebook", "shelf",
+]
+FILLER = (
+    "with a durable finish designed for everyday use and backed by a two year warranty easy to clean and "
+    "simple to set up includes all accessories in the box tested for reliability energy efficient quiet "
+    "operation available in several colours"
+).split()
+
+UNIX_EPOCH = datetime(1970, 1, 1)
+EPOCH = datetime(2025, 1, 1)  # Catalogs are generated as of this moment, so they never depend on the clock
+HISTORY = timedelta(days=730)
+CENTS = (0.99, 0.99, 0.49, 0.0)
+
+
+def zipf_cumulative(count, exponent):
+    """Cumulative weights of ranks 1..count under a Zipf(exponent) distribution."""
+    return list(accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def object_id(created_at, position):
+    """Deterministic ObjectId: creation second, then the position in the catalog."""
+    return ObjectId(struct.pack('>IQ', int((created_at - UNIX_EPOCH).total_seconds()), position))
+
+
+class CatalogGenerator:
+    """Raw category and product documents for a seeded synthetic catalog."""
+
+    def __init__(self, products, categories=100, seed=42, category_skew=1.1, brand_skew=1.2):
+        if products < 0 or categories < 1:
+            raise ValueError("Need a non-negative product count and at least one category.")
+        self.products = products
+        self.seed = seed
+        rng = random.Random(f"{seed}:categories")
+        self.categories = [self._category(rng, index) for index in range(categories)]
+        # Typical price of each category, so laptops cost more than notebooks
+        self._price_levels = [math.log(rng.choice([8, 15, 30, 60, 120, 250, 600])) for _ in self.categories]
+        self._category_weights = zipf_cumulative(categories, category_skew)
+        self._brand_weights = zipf_cumulative(len(BRANDS), brand_skew)
+        self._descriptions = [self._description(rng) for _ in range(2048)]
+
+    @staticmethod
+    def _category(rng, index):
+        name = DEPARTMENTS[index % len(DEPARTMENTS)]
+        if index >= len(DEPARTMENTS):
+            name = f"{name} {STYLES[(index // len(DEPARTMENTS) - 1) % len(STYLES)]}"
+        if index >= len(DEPARTMENTS) * (len(STYLES) + 1):
+            name = f"{name} {index}"
+        return {
+            '_id': object_id(EPOCH - HISTORY, index),
+            'name': name,
+            'description': f"{name} from {rng.randrange(5, 400)} sellers",
+            'deleting': False,
+        }
+
+    @staticmethod
+    def _description(rng):
+        length = min(400, max(4, int(rng.lognormvariate(math.log(30), 0.8))))
+        words = [rng.choice(ADJECTIVES + NOUNS + FILLER) for _ in range(length)]
+        return " ".join(words).capitalize() + "."
+
+    def batches(self, batch_size):
+        """(start, end) ranges covering the products in batches of batch_size."""
+        return [(start, min(self.products, start + batch_size)) for start in range(0, self.products, batch_size)]
+
+    def product_batch(self, start, end):
+        """Raw documents of products start..end-1; the same for a given seed however the catalog is split."""
+        rng = random.Random(f"{self.seed}:{start}")
+        # Hot loop: bind everything local and index sequences with random() instead of rng.choice()
+        uniform, lognormal, expovariate, paretovariate = rng.random, rng.lognormvariate, rng.expovariate, rng.paretovariate
+        category_ids = [category['_id'] for category in self.categories]
+        descriptions, price_levels = self._descriptions, self._price_levels
+        category_weights, brand_weights = self._category_weights, self._brand_weights
+        category_total, brand_total = category_weights[-1], brand_weights[-1]
+        adjectives, nouns = [word.title() for word in ADJECTIVES], [word.title() for word in NOUNS]
+        history, epoch_seconds = int(HISTORY.total_seconds()), int((EPOCH - UNIX_EPOCH).total_seconds())
+        documents = []
+        for position in range(start, end):
+            category = bisect(category_weights, uniform() * category_total)
+            age = int(uniform() * history)
+            created_at = EPOCH - timedelta(seconds=age)
+            # Most items are updated within days of listing, some much later
+            updated_after = min(age, int(expovariate(1 / 259200)))
+            price = int(lognormal(price_levels[category], 0.6)) + CENTS[int(uniform() * 4)]
+            documents.append({
+                '_id': ObjectId(struct.pack('>IQ', epoch_seconds - age, position)),
+                'name': f"{adjectives[int(uniform() * len(adjectives))]} {nouns[int(uniform() * len(nouns))]} {position:07d}",
+                'description': descriptions[int(uniform() * len(descriptions))],
+                'category': category_ids[category],
+                'price': max(0.49, min(99999.99, price)),
+                'brand': BRANDS[bisect(brand_weights, uniform() * brand_total)],
+                'quantity': min(10000, int(paretovariate(1.2) * 3)),
+                'created_at': created_at,
+                'updated_at': created_at + timedelta(seconds=updated_after),
+            })
+        return documents
+
+    def iter_products(self, batch_size=10000):
+        """Every product document, batch by batch."""
+        for start, end in self.batches(batch_size):
+            yield from self.product_batch(start, end)
+
+
+def seed_catalog(generator, batch_size=10000, workers=4, on_progress=None):
+    """Replace the product and category collections with a generated catalog; returns seconds taken.
+
+    Each worker generates and inserts whole batches. The collections are written
+    without indexes (other than _id), which are then built in one pass each.
+    """
+    for document in (Product, ProductCategory, CategoryDeletionJob):
+        document.drop_collection()
+    database = Product._get_db()
+    started = time.perf_counter()
+    database[ProductCategory._get_collection_name()].insert_many(generator.categories, ordered=False)
+
+    products = database[Product._get_collection_name()]
+
+    def insert(batch):
+        documents = generator.product_batch(*batch)
+        products.insert_many(documents, ordered=False)
+        return len(documents)
+
+    inserted = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for count in pool.map(insert, generator.batches(batch_size)):
+            inserted += count
+            if on_progress:
+                on_progress(inserted)
+
+    # Collections cached by MongoEngine predate the drop; rebuild the declared indexes
+    for document in (Product, ProductCategory, CategoryDeletionJob):
+        document._collection = None
+        document.ensure_indexes()
+    return time.perf_counter() - started
@@ -1,9 +1,10 @@
-from product.models import Product, ProductCategory
+from product.models import CategoryDeletionJob, Product, ProductCategory
 
 def clear():
 
     Product.drop_collection()
     ProductCategory.drop_collection()
+    CategoryDeletionJob.drop_collection()
 
 if __name__ == "__main__":
     clear()
@@ -1,9 +1,35 @@
 from rest_framework_mongoengine.serializers import DocumentSerializer
+from rest_framework_mongoengine.fields import ReferenceField
+from rest_framework_mongoengine.validators import UniqueValidator
 from product.models import Product, ProductCategory
+from product.services.product_category_service import ProductCategoryService
 from rest_framework import serializers
 
+class CachedCategoryReferenceField(ReferenceField):
+    """Category reference whose existence check goes through the category cache."""
+
+    def to_internal_value(self, value):
+        if isinstance(value, dict):
+            try:
+                value = value['_id']
+            except KeyError:
+                self.fail('invalid_input')
+        category_id = self.parse_id(value)
+        category = ProductCategoryService.get_categories_by_ids([category_id]).get(category_id)
+        if category is None:
+            self.fail('not_found', pk_value=category_id)
+        return category.to_dbref()
+
 class ProductSerializer(DocumentSerializer):
-    """Serializer for MongoEngine Product model"""
+    """Serializer for MongoEngine Product model; fields=... limits the output to a sparse fieldset."""
+
+    serializer_reference_base_field = CachedCategoryReferenceField
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super(ProductSerializer, self).__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     class Meta:
         model = Product
@@ -12,13 +38,28 @@ class ProductSerializer(DocumentSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        # Timestamps stay datetimes; the renderer writes them in IST
+        extra_kwargs = {'created_at': {'format': None}, 'updated_at': {'format': None}}
+
+class ProductUpdateSerializer(ProductSerializer):
+    """Validates partial product updates without a uniqueness pre-query.
+
+    The unique index on name rejects clashes when the update is written.
+    """
+
+    def get_fields(self):
+        fields = super(ProductUpdateSerializer, self).get_fields()
+        fields['name'].validators = [
+            validator for validator in fields['name'].validators if not isinstance(validator, UniqueValidator)
+        ]
+        return fields
 
 class ProductCategorySerializer(DocumentSerializer):
     """Serializer for MongoEngine ProductCategory model."""
 
     class Meta:
         model = ProductCategory
-        fields = '__all__'
+        fields = ['id', 'name', 'description']
 
     def validate_name(self, value):
         """Ensure name is not null or empty."""
@@ -0,0 +1,65 @@
+from product.repositories.async_product_repository import AsyncProductRepository, AsyncProductCategoryRepository
+from product.services.product_service import ProductService
+from product.services.product_category_service import ProductCategoryService
+from product.pagination import decode_cursor, resolve_sort_field
+from product.instrumentation import instrument
+
+# Raw category documents share the category cache (and its invalidation) with the sync path
+RAW_CATEGORIES_KEY = ('all', 'raw')
+
+@instrument('service')
+class AsyncProductService:
+    """Async read paths for products; mirror ProductService's raw reads without blocking the event loop."""
+
+    product_repository = AsyncProductRepository()
+
+    @staticmethod
+    async def get_all_products(page=1, page_size=10, sort_by=None, order='asc'):
+        return await AsyncProductService.product_repository.get_all_paginated(page, page_size, sort_by, order)
+
+    @staticmethod
+    async def get_products_by_cursor(cursor=None, page_size=10, sort_by=None, order='asc'):
+        """Fetch a keyset page of products along with its next/prev cursors."""
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        if cursor:
+            sort_field, order, direction, value, last_id = decode_cursor(cursor)
+        else:
+            if order not in ('asc', 'desc'):
+                raise ValueError("Order must be 'asc' or 'desc'.")
+            sort_field, direction, value, last_id = resolve_sort_field(sort_by), 'next', None, None
+
+        products, has_more = await AsyncProductService.product_repository.get_page_after(
+            page_size, sort_field, order, direction, value, last_id
+        )
+
+        next_cursor = prev_cursor = None
+        if products:
+            if direction == 'prev' or has_more:
+                next_cursor = ProductService._cursor_for(products[-1], sort_field, order, 'next')
+            if (direction == 'next' and cursor) or (direction == 'prev' and has_more):
+                prev_cursor = ProductService._cursor_for(products[0], sort_field, order, 'prev')
+        return products, next_cursor, prev_cursor
+
+    @staticmethod
+    async def get_product_by_id(product_id):
+        return await AsyncProductService.product_repository.get_by_id(product_id)
+
+    @staticmethod
+    async def get_product_by_category(category_id):
+        return await AsyncProductService.product_repository.get_by_category(category_id)
+
+@instrument('service')
+class AsyncProductCategoryService:
+    """Async read paths for categories, served from the shared category cache when possible."""
+
+    product_category_repository = AsyncProductCategoryRepository()
+
+    @staticmethod
+    async def get_all_categories():
+        """Fetch all categories as raw documents."""
+        categories = ProductCategoryService.category_cache.get(RAW_CATEGORIES_KEY)
+        if categories is None:
+            categories = await AsyncProductCategoryService.product_category_repository.get_all()
+            ProductCategoryService.category_cache.set(RAW_CATEGORIES_KEY, categories)
+        return categories
@@ -1,40 +1,205 @@
 
+import time
+
+from product import jobs
 from product.repositories.product_category_repository import ProductCategoryRepository
+from product.repositories.category_deletion_job_repository import CategoryDeletionJobRepository
+from product.repositories.product_repository import ProductRepository
+from product.services.product_count_service import ProductCountService
+from product.services.product_facet_service import ProductFacetService
+from product.cache import TTLCache
+from product.conf import get_setting
+from product.instrumentation import instrument
+
+ALL_CATEGORIES_KEY = ('all',)
+# Fields clients may set on a category; 'deleting' is internal
+CATEGORY_FIELDS = ('name', 'description')
 
+@instrument('service')
 class ProductCategoryService:
     """Service layer to handle product category operations using the repository."""
     
     product_category_repository = ProductCategoryRepository()
+    product_repository = ProductRepository()
+    deletion_job_repository = CategoryDeletionJobRepository()
+
+    # Categories change rarely, so reads are served from an in-process LRU+TTL cache
+    # keyed by id and by name; every write through this service clears it.
+    category_cache = TTLCache(
+        maxsize=get_setting('CATEGORY_CACHE_SIZE', 1024),
+        ttl=get_setting('CATEGORY_CACHE_TTL', 60),
+    )
 
     @staticmethod
     def create_category(data):
         """Creates one or multiple product categories using the repository."""
         ProductCategoryService.validate_category_data(data)
-        return ProductCategoryService.product_category_repository.create(data)
+        categories = ProductCategoryService.product_category_repository.create(data)
+        ProductCategoryService.invalidate_cache()
+        return categories
+
+    @staticmethod
+    def create_categories(items, skip_duplicates=False):
+        """Creates many categories at once; returns (inserted, skipped names).
+
+        With skip_duplicates, names that already exist (or repeat within the batch)
+        are skipped and reported instead of failing the whole batch.
+        """
+        if not isinstance(items, list):
+            raise ValueError("Invalid data format. Expected a list.")
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError("Invalid data format. Expected a list of objects.")
+            # Bulk items skip ProductCategorySerializer, so only its writable fields are accepted here
+            unknown = set(item) - set(CATEGORY_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown category fields: {', '.join(sorted(unknown))}.")
+            ProductCategoryService.validate_category_data(item)
+        result = ProductCategoryService.product_category_repository.create_many(items, skip_duplicates)
+        ProductCategoryService.invalidate_cache()
+        return result
 
     @staticmethod
     def get_category_by_id(category_id):
-        """Fetches a category by its ID."""
-        return ProductCategoryService.product_category_repository.get_by_name_or_id(category_id)
+        """Fetches a category by its ID (or name)."""
+        category = ProductCategoryService.category_cache.get(('category', str(category_id)))
+        if category is None:
+            category = ProductCategoryService.product_category_repository.get_by_name_or_id(category_id)
+            if category is not None:
+                ProductCategoryService._cache_category(category, category_id)
+        return category
+
+    @staticmethod
+    def get_categories_by_ids(category_ids):
+        """Fetches several categories at once, keyed by id; only cache misses hit the database."""
+        categories, missing = {}, []
+        for category_id in category_ids:
+            category = ProductCategoryService.category_cache.get(('category', str(category_id)))
+            if category is None:
+                missing.append(category_id)
+            else:
+                categories[category_id] = category
+
+        if missing:
+            fetched = ProductCategoryService.product_category_repository.get_by_ids(missing)
+            for category_id, category in fetched.items():
+                ProductCategoryService._cache_category(category, category_id)
+            categories.update(fetched)
+        return categories
 
     @staticmethod
     def get_all_categories():
         """Fetches all product categories."""
-        return ProductCategoryService.product_category_repository.get_all()
+        categories = ProductCategoryService.category_cache.get(ALL_CATEGORIES_KEY)
+        if categories is None:
+            # Cache a plain list: a shared QuerySet would go back to the database on .filter() or .count()
+            categories = list(ProductCategoryService.product_category_repository.get_all())
+            ProductCategoryService.category_cache.set(ALL_CATEGORIES_KEY, categories)
+        return categories
 
     @staticmethod
     def update_category(category_id, data):
         """Updates an existing product category using the repository."""
         ProductCategoryService.validate_category_data(data)
-        return ProductCategoryService.product_category_repository.update(category_id, data)
+        category = ProductCategoryService.product_category_repository.update(category_id, data)
+        ProductCategoryService.invalidate_cache()
+        ProductFacetService.invalidate_cache()  # Facets carry category names
+        return category
 
     @staticmethod
     def delete_category(category_id):
-        """Deletes a product category by ID using the repository."""
-        return ProductCategoryService.product_category_repository.delete(category_id)
-    
+        """Deletes a category (by ID or name) and its products.
+
+        The category is hidden from reads first. Up to CATEGORY_DELETE_INLINE_LIMIT
+        products are deleted in the request, which returns True; a larger cascade is
+        handed to a background job, which is returned. False if there is no such
+        category; a category already being deleted returns its running job.
+        Until the job finishes, the category's remaining products are still
+        served by product reads (listings, search, exports, facets).
+        """
+        repository = ProductCategoryService.product_category_repository
+        category = repository.hide(category_id)
+        if category is None:
+            return ProductCategoryService.deletion_job_repository.get_active(category_id) or False
+        ProductCategoryService.invalidate_cache()
+
+        limit = get_setting('CATEGORY_DELETE_INLINE_LIMIT', 1000)
+        query, hint = {'category': category.id}, ('category', '_id')
+        if ProductCategoryService.product_repository.count(query, hint, limit=limit + 1) <= limit:
+            repository.delete(category.id)
+            ProductCategoryService._products_removed()
+            return True
+        return ProductCategoryService.start_deletion_job(category)
+
+    @staticmethod
+    def start_deletion_job(category):
+        """Record a background delete of a hidden category and queue it."""
+        total = ProductCategoryService.product_repository.count({'category': category.id}, ('category', '_id'))
+        job = ProductCategoryService.deletion_job_repository.create(category, total)
+        jobs.submit(ProductCategoryService.run_deletion_job, job.id)
+        return job
+
+    @staticmethod
+    def run_deletion_job(job_id):
+        """Delete a hidden category's products in throttled batches, then the category itself."""
+        job = ProductCategoryService.deletion_job_repository.start(job_id)
+        if job is None:
+            return
+        batch_size = get_setting('CATEGORY_DELETE_BATCH_SIZE', 1000)
+        pause = get_setting('CATEGORY_DELETE_PAUSE', 0.05)
+        try:
+            while True:
+                deleted = ProductCategoryService.product_repository.delete_category_batch(job.category, batch_size)
+                if not deleted:
+                    break
+                ProductCategoryService.deletion_job_repository.record_batch(job_id, deleted)
+                # Yield to foreground traffic between batches
+                time.sleep(pause)
+            ProductCategoryService.product_category_repository.delete(job.category)
+            ProductCategoryService.deletion_job_repository.finish(job_id, 'done')
+        except Exception as e:
+            # The category stays hidden; resume_category_deletions can pick the job up again
+            ProductCategoryService.deletion_job_repository.finish(job_id, 'failed', str(e))
+        finally:
+            ProductCategoryService._products_removed()
+
+    @staticmethod
+    def get_deletion_job(job_id):
+        """Fetches the progress record of a background category delete."""
+        return ProductCategoryService.deletion_job_repository.get(job_id)
+
+    @staticmethod
+    def _products_removed():
+        # A cascade removes an unknown number of products
+        ProductCountService.invalidate()
+        ProductFacetService.invalidate_cache()
+
+    @staticmethod
+    def invalidate_cache():
+        """Drops every cached category; called after any category write."""
+        ProductCategoryService.category_cache.clear()
+
+    @staticmethod
+    def cache_stats():
+        """Hit/miss counters and occupancy of the category cache."""
+        return ProductCategoryService.category_cache.stats()
+
+    @staticmethod
+    def _cache_category(category, lookup):
+        """Caches a category under the value it was looked up by, its id and its name."""
+        keys = {str(lookup), str(getattr(category, 'id', lookup)), str(getattr(category, 'name', lookup))}
+        for key in keys:
+            ProductCategoryService.category_cache.set(('category', key), category)
+
     @staticmethod
     def validate_category_data(data):
+        if isinstance(data, list):
+            for item in data:
+                ProductCategoryService.validate_category_data(item)
+            return
+        for field in ('name', 'description'):
+            if data.get(field) is not None and not isinstance(data[field], str):
+                raise ValueError(f"Category {field} must be a string.")
         if not data.get('name') or not data['name'].strip():
             raise ValueError("Category name cannot be empty.")
         if not data.get('description') or not data['description'].strip():
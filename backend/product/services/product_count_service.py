@@ -0,0 +1,130 @@
+import threading
+import time
+
+from product.conf import get_setting
+from product.repositories.product_repository import ProductRepository
+from product.repositories.async_product_repository import AsyncProductRepository
+from product.instrumentation import instrument
+
+COUNT_MODES = ('exact', 'estimated', 'cached', 'incremental', 'none')
+
+
+@instrument('service')
+class ProductCountService:
+    """Serves the total product count for paginated listings without counting on every request.
+
+    Modes:
+      - exact: count the collection on every call.
+      - estimated: read collection metadata via estimated_document_count.
+      - cached: exact count cached for PRODUCT_COUNT_TTL seconds, dropped on local writes.
+      - incremental: exact count seeded once and kept current from ProductService
+        create/delete, re-synced every PRODUCT_COUNT_TTL seconds to absorb writes
+        made by other processes.
+      - none: skip counting entirely.
+
+    cached and incremental keep separate state, so a request can ask for either
+    whatever the default mode is. The kind returned says where the number came
+    from: 'exact' only when it was counted for this request, 'estimated' when it
+    was served from either kind of state (other processes' writes may be missing).
+
+    Filtered listings are counted only in exact mode; the other modes describe
+    the whole collection, so they report no total for a filter.
+    """
+
+    product_repository = ProductRepository()
+    async_product_repository = AsyncProductRepository()
+
+    _lock = threading.Lock()
+    _counts = {}  # 'cached' | 'incremental' -> (count, monotonic time it was counted)
+
+    @staticmethod
+    def default_mode():
+        return get_setting('PRODUCT_COUNT_MODE', 'cached')
+
+    @staticmethod
+    def ttl():
+        return get_setting('PRODUCT_COUNT_TTL', 30)
+
+    @staticmethod
+    def get_count(mode=None, query=None):
+        """Return (count, kind) where kind is 'exact', 'estimated' or 'none'; query is a raw listing filter."""
+        mode = ProductCountService._resolve_mode(mode)
+        if query:
+            return (ProductCountService.product_repository.count(query), 'exact') if mode == 'exact' else (None, 'none')
+        if mode == 'none':
+            return None, 'none'
+        if mode == 'exact':
+            return ProductCountService.product_repository.count(), 'exact'
+        if mode == 'estimated':
+            return ProductCountService.product_repository.estimated_count(), 'estimated'
+
+        cached = ProductCountService._cached(mode)
+        if cached is not None:
+            return cached, 'estimated'
+        return ProductCountService._store(mode, ProductCountService.product_repository.count()), 'exact'
+
+    @staticmethod
+    async def aget_count(mode=None):
+        """get_count for async views: same modes and shared cache, counting through the async driver."""
+        mode = ProductCountService._resolve_mode(mode)
+        if mode == 'none':
+            return None, 'none'
+        if mode == 'exact':
+            return await ProductCountService.async_product_repository.count(), 'exact'
+        if mode == 'estimated':
+            return await ProductCountService.async_product_repository.estimated_count(), 'estimated'
+
+        cached = ProductCountService._cached(mode)
+        if cached is not None:
+            return cached, 'estimated'
+        return ProductCountService._store(mode, await ProductCountService.async_product_repository.count()), 'exact'
+
+    @staticmethod
+    def _resolve_mode(mode):
+        mode = mode or ProductCountService.default_mode()
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Invalid count mode '{mode}'. Allowed: {', '.join(COUNT_MODES)}.")
+        return mode
+
+    @staticmethod
+    def _cached(mode):
+        """The count held for mode while it is fresh, else None."""
+        cls = ProductCountService
+        with cls._lock:
+            entry = cls._counts.get(mode)
+            if entry is not None and time.monotonic() - entry[1] < cls.ttl():
+                return entry[0]
+        return None
+
+    @staticmethod
+    def _store(mode, count):
+        cls = ProductCountService
+        with cls._lock:
+            cls._counts[mode] = (count, time.monotonic())
+        return count
+
+    @staticmethod
+    def record_created(n=1):
+        """Account for products inserted by this process."""
+        ProductCountService._apply_delta(n)
+
+    @staticmethod
+    def record_deleted(n=1):
+        """Account for products deleted by this process."""
+        ProductCountService._apply_delta(-n)
+
+    @staticmethod
+    def invalidate():
+        """Forget the cached counts, e.g. after a cascade that deleted an unknown number of products."""
+        with ProductCountService._lock:
+            ProductCountService._counts.clear()
+
+    @staticmethod
+    def _apply_delta(delta):
+        """Drop the cached count and move the incremental one, whichever mode is the default."""
+        cls = ProductCountService
+        with cls._lock:
+            cls._counts.pop('cached', None)
+            entry = cls._counts.get('incremental')
+            if entry is not None:
+                cls._counts['incremental'] = (max(entry[0] + delta, 0), entry[1])
@@ -0,0 +1,93 @@
+import threading
+
+from bson import json_util
+
+from product.cache import TTLCache
+from product.conf import get_setting
+from product.fast_serializers import format_price
+from product.repositories.product_repository import ProductRepository
+from product.instrumentation import instrument
+
+DEFAULT_PRICE_BOUNDARIES = (0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# The only fields a stock write changes; cached facets filtered on neither stay valid
+STOCK_FIELDS = frozenset(('quantity', 'updated_at'))
+
+
+@instrument('service')
+class ProductFacetService:
+    """Category, brand and price histogram counts for a listing filter.
+
+    Computing facets scans every matching product, so results are cached per
+    filter signature and dropped on product writes. Concurrent misses on one
+    signature compute it once.
+    """
+
+    product_repository = ProductRepository()
+
+    facet_cache = TTLCache(
+        maxsize=get_setting('PRODUCT_FACET_CACHE_SIZE', 256),
+        ttl=get_setting('PRODUCT_FACET_CACHE_TTL', 60),
+    )
+    _generation = 0  # Bumped on every invalidation so a computation that raced a write is not cached
+    _lock = threading.Lock()
+    _compute_locks = tuple(threading.Lock() for _ in range(16))
+
+    @staticmethod
+    def get_facets(filters=None):
+        """Facets for a raw listing filter, as built by product.query_planner.parse_filters."""
+        cls = ProductFacetService
+        filters = filters or {}
+        key = (frozenset(filters), json_util.dumps(filters, sort_keys=True))
+        facets = cls.facet_cache.get(key)
+        if facets is not None:
+            return facets
+
+        with cls._compute_locks[hash(key) % len(cls._compute_locks)]:
+            facets = cls.facet_cache.get(key)
+            if facets is not None:
+                return facets
+            generation = cls._generation
+            facets = cls._compute(filters)
+            with cls._lock:
+                if generation == cls._generation:
+                    cls.facet_cache.set(key, facets)
+        return facets
+
+    @staticmethod
+    def _compute(filters):
+        # Imported here because category writes invalidate this cache
+        from product.services.product_category_service import ProductCategoryService
+
+        boundaries = get_setting('PRODUCT_FACET_PRICE_BOUNDARIES', DEFAULT_PRICE_BOUNDARIES)
+        result = ProductFacetService.product_repository.facets(filters, boundaries, get_setting('PRODUCT_FACET_LIMIT', 50))
+        categories = ProductCategoryService.get_categories_by_ids([row['_id'] for row in result['categories']])
+
+        # $bucket leaves out empty buckets; report every bucket so the histogram keeps its shape
+        bucket_counts = {row['_id']: row['count'] for row in result['price']}
+        price = [
+            {'min': format_price(lower), 'max': format_price(upper), 'count': bucket_counts.get(lower, 0)}
+            for lower, upper in zip(boundaries, boundaries[1:])
+        ]
+        price.append({'min': format_price(boundaries[-1]), 'max': None, 'count': bucket_counts.get('other', 0)})
+
+        return {
+            'count': result['total'][0]['count'] if result['total'] else 0,
+            'categories': [
+                {'id': str(row['_id']), 'name': getattr(categories.get(row['_id']), 'name', None), 'count': row['count']}
+                for row in result['categories']
+            ],
+            'brands': [{'brand': row['_id'], 'count': row['count']} for row in result['brands']],
+            'price': price,
+        }
+
+    @staticmethod
+    def invalidate_cache(fields=None):
+        """Drop cached facets after a product write; fields limits it to results filtered on them."""
+        cls = ProductFacetService
+        with cls._lock:
+            cls._generation += 1
+            if fields is None:
+                cls.facet_cache.clear()
+            else:
+                cls.facet_cache.delete_matching(lambda key: not key[0].isdisjoint(fields))
@@ -1,26 +1,135 @@
 from product.repositories.product_repository import ProductRepository
+from product.services.product_count_service import ProductCountService
+from product.services.product_category_service import ProductCategoryService
+from product.services.product_facet_service import ProductFacetService, STOCK_FIELDS
+from product.models import Product
+from product.query_planner import plan_query, public_sort_name
+from product.pagination import decode_cursor, decode_search_cursor, encode_cursor, encode_search_cursor, resolve_sort_field
 from mongoengine import ValidationError, NotUniqueError, DoesNotExist
-from datetime import datetime
+from product.conf import get_setting
+from product.instrumentation import instrument
+from bson import ObjectId
+from datetime import datetime, timedelta
+from decimal import Decimal
 
+# Largest quantity, delta or set value BSON can encode (int64); larger ints raise OverflowError
+MAX_STOCK_VALUE = 2 ** 63 - 1
+# Product.price is stored to the cent
+PRICE_QUANTUM = Decimal('0.01')
+
+class ProductNotFoundError(ValueError):
+    """Raised when the product addressed by an operation does not exist."""
+
+class InsufficientStockError(ValueError):
+    """Raised when a stock decrement would take quantity below zero."""
+
+    def __init__(self, message, quantity):
+        super().__init__(message)
+        self.quantity = quantity
+
+@instrument('service')
 class ProductService:
     """Service layer for business logic and validations."""
     
     product_repository = ProductRepository()  # Instantiate the repository
+    search_backend = ProductRepository()  # Anything with search_text(), e.g. product.search.InMemorySearchIndex
+
+    @staticmethod
+    def get_all_products(page=1, page_size=10, sort_by=None, order='asc', raw=False, fields=None, filters=None):
+        """Fetch a page of products, optionally filtered (see product.query_planner) and sorted."""
+        if order not in ('asc', 'desc'):
+            raise ValueError("Order must be 'asc' or 'desc'.")
+        plan = ProductService.plan_listing(filters, resolve_sort_field(sort_by))
+        # Categories stay references (raw ids or DBRefs): responses only render their id
+        return ProductService.product_repository.get_all_paginated(
+            page, page_size, sort_by, order, raw=raw, fields=fields, query=filters or None, hint=plan.index
+        )
+
+    @staticmethod
+    def plan_listing(filters=None, sort_field='_id'):
+        """Choose the index for a listing, capping how many matches may be sorted in memory."""
+        plan = plan_query(filters or {}, sort_field)
+        if plan.blocking_sort:
+            cap = get_setting('PRODUCT_QUERY_SORT_CAP', 10000)
+            if ProductService.product_repository.count(filters, plan.index, limit=cap + 1) > cap:
+                if plan.fallback is None:
+                    raise ValueError(
+                        f"More than {cap} products match these filters to sort by '{public_sort_name(sort_field)}'. "
+                        "Narrow the filters or choose another sort."
+                    )
+                plan = plan.fallback
+        return plan
+
+    @staticmethod
+    def get_products_by_cursor(cursor=None, page_size=10, sort_by=None, order='asc', raw=False, fields=None, filters=None):
+        """Fetch a keyset page of products along with its next/prev cursors."""
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        if cursor:
+            # The cursor pins the sort so later pages stay consistent with the first one
+            sort_field, order, direction, value, last_id = decode_cursor(cursor)
+        else:
+            if order not in ('asc', 'desc'):
+                raise ValueError("Order must be 'asc' or 'desc'.")
+            sort_field, direction, value, last_id = resolve_sort_field(sort_by), 'next', None, None
+
+        plan = ProductService.plan_listing(filters, sort_field)
+        products, has_more = ProductService.product_repository.get_page_after(
+            page_size, sort_field, order, direction, value, last_id, raw=raw, fields=fields, query=filters or None, hint=plan.index
+        )
+
+        next_cursor = prev_cursor = None
+        if products:
+            if direction == 'prev' or has_more:
+                next_cursor = ProductService._cursor_for(products[-1], sort_field, order, 'next')
+            if (direction == 'next' and cursor) or (direction == 'prev' and has_more):
+                prev_cursor = ProductService._cursor_for(products[0], sort_field, order, 'prev')
+        return products, next_cursor, prev_cursor
+
+    @staticmethod
+    def _cursor_for(product, sort_field, order, direction):
+        """Encode a cursor positioned at the given product (document or raw dict)."""
+        if isinstance(product, dict):
+            return encode_cursor(sort_field, order, direction, product.get(sort_field), product['_id'])
+        if sort_field == '_id':
+            value = product.id
+        else:
+            value = Product._fields[sort_field].to_mongo(getattr(product, sort_field))
+        return encode_cursor(sort_field, order, direction, value, product.id)
+
+    @staticmethod
+    def search_products(query, page_size=10, cursor=None):
+        """Rank products against a text query, returning a page of raw hits and the next cursor."""
+        query = (query or '').strip()
+        if not query:
+            raise ValueError("A search query is required.")
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        after = decode_search_cursor(cursor, query) if cursor else None
+
+        # Fetch one extra hit to learn whether another page follows
+        hits = ProductService.search_backend.search_text(query, page_size + 1, after)
+        next_cursor = None
+        if len(hits) > page_size:
+            hits = hits[:page_size]
+            next_cursor = encode_search_cursor(query, hits[-1]['score'], hits[-1]['_id'])
+        return hits, next_cursor
 
     @staticmethod
-    def get_all_products(page=1, page_size=10, sort_by=None, order='asc'):
-        return ProductService.product_repository.get_all_paginated(page, page_size, sort_by, order)
+    def stream_products(batch_size=None):
+        """Lazily iterate the whole catalog as raw documents, for exports."""
+        return ProductService.product_repository.stream_all(batch_size or get_setting('PRODUCT_EXPORT_BATCH_SIZE', 1000))
 
     @staticmethod
-    def get_product_by_id(product_id):
+    def get_product_by_id(product_id, raw=False, fields=None):
         try:
-            return ProductService.product_repository.get_by_id(product_id)
+            return ProductService.product_repository.get_by_id(product_id, raw=raw, fields=fields)
         except DoesNotExist:
             return None
     
     @staticmethod
-    def get_product_by_category(category_id):
-        return ProductService.product_repository.get_by_category(category_id)
+    def get_product_by_category(category_id, raw=False, fields=None):
+        return ProductService.product_repository.get_by_category(category_id, raw=raw, fields=fields)
     
     @staticmethod
     def find_products_by_name(product_name):
@@ -33,32 +142,255 @@ class ProductService:
         if existing_products:
             raise ValueError("A product with this name already exists.")
         try:
+            # Product.save() inside create sets created_at and updated_at
             product = ProductService.product_repository.create(product_data)
-            product.save()  # This will ensure created_at and updated_at are set correctly by MongoEngine
+            ProductCountService.record_created()
+            ProductFacetService.invalidate_cache()
             return product
         except (ValidationError, NotUniqueError) as e:
             raise ValueError(f"Failed to create product: {str(e)}")
     
+    @staticmethod
+    def bulk_create_products(items, chunk_size=None):
+        """Create many products, reporting success or failure per input position.
+
+        Items are validated in one pass (categories resolved with a single query)
+        and written with one unordered insert_many per chunk, so duplicates and
+        invalid items are reported without aborting the rest of the batch.
+        """
+        chunk_size = chunk_size or get_setting('PRODUCT_BULK_CHUNK_SIZE', 1000)
+        results = [None] * len(items)
+
+        category_ids = {
+            ObjectId(item['category']) for item in items
+            if isinstance(item, dict) and ObjectId.is_valid(item.get('category'))
+        }
+        categories = ProductCategoryService.get_categories_by_ids(category_ids)
+
+        positions, documents = [], []
+        for index, item in enumerate(items):
+            try:
+                documents.append(ProductService.build_product_document(item, categories))
+                positions.append(index)
+            except ValueError as e:
+                results[index] = {"index": index, "error": str(e)}
+
+        inserted = 0
+        for start in range(0, len(documents), chunk_size):
+            chunk = documents[start:start + chunk_size]
+            errors = ProductService.product_repository.insert_many(chunk)
+            for offset, document in enumerate(chunk):
+                index = positions[start + offset]
+                if offset in errors:
+                    results[index] = {"index": index, "error": errors[offset]}
+                else:
+                    results[index] = {"index": index, "id": str(document['_id'])}
+                    inserted += 1
+
+        ProductCountService.record_created(inserted)
+        if inserted:
+            ProductFacetService.invalidate_cache()
+        return results
+
+    @staticmethod
+    def build_product_document(item, categories):
+        """Validate one bulk item and convert it to a raw document ready for insert_many.
+
+        categories maps category ObjectIds to ProductCategory documents.
+        """
+        if not isinstance(item, dict):
+            raise ValueError("Each product must be a JSON object.")
+        ProductService.validate_product_data(item)
+
+        category_id = item['category']
+        if not ObjectId.is_valid(category_id) or ObjectId(category_id) not in categories:
+            raise ValueError(f"Category '{category_id}' does not exist.")
+
+        now = datetime.utcnow()
+        product = Product(
+            name=item['name'],
+            description=item['description'],
+            category=categories[ObjectId(category_id)],
+            price=Decimal(str(item['price'])),
+            brand=item['brand'],
+            quantity=int(item['quantity']),
+            created_at=now,
+            updated_at=now,
+        )
+        try:
+            product.validate()
+        except ValidationError as e:
+            raise ValueError(f"Invalid product: {e.to_dict()}")
+        document = product.to_mongo().to_dict()
+        document['_id'] = ObjectId()  # Assigned client-side so results can report ids
+        return document
+
     @staticmethod
     def update_product(product_id, updated_data):
-        product = ProductService.get_product_by_id(product_id)
-        if not product:
-            raise ValueError("Product not found.")
-        if not product.brand or product.brand.strip() == "":
-            updated_data['brand'] = "Unknown"
-        ProductService.validate_product_data(updated_data)
-        existing_products = ProductService.find_products_by_name(updated_data['name'])
-        if existing_products and str(existing_products.id) != str(product_id):
-            raise ValueError("A product with this name already exists.")
+        """Apply a partial update in one round trip; name uniqueness is left to the unique index."""
+        ProductService.validate_product_data(updated_data, partial=True)
+        changes = {key: value for key, value in updated_data.items() if key not in ('id', 'created_at', 'updated_at')}
         try:
-            for key, value in updated_data.items():
-                setattr(product, key, value)
-            product.updated_at = datetime.utcnow()  # Manually updating updated_at if needed
-            product.save()  # This will update both created_at (if it's new) and updated_at
-            return product
-        except (ValidationError, NotUniqueError) as e:
+            product = ProductService.product_repository.update(product_id, changes)
+        except NotUniqueError:
+            raise ValueError("A product with this name already exists.")
+        except ValidationError as e:
             raise ValueError(f"Failed to update product: {str(e)}")
+        if product is None:
+            raise ProductNotFoundError("Product not found.")
+        ProductFacetService.invalidate_cache()
+        return product
     
+    @staticmethod
+    def adjust_stock(product_id, delta):
+        """Add delta (negative to take stock) to a product's quantity; returns the new quantity."""
+        if isinstance(delta, bool) or not isinstance(delta, int) or delta == 0:
+            raise ValueError("delta must be a non-zero integer.")
+        if abs(delta) > MAX_STOCK_VALUE:
+            raise ValueError(f"delta must be between -{MAX_STOCK_VALUE} and {MAX_STOCK_VALUE}.")
+        quantity = ProductService.product_repository.adjust_stock(product_id, delta)
+        if quantity is not None:
+            ProductFacetService.invalidate_cache(STOCK_FIELDS)
+            return quantity
+
+        # The write matched nothing; only this failure path pays for a second lookup
+        product = ProductService.product_repository.get_by_id(product_id, raw=True, fields=('quantity',))
+        if not product:
+            raise ProductNotFoundError("Product not found.")
+        raise InsufficientStockError("Insufficient stock.", product.get('quantity'))
+
+    @staticmethod
+    def bulk_adjust_stock(operations, chunk_size=None):
+        """Apply many stock operations ({id|name, delta|set}) with one bulk_write per chunk.
+
+        Returns (matched, modified, failures) where failures lists {"index", "error"}
+        for invalid operations and for operations that matched no product. bulk_write
+        only reports counts, so when a chunk falls short one follow-up query reads the
+        targets back. A chunk never writes the same id or name twice and stamps its
+        own updated_at, so a product still without that stamp was not changed by it:
+        a missing product is "not found" and an unchanged product short of a guarded
+        decrement is "insufficient stock".
+        """
+        chunk_size = chunk_size or get_setting('PRODUCT_BULK_CHUNK_SIZE', 1000)
+        failures, matched, modified = [], 0, 0
+
+        positions, requests = [], []
+        now = datetime.utcnow()
+        for index, operation in enumerate(operations):
+            try:
+                requests.append(ProductService.build_stock_operation(operation, now))
+                positions.append(index)
+            except ValueError as e:
+                failures.append({"index": index, "error": str(e)})
+
+        stamp = None
+        for chunk_positions, chunk in ProductService._stock_chunks(positions, requests, chunk_size):
+            stamp = ProductService._chunk_stamp(stamp)
+            for _, update in chunk:
+                update['$set']['updated_at'] = stamp
+            chunk_matched, chunk_modified, errors = ProductService.product_repository.bulk_update(chunk)
+            matched += chunk_matched
+            modified += chunk_modified
+            for offset, message in errors.items():
+                failures.append({"index": chunk_positions[offset], "error": message})
+            shortfall = len(chunk) - chunk_matched - len(errors)
+            if shortfall > 0:
+                failures.extend(ProductService._unmatched_stock_operations(
+                    chunk, chunk_positions, errors, stamp
+                )[:shortfall])
+
+        if modified:
+            ProductFacetService.invalidate_cache(STOCK_FIELDS)
+        failures.sort(key=lambda failure: failure["index"])
+        return matched, modified, failures
+
+    @staticmethod
+    def _stock_chunks(positions, requests, chunk_size):
+        """Split operations into (positions, requests) chunks that target each id or name at most once.
+
+        Repeated targets start a new chunk, so they are applied one after another
+        and each can be checked on its own.
+        """
+        chunk_positions, chunk, targets = [], [], set()
+        for position, (query, update) in zip(positions, requests):
+            target = ('_id', query['_id']) if '_id' in query else ('name', query['name'])
+            if len(chunk) >= chunk_size or target in targets:
+                yield chunk_positions, chunk
+                chunk_positions, chunk, targets = [], [], set()
+            chunk_positions.append(position)
+            chunk.append((query, update))
+            targets.add(target)
+        if chunk:
+            yield chunk_positions, chunk
+
+    @staticmethod
+    def _chunk_stamp(previous):
+        """The current time at BSON (millisecond) precision, strictly after previous."""
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        return now if previous is None or now > previous else previous + timedelta(milliseconds=1)
+
+    @staticmethod
+    def _unmatched_stock_operations(chunk, positions, errors, stamp):
+        """Work out which operations of a chunk matched nothing, from the state after the write.
+
+        Missing products come first, as they are certain.
+        """
+        ids = [query['_id'] for query, _ in chunk if '_id' in query]
+        names = [query['name'] for query, _ in chunk if 'name' in query]
+        by_id, by_name = {}, {}
+        for product in ProductService.product_repository.get_stock_levels(ids, names):
+            by_id[product['_id']] = by_name[product.get('name')] = product
+
+        missing, insufficient = [], []
+        for offset, (query, _) in enumerate(chunk):
+            if offset in errors:
+                continue
+            product = by_id.get(query['_id']) if '_id' in query else by_name.get(query['name'])
+            if product is None:
+                missing.append({"index": positions[offset], "error": "Product not found."})
+            elif ('quantity' in query and product.get('updated_at') != stamp
+                  and product.get('quantity', 0) < query['quantity']['$gte']):
+                insufficient.append({"index": positions[offset], "error": "Insufficient stock.", "quantity": product.get('quantity')})
+        return missing + insufficient
+
+    @staticmethod
+    def build_stock_operation(operation, now):
+        """Validate one stock operation and turn it into a (filter, update) pair."""
+        if not isinstance(operation, dict):
+            raise ValueError("Each operation must be a JSON object.")
+        if ('id' in operation) == ('name' in operation):
+            raise ValueError("Each operation needs exactly one of 'id' or 'name'.")
+        if ('delta' in operation) == ('set' in operation):
+            raise ValueError("Each operation needs exactly one of 'delta' or 'set'.")
+
+        if 'id' in operation:
+            if not ObjectId.is_valid(operation['id']):
+                raise ValueError("Invalid product ID.")
+            query = {'_id': ObjectId(operation['id'])}
+        else:
+            if not isinstance(operation['name'], str) or not operation['name'].strip():
+                raise ValueError("Product name cannot be empty.")
+            query = {'name': operation['name']}
+
+        if 'delta' in operation:
+            delta = operation['delta']
+            if isinstance(delta, bool) or not isinstance(delta, int) or delta == 0:
+                raise ValueError("delta must be a non-zero integer.")
+            if abs(delta) > MAX_STOCK_VALUE:
+                raise ValueError(f"delta must be between -{MAX_STOCK_VALUE} and {MAX_STOCK_VALUE}.")
+            if delta < 0:
+                query['quantity'] = {'$gte': -delta}  # Same oversell guard as adjust_stock
+            update = {'$inc': {'quantity': delta}, '$set': {'updated_at': now}}
+        else:
+            quantity = operation['set']
+            if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 0:
+                raise ValueError("set must be an integer of 0 or greater.")
+            if quantity > MAX_STOCK_VALUE:
+                raise ValueError(f"set must be at most {MAX_STOCK_VALUE}.")
+            update = {'$set': {'quantity': quantity, 'updated_at': now}}
+        return query, update
+
     @staticmethod
     def delete_product(product_id):
         product = ProductService.get_product_by_id(product_id)
@@ -66,29 +398,48 @@ class ProductService:
             raise ValueError("Product not found.")
         try:
             ProductService.product_repository.delete(product_id)
+            ProductCountService.record_deleted()
+            ProductFacetService.invalidate_cache()
             return True
         except Exception as e:
             raise ValueError(f"Failed to delete product: {str(e)}")
         
     @staticmethod
-    def validate_product_data(data):
-        if not data.get('name') or not data['name'].strip():
+    def validate_product_data(data, partial=False):
+        """Validate product fields; with partial=True only the fields present are checked."""
+        def check(field):
+            return not partial or field in data
+
+        # Bulk and import items arrive as raw JSON, so text fields may not be strings
+        for field in ('name', 'description', 'brand'):
+            if check(field) and data.get(field) is not None and not isinstance(data[field], str):
+                raise ValueError(f"Product {field} must be a string.")
+        if check('name') and (not data.get('name') or not data['name'].strip()):
             raise ValueError("Product name cannot be empty.")
-        if not data.get('description') or not data['description'].strip():
+        if check('description') and (not data.get('description') or not data['description'].strip()):
             raise ValueError("Product description cannot be empty.")
-        if not data.get('category') or (isinstance(data['category'], str) and not data['category'].strip()):
+        if check('category') and (not data.get('category') or (isinstance(data['category'], str) and not data['category'].strip())):
             raise ValueError("Product category cannot be empty.")
-        if not data.get('brand') or not data['brand'].strip():
+        if check('brand') and (not data.get('brand') or not data['brand'].strip()):
             raise ValueError("Product brand cannot be empty.")
-        try:
-            price = float(data['price'])
-            if price <= 0:
-                raise ValueError("Price must be greater than 0.")
-        except (ValueError, TypeError):
-            raise ValueError("Price must be a valid number (float).")
-        try:
-            quantity = int(data['quantity'])
-            if quantity < 0:
-                raise ValueError("Quantity must be 0 or greater.")
-        except (ValueError, TypeError):
-            raise ValueError("Quantity must be a valid integer.")
+        if check('price'):
+            price = data.get('price')
+            try:
+                if isinstance(price, bool):
+                    raise TypeError(price)
+                # Parse as the Product field stores it, so NaN, infinity and too many digits fail here
+                price = Decimal(str(price)).quantize(PRICE_QUANTUM)
+                if price <= 0:
+                    raise ValueError("Price must be greater than 0.")
+            except (ArithmeticError, ValueError, TypeError):
+                raise ValueError("Price must be a valid number (float).")
+        if check('quantity'):
+            quantity = data.get('quantity')
+            try:
+                if isinstance(quantity, bool) or (isinstance(quantity, float) and not quantity.is_integer()):
+                    raise TypeError(quantity)
+                quantity = int(quantity)
+                if not 0 <= quantity <= MAX_STOCK_VALUE:
+                    raise ValueError("Quantity must be between 0 and the int64 maximum.")
+            except (ValueError, TypeError, OverflowError):
+                raise ValueError("Quantity must be a valid integer.")
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+from product.pagination import decode_cursor
+from product.repositories.async_product_repository import _mongo_sort
+from product.services.async_product_service import AsyncProductService, AsyncProductCategoryService
+from product.services.product_category_service import ProductCategoryService
+
+class TestAsyncProductService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.mock_repo = MagicMock()
+        self.mock_repo.get_page_after = AsyncMock()
+        self.mock_repo.get_all_paginated = AsyncMock()
+        self.original_repo = AsyncProductService.product_repository
+        AsyncProductService.product_repository = self.mock_repo
+        ProductCategoryService.category_cache.clear()
+
+    def tearDown(self):
+        AsyncProductService.product_repository = self.original_repo
+
+    async def test_get_all_products(self):
+        docs = [{"_id": ObjectId(), "name": "Laptop"}]
+        self.mock_repo.get_all_paginated.return_value = (docs, True)
+        self.assertEqual(await AsyncProductService.get_all_products(2, 5, "price", "desc"), (docs, True))
+        self.mock_repo.get_all_paginated.assert_awaited_once_with(2, 5, "price", "desc")
+
+    async def test_get_products_by_cursor_builds_next_cursor(self):
+        docs = [{"_id": ObjectId(), "price": 10.0}, {"_id": ObjectId(), "price": 12.0}]
+        self.mock_repo.get_page_after.return_value = (docs, True)
+        products, next_cursor, prev_cursor = await AsyncProductService.get_products_by_cursor(page_size=2, sort_by="price")
+        self.assertEqual(products, docs)
+        self.assertIsNone(prev_cursor)
+        self.assertEqual(decode_cursor(next_cursor), ("price", "asc", "next", 12.0, docs[-1]["_id"]))
+        self.mock_repo.get_page_after.assert_awaited_once_with(2, "price", "asc", "next", None, None)
+
+    async def test_get_products_by_cursor_rejects_bad_order(self):
+        with self.assertRaises(ValueError):
+            await AsyncProductService.get_products_by_cursor(order="sideways")
+
+    async def test_categories_are_cached(self):
+        repo = MagicMock(get_all=AsyncMock(return_value=[{"_id": ObjectId(), "name": "Electronics"}]))
+        original = AsyncProductCategoryService.product_category_repository
+        AsyncProductCategoryService.product_category_repository = repo
+        try:
+            first = await AsyncProductCategoryService.get_all_categories()
+            second = await AsyncProductCategoryService.get_all_categories()
+        finally:
+            AsyncProductCategoryService.product_category_repository = original
+        self.assertIs(first, second)
+        repo.get_all.assert_awaited_once()
+
+    def test_mongo_sort(self):
+        self.assertEqual(_mongo_sort(["-price", "-id"]), [("price", -1), ("_id", -1)])
+        self.assertEqual(_mongo_sort(["name"]), [("name", 1)])
+
+if __name__ == '__main__':
+    unittest.main()
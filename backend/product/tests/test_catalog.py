@@ -0,0 +1,43 @@
+import unittest
+from collections import Counter
+
+from product.models import Product
+from product.seeds.catalog import CatalogGenerator
+
+
+class TestCatalogGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = CatalogGenerator(5000, categories=50, seed=7)
+        self.products = list(self.generator.iter_products(batch_size=1000))
+
+    def test_same_seed_same_catalog(self):
+        again = CatalogGenerator(5000, categories=50, seed=7)
+        self.assertEqual(again.categories, self.generator.categories)
+        self.assertEqual(again.product_batch(3000, 4000), self.products[3000:4000])
+        self.assertNotEqual(CatalogGenerator(5000, categories=50, seed=8).product_batch(0, 10), self.products[:10])
+
+    def test_ids_and_names_are_unique(self):
+        self.assertEqual(len({product['_id'] for product in self.products}), 5000)
+        self.assertEqual(len({product['name'] for product in self.products}), 5000)
+        self.assertEqual(len({category['name'] for category in self.generator.categories}), 50)
+        self.assertEqual(len({category['name'] for category in CatalogGenerator(0, categories=400).categories}), 400)
+
+    def test_categories_and_brands_are_skewed(self):
+        per_category = Counter(product['category'] for product in self.products)
+        per_brand = Counter(product['brand'] for product in self.products)
+        self.assertEqual(per_category.most_common(1)[0][0], self.generator.categories[0]['_id'])
+        self.assertGreater(per_category.most_common(1)[0][1], 10 * (5000 // 50) / 5)
+        self.assertGreater(per_brand.most_common(1)[0][1], 5 * min(per_brand.values()))
+
+    def test_documents_pass_model_validation(self):
+        for document in self.products[:200]:
+            product = Product._from_son(document)
+            product.validate()
+            self.assertLessEqual(document['created_at'], document['updated_at'])
+            self.assertEqual(round(document['price'], 2), document['price'])
+
+    def test_batches_cover_every_product_once(self):
+        self.assertEqual(self.generator.batches(2000), [(0, 2000), (2000, 4000), (4000, 5000)])
+        with self.assertRaises(ValueError):
+            CatalogGenerator(10, categories=0)
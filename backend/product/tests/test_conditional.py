@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from bson import ObjectId
+from django.http import HttpResponse
+from django.test import RequestFactory
+from product.conditional import is_conditional, last_modified, not_modified, set_validators, versions_etag
+from product.controllers.product_controller import ProductController
+from product.services.product_count_service import ProductCountService
+from product.services.product_service import ProductService
+
+def make_request(**headers):
+    return SimpleNamespace(method="GET", META=headers)
+
+class TestConditional(unittest.TestCase):
+
+    def setUp(self):
+        self.docs = [
+            {"_id": ObjectId(), "updated_at": datetime(2025, 3, 1, 20, 0, 0)},
+            {"_id": ObjectId(), "updated_at": datetime(2025, 3, 1, 20, 45, 30, 123000)},
+        ]
+
+    def test_etag_ignores_fields_beyond_the_version(self):
+        full = [dict(doc, name="Laptop", price=1200.0) for doc in self.docs]
+        self.assertEqual(versions_etag(full), versions_etag(self.docs))
+
+    def test_etag_changes_with_updated_at_and_page_state(self):
+        etag = versions_etag(self.docs, 2, "exact")
+        touched = [self.docs[0], dict(self.docs[1], updated_at=datetime(2025, 3, 2))]
+        self.assertNotEqual(versions_etag(touched, 2, "exact"), etag)
+        self.assertNotEqual(versions_etag(self.docs, 3, "exact"), etag)
+
+    def test_last_modified_is_latest_timestamp(self):
+        self.assertEqual(last_modified(self.docs), 1740861930)
+        self.assertIsNone(last_modified([]))
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = versions_etag(self.docs)
+        response = not_modified(make_request(HTTP_IF_NONE_MATCH=etag), etag, last_modified(self.docs))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("Last-Modified", response)
+
+    def test_stale_etag_returns_none(self):
+        request = make_request(HTTP_IF_NONE_MATCH='"stale"')
+        self.assertIsNone(not_modified(request, versions_etag(self.docs)))
+
+    def test_if_modified_since(self):
+        modified = last_modified(self.docs)
+        self.assertIsNotNone(not_modified(make_request(HTTP_IF_MODIFIED_SINCE="Sun, 02 Mar 2025 00:00:00 GMT"), '"x"', modified))
+        self.assertIsNone(not_modified(make_request(HTTP_IF_MODIFIED_SINCE="Sat, 01 Mar 2025 00:00:00 GMT"), '"x"', modified))
+
+    def test_is_conditional(self):
+        self.assertFalse(is_conditional(make_request()))
+        self.assertTrue(is_conditional(make_request(HTTP_IF_NONE_MATCH='"x"')))
+
+    def test_set_validators(self):
+        response = set_validators(HttpResponse(), '"abc"', 0)
+        self.assertEqual(response["ETag"], '"abc"')
+        self.assertEqual(response["Last-Modified"], "Thu, 01 Jan 1970 00:00:00 GMT")
+
+class TestListValidators(unittest.TestCase):
+
+    def setUp(self):
+        self.docs = [{"_id": ObjectId(), "updated_at": datetime(2025, 3, 1, 20, 0, 0)}]
+        patcher = patch.object(ProductService, "get_all_products", return_value=(self.docs, False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, **headers):
+        return ProductController().get(RequestFactory().get("/api/products/", **headers))
+
+    @patch.object(ProductCountService, "get_count", return_value=(1, "exact"))
+    def test_pages_send_etag_without_last_modified(self, _):
+        response = self.get()
+        self.assertIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        # A page can change without its newest updated_at moving, so If-Modified-Since alone never gets a 304
+        self.assertEqual(self.get(HTTP_IF_MODIFIED_SINCE="Sun, 02 Mar 2025 00:00:00 GMT").status_code, 200)
+
+    @patch.object(ProductCountService, "get_count")
+    def test_etag_ignores_count_type(self, get_count):
+        get_count.return_value = (1, "exact")
+        etag = self.get()["ETag"]
+        get_count.return_value = (1, "estimated")
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+if __name__ == '__main__':
+    unittest.main()
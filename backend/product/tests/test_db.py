@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+import mongoengine
+from mongoengine.connection import get_connection
+from pymongo import monitoring
+from product import db
+
+ADDRESS = ("localhost", 27017)
+
+class TestPoolStatsListener(unittest.TestCase):
+
+    def setUp(self):
+        self.listener = db.PoolStatsListener()
+
+    def test_tracks_open_and_checked_out_connections(self):
+        for connection_id in (1, 2):
+            self.listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, connection_id))
+            self.listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, connection_id, 0.002))
+        self.listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+        self.listener.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 1, "idle"))
+
+        pool = self.listener.snapshot(max_pool_size=4)["localhost:27017"]
+        self.assertEqual((pool["open"], pool["checked_out"], pool["max_checked_out"], pool["checkouts"]), (1, 1, 2, 2))
+        self.assertEqual(pool["utilization"], 0.25)
+        self.assertEqual(pool["avg_wait_ms"], 2.0)
+
+    def test_failed_checkouts_count_towards_wait(self):
+        self.listener.connection_check_out_failed(monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 0.5))
+        pool = self.listener.snapshot(max_pool_size=1)["localhost:27017"]
+        self.assertEqual(pool["checkout_failures"], 1)
+        self.assertEqual(pool["max_wait_ms"], 500.0)
+
+    def test_reset(self):
+        self.listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+        self.listener.reset()
+        self.assertEqual(self.listener.snapshot(max_pool_size=1), {})
+
+class TestConnection(unittest.TestCase):
+
+    def setUp(self):
+        mongoengine.disconnect()
+        self.options = {"maxPoolSize": 10, "compressors": "", "socketTimeoutMS": None, "serverSelectionTimeoutMS": "500"}
+        patcher = patch.object(db, "get_setting", side_effect=lambda name, default: {
+            "MONGO_CLIENT_OPTIONS": self.options, "MONGO_URI": "mongodb://localhost:27017", "MONGO_DB_NAME": "product_test_db",
+        }.get(name, default))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(mongoengine.disconnect)
+
+    def test_client_options_skip_unset_values(self):
+        self.assertEqual(db.client_options(), {"maxPoolSize": 10, "serverSelectionTimeoutMS": "500"})
+
+    def test_connect_applies_pool_options_and_listener(self):
+        db.connect()
+        client = get_connection()
+        self.assertEqual(client.options.pool_options.max_pool_size, 10)
+        self.assertIn(db.sync_pool_stats, client.options.event_listeners)
+
+    def test_reset_after_fork_replaces_client_without_closing_it(self):
+        db.connect()
+        inherited = get_connection()
+        with patch.object(inherited, "close") as close:
+            db.reset_after_fork()
+        close.assert_not_called()
+        self.assertIsNot(get_connection(), inherited)
+    def test_close_async_client_forgets_the_loops_client(self):
+        async def run():
+            client = db.get_async_client()
+            self.assertIs(db.get_async_client(), client)
+            await db.close_async_client()
+            self.assertIsNot(db.get_async_client(), client)
+            await db.close_async_client()
+            await db.close_async_client()  # Nothing left to close
+
+        asyncio.run(run())
+        self.assertEqual(len(db._clients), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime
+from bson import ObjectId
+import csv
+import io
+import json
+from product.fast_serializers import (
+    EXPORT_FIELDS, csv_chunks, dumps, format_price, format_timestamp, ndjson_chunks, parse_fields, product_to_dict,
+    read_fields,
+)
+from product.serializers import ProductSerializer
+
+class TestFastSerializers(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = {
+            "_id": ObjectId(),
+            "name": "Laptop",
+            "description": "High-performance laptop",
+            "category": ObjectId(),
+            "price": 1200.0,
+            "brand": "Dell",
+            "quantity": 10,
+            "created_at": datetime(2025, 3, 1, 20, 0, 0),
+            "updated_at": datetime(2025, 3, 1, 20, 45, 30, 123000),
+        }
+
+    def test_product_to_dict_matches_serializer_fields(self):
+        data = product_to_dict(self.doc)
+        self.assertEqual(list(data), ProductSerializer.Meta.fields)
+        self.assertEqual(data["id"], str(self.doc["_id"]))
+        self.assertEqual(data["category"], str(self.doc["category"]))
+
+    def test_product_to_dict_sparse_fieldset(self):
+        data = product_to_dict({"_id": self.doc["_id"], "price": 5.5, "updated_at": self.doc["updated_at"]}, ("id", "price"))
+        self.assertEqual(data, {"id": str(self.doc["_id"]), "price": "5.50"})
+
+    def test_parse_fields_keeps_response_order(self):
+        self.assertIsNone(parse_fields(None))
+        self.assertEqual(parse_fields("quantity, price,name,price"), ("name", "price", "quantity"))
+
+    def test_parse_fields_rejects_unknown_and_empty(self):
+        with self.assertRaisesRegex(ValueError, "Unknown fields: secret"):
+            parse_fields("name,secret")
+        with self.assertRaises(ValueError):
+            parse_fields(" , ")
+
+    def test_read_fields_projects_stored_fields_and_updated_at(self):
+        self.assertIsNone(read_fields(None))
+        self.assertEqual(read_fields(("id", "name", "price")), ("name", "price", "updated_at"))
+        self.assertEqual(read_fields(("id",)), ("updated_at",))
+        self.assertEqual(read_fields(("updated_at",)), ("updated_at",))
+
+    def test_timestamps_are_rendered_in_ist(self):
+        data = product_to_dict(self.doc)
+        self.assertEqual(data["created_at"], "2025-03-02 01:30:00")
+        self.assertEqual(data["updated_at"], "2025-03-02 02:15:30")
+        self.assertIsNone(format_timestamp(None))
+
+    def test_price_is_rendered_with_two_decimals(self):
+        self.assertEqual(format_price(1200.0), "1200.00")
+        self.assertEqual(format_price(19.99), "19.99")
+        self.assertEqual(format_price(0.1), "0.10")
+
+    def test_dumps_is_compact_utf8(self):
+        self.assertEqual(dumps({"name": "Café", "tags": [1, 2]}), '{"name":"Café","tags":[1,2]}'.encode("utf-8"))
+
+    def test_ndjson_chunks_one_object_per_line(self):
+        docs = [dict(self.doc, _id=ObjectId()) for _ in range(5)]
+        chunks = list(ndjson_chunks(docs, rows_per_chunk=2))
+        self.assertEqual(len(chunks), 3)
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [product_to_dict(doc) for doc in docs])
+
+    def test_csv_chunks_header_and_quoting(self):
+        docs = [dict(self.doc, name='Laptop, "Pro"', description="Two\nlines")]
+        rows = list(csv.reader(io.StringIO(b"".join(csv_chunks(docs)).decode("utf-8"))))
+        self.assertEqual(rows[0], list(EXPORT_FIELDS))
+        self.assertEqual(rows[1][1:3], ['Laptop, "Pro"', "Two\nlines"])
+        self.assertEqual(rows[1][4], "1200.00")
+
+    def test_chunks_of_empty_catalog(self):
+        self.assertEqual(list(ndjson_chunks([])), [])
+        self.assertEqual(b"".join(csv_chunks([])).decode("utf-8").strip(), ",".join(EXPORT_FIELDS))
+
+if __name__ == '__main__':
+    unittest.main()
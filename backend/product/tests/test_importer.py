@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from bson import ObjectId
+from product.importer import ProductImporter, detect_format, iter_rows
+from product.models import ProductCategory
+from product.services.product_count_service import ProductCountService
+from product.services.product_service import ProductService
+
+class TestProductImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.category = ProductCategory(id=ObjectId(), name="Electronics", description="Devices")
+        self.mock_repo = MagicMock()
+        self.mock_repo.insert_many.return_value = {}
+        self.original_repo = ProductService.product_repository
+        ProductService.product_repository = self.mock_repo
+        patcher = patch("product.importer.category_maps", return_value=(
+            {self.category.id: self.category},
+            {"Electronics": self.category.id, str(self.category.id): self.category.id},
+        ))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.checkpoint = os.path.join(self.directory.name, "import.checkpoint")
+
+    def tearDown(self):
+        ProductService.product_repository = self.original_repo
+
+    def rows(self, count):
+        return [
+            (line, {"name": f"P{line}", "description": "Item", "category": "Electronics", "price": "9.99", "brand": "Acme", "quantity": "3"})
+            for line in range(1, count + 1)
+        ]
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("catalog.csv"), "csv")
+        self.assertEqual(detect_format("catalog.jsonl"), "ndjson")
+        with self.assertRaises(ValueError):
+            detect_format("catalog.xlsx")
+
+    def test_iter_rows_reports_bad_ndjson_lines(self):
+        rows = list(iter_rows(io.StringIO('{"name": "A"}\n\n{oops\n'), "ndjson"))
+        self.assertEqual(rows[0], (1, {"name": "A"}))
+        self.assertEqual(rows[1][0], 3)
+        self.assertTrue(rows[1][1].startswith("Invalid JSON"))
+
+    def test_run_chunks_rows_and_reports_errors(self):
+        errors = []
+        self.mock_repo.insert_many.side_effect = [{1: "A product with this name already exists."}, {}]
+        rows = self.rows(3) + [(4, {"name": "Bad", "category": "Missing"})]
+        importer = ProductImporter(chunk_size=2, workers=1, on_error=lambda line, error: errors.append((line, error))).run(iter(rows))
+        self.assertEqual((importer.rows_done, importer.inserted, importer.failed), (4, 2, 2))
+        self.assertEqual(self.mock_repo.insert_many.call_count, 2)
+        self.assertEqual(sorted(errors), [
+            (2, "A product with this name already exists."),
+            (4, "Product description cannot be empty."),
+        ])
+        inserted = self.mock_repo.insert_many.call_args_list[0][0][0]
+        self.assertEqual(inserted[0]["category"], self.category.id)
+
+    @patch.object(ProductCountService, "record_created")
+    def test_inserted_rows_are_counted(self, record_created):
+        self.mock_repo.insert_many.side_effect = [{0: "A product with this name already exists."}, {}]
+        ProductImporter(chunk_size=2, workers=1).run(iter(self.rows(4)))
+        self.assertEqual([call.args for call in record_created.call_args_list], [(1,), (2,)])
+
+    def test_non_string_fields_fail_their_row_only(self):
+        errors = []
+        rows = self.rows(2)
+        rows[0][1]["name"] = 123
+        importer = ProductImporter(workers=1, on_error=lambda line, error: errors.append((line, error))).run(iter(rows))
+        self.assertEqual((importer.inserted, importer.failed), (1, 1))
+        self.assertEqual(errors, [(1, "Product name must be a string.")])
+
+    def test_unstorable_numbers_fail_their_row_only(self):
+        errors = []
+        rows = self.rows(4)
+        rows[0][1]["price"] = "inf"
+        rows[1][1]["price"] = "1e30"
+        rows[2][1]["quantity"] = str(10 ** 30)
+        importer = ProductImporter(workers=1, on_error=lambda line, error: errors.append((line, error))).run(iter(rows))
+        self.assertEqual((importer.inserted, importer.failed), (1, 3))
+        self.assertEqual([line for line, _ in errors], [1, 2, 3])
+
+    @patch.object(ProductService, "build_product_document", side_effect=OverflowError("int too big"))
+    def test_arithmetic_errors_are_row_errors(self, _):
+        errors = []
+        importer = ProductImporter(workers=1, on_error=lambda line, error: errors.append((line, error))).run(iter(self.rows(2)))
+        self.assertEqual((importer.inserted, importer.failed), (0, 2))
+        self.assertEqual(errors, [(1, "int too big"), (2, "int too big")])
+
+    def test_resume_skips_checkpointed_rows(self):
+        with open(self.checkpoint, "w") as checkpoint:
+            json.dump({"rows_done": 2, "inserted": 2, "failed": 0}, checkpoint)
+        importer = ProductImporter(chunk_size=10, workers=2, checkpoint_path=self.checkpoint)
+        skip = importer.load_checkpoint()
+        importer.run(iter(self.rows(5)), skip=skip)
+        names = [doc["name"] for doc in self.mock_repo.insert_many.call_args[0][0]]
+        self.assertEqual(names, ["P3", "P4", "P5"])
+        self.assertEqual((importer.rows_done, importer.inserted), (5, 5))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_survives_failed_chunk(self):
+        self.mock_repo.insert_many.side_effect = [{}, RuntimeError("connection lost")]
+        importer = ProductImporter(chunk_size=2, workers=1, checkpoint_path=self.checkpoint)
+        with self.assertRaises(RuntimeError):
+            importer.run(iter(self.rows(4)))
+        with open(self.checkpoint) as checkpoint:
+            self.assertEqual(json.load(checkpoint)["rows_done"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
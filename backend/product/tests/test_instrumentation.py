@@ -0,0 +1,156 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from product import instrumentation
+from product.instrumentation import (
+    InstrumentationMiddleware, RequestTimings, command_timer, instrument, record_timings, server_timing, timed,
+)
+
+
+class TestTimed(unittest.TestCase):
+
+    def test_disabled_returns_the_function_and_class_unchanged(self):
+        def func():
+            pass
+
+        class Service:
+            @staticmethod
+            def method():
+                pass
+
+        method = Service.__dict__['method']
+        with patch('product.instrumentation.enabled', return_value=False):
+            self.assertIs(timed('service')(func), func)
+            self.assertIs(instrument('service')(Service).__dict__['method'], method)
+
+    def test_layers_record_self_time_and_calls(self):
+        # Request start, service call, repository call and their returns
+        clock = iter([0.0, 1.0, 2.0, 4.0, 5.0])
+
+        @instrument('repository', force=True)
+        class Repository:
+            @staticmethod
+            def find():
+                return 'doc'
+
+        @instrument('service', force=True)
+        class Service:
+            @classmethod
+            def get(cls):
+                return Repository.find()
+
+        with patch('product.instrumentation.time.perf_counter', lambda: next(clock)):
+            with record_timings() as timings:
+                self.assertEqual(Service.get(), 'doc')
+            # Outside a request nothing is recorded
+            self.assertEqual(Repository.find(), 'doc')
+        summary = timings.summary(total=10.0)
+        self.assertEqual(summary['layers'], {
+            'repository': {'ms': 2000.0, 'calls': 1},
+            'service': {'ms': 2000.0, 'calls': 1},
+            'controller': {'ms': 6000.0, 'calls': 1},
+        })
+
+    def test_coroutines_are_timed(self):
+        @timed('service', force=True)
+        async def fetch():
+            return 42
+
+        self.assertTrue(asyncio.iscoroutinefunction(fetch))
+
+        async def run():
+            with record_timings() as timings:
+                self.assertEqual(await fetch(), 42)
+            return timings
+
+        self.assertEqual(asyncio.run(run()).layers['service'][1], 1)
+
+    def test_exceptions_are_still_recorded(self):
+        @timed('repository', force=True)
+        def fail():
+            raise ValueError("boom")
+
+        with record_timings() as timings:
+            with self.assertRaises(ValueError):
+                fail()
+        self.assertEqual(timings.layers['repository'][1], 1)
+        self.assertEqual(timings._children, [])
+
+
+class TestMongoCommandTimer(unittest.TestCase):
+
+    def test_counts_commands_of_the_current_request_only(self):
+        event = SimpleNamespace(duration_micros=1500)
+        command_timer.started(event)
+        command_timer.succeeded(event)
+        with record_timings() as timings:
+            command_timer.started(event)
+            command_timer.succeeded(event)
+            command_timer.started(event)
+            command_timer.failed(event)
+        self.assertEqual(timings.mongo_commands, 2)
+        self.assertAlmostEqual(timings.mongo_seconds, 0.003)
+
+    def test_listener_is_registered_only_when_enabled(self):
+        with patch('product.instrumentation.enabled', return_value=False):
+            self.assertEqual(instrumentation.event_listeners(), [])
+        with patch('product.instrumentation.enabled', return_value=True):
+            self.assertEqual(instrumentation.event_listeners(), [command_timer])
+
+
+class TestServerTiming(unittest.TestCase):
+
+    def test_header_lists_layers_mongo_and_total(self):
+        timings = RequestTimings()
+        timings.layers['service'] = [0.0015, 2]
+        timings.mongo_commands, timings.mongo_seconds = 3, 0.002
+        self.assertEqual(
+            server_timing(timings.summary(total=0.005)),
+            'service;dur=1.5, controller;dur=3.5, mongo;dur=2.0;desc="3 commands", total;dur=5.0',
+        )
+
+
+class TestInstrumentationMiddleware(unittest.TestCase):
+
+    def test_removed_when_disabled(self):
+        with patch('product.instrumentation.enabled', return_value=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                InstrumentationMiddleware(lambda request: HttpResponse())
+
+    def test_sets_server_timing_and_logs(self):
+        @timed('service', force=True)
+        def view(request):
+            return HttpResponse('ok')
+
+        with patch('product.instrumentation.enabled', return_value=True):
+            middleware = InstrumentationMiddleware(view)
+        with self.assertLogs('product.instrumentation', 'INFO') as logs:
+            response = middleware(RequestFactory().get('/api/products/'))
+
+        self.assertIn('service;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual((line['method'], line['path'], line['status']), ('GET', '/api/products/', 200))
+        self.assertEqual(line['layers']['service']['calls'], 1)
+
+    def test_async_requests(self):
+        async def view(request):
+            return HttpResponse('ok')
+
+        with patch('product.instrumentation.enabled', return_value=True):
+            middleware = InstrumentationMiddleware(view)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        with self.assertLogs('product.instrumentation', 'INFO'):
+            response = asyncio.run(middleware(RequestFactory().get('/api/products/')))
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,6 @@ from product.services.product_category_service import ProductCategoryService
 from product.models import ProductCategory
 from product.seeds.seed_data import seed
 from product.seeds.clear_data import clear
-from mongoengine.queryset.queryset import QuerySet
 
 class TestProductCategoryService(unittest.TestCase):
 
@@ -19,6 +18,7 @@ class TestProductCategoryService(unittest.TestCase):
     def setUp(self):
         clear()
         seed()
+        ProductCategoryService.category_cache.clear()  # seed() writes around the service
 
     def tearDown(self):
         clear()
@@ -29,7 +29,7 @@ class TestProductCategoryService(unittest.TestCase):
 
     def test_get_all_categories(self):
         categories = ProductCategoryService.get_all_categories()
-        self.assertIsInstance(categories, QuerySet)
+        self.assertIsInstance(categories, list)
         self.assertGreaterEqual(len(categories), 1)
 
     def test_create_category_success(self):
@@ -1,5 +1,6 @@
 import unittest
 from product.services.product_service import ProductService
+from product.services.product_category_service import ProductCategoryService
 from product.models import Product
 from product.models import ProductCategory
 from mongoengine import connect, disconnect
@@ -21,6 +22,7 @@ class TestProductServiceIntegration(unittest.TestCase):
     def setUp(self):
         clear()
         seed()
+        ProductCategoryService.category_cache.clear()  # seed() writes around the service
         # Get a seeded category for linking with products
         self.category = ProductCategory.objects.first()
 
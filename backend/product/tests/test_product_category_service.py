@@ -1,18 +1,33 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from product.services.product_category_service import ProductCategoryService
 from bson import ObjectId
 
+DELETE_SETTINGS = {'CATEGORY_DELETE_INLINE_LIMIT': 10, 'CATEGORY_DELETE_BATCH_SIZE': 1000, 'CATEGORY_DELETE_PAUSE': 0.05}
+
+
+def fake_setting(name, default):
+    return DELETE_SETTINGS.get(name, default)
+
+
 class TestProductCategoryService(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.mock_repo = MagicMock()
+        cls.mock_product_repo = MagicMock()
+        cls.mock_job_repo = MagicMock()
         ProductCategoryService.product_category_repository = cls.mock_repo
     
     def setUp(self):
         self.mock_repo.reset_mock()
         self.mock_repo.create.side_effect = None
+        self.mock_product_repo.reset_mock()
+        self.mock_product_repo.delete_category_batch.side_effect = None
+        self.mock_job_repo.reset_mock()
         ProductCategoryService.product_category_repository = self.mock_repo
+        ProductCategoryService.product_repository = self.mock_product_repo
+        ProductCategoryService.deletion_job_repository = self.mock_job_repo
+        ProductCategoryService.category_cache.clear()
 
     def test_create_category_successful(self):
         category_data = {"name": "Electronics", "description": "Devices and gadgets"}
@@ -34,6 +49,35 @@ class TestProductCategoryService(unittest.TestCase):
             ProductCategoryService.create_category(invalid_data)
         self.assertEqual(str(context.exception), "Category name cannot be empty.")
     
+    def test_create_categories_skip_duplicates(self):
+        items = [{"name": "Electronics", "description": "Devices"}, {"name": "Fashion", "description": "Clothing"}]
+        self.mock_repo.create_many.return_value = (["Fashion"], ["Electronics"])
+        result = ProductCategoryService.create_categories(items, skip_duplicates=True)
+        self.assertEqual(result, (["Fashion"], ["Electronics"]))
+        self.mock_repo.create_many.assert_called_once_with(items, True)
+
+    def test_create_categories_invalid_item(self):
+        items = [{"name": "Electronics", "description": "Devices"}, {"name": "", "description": "Empty"}]
+        with self.assertRaises(ValueError) as context:
+            ProductCategoryService.create_categories(items)
+        self.assertEqual(str(context.exception), "Category name cannot be empty.")
+        self.mock_repo.create_many.assert_not_called()
+
+    def test_create_categories_rejects_non_string_fields(self):
+        for item in ({"name": 5, "description": "Devices"}, {"name": "Electronics", "description": ["Devices"]}):
+            with self.assertRaises(ValueError) as context:
+                ProductCategoryService.create_categories([item])
+            self.assertIn("must be a string", str(context.exception))
+        self.mock_repo.create_many.assert_not_called()
+
+    def test_create_categories_rejects_unknown_and_internal_fields(self):
+        for extra, message in (({"color": "red"}, "Unknown category fields: color."),
+                               ({"deleting": True}, "Unknown category fields: deleting.")):
+            with self.assertRaises(ValueError) as context:
+                ProductCategoryService.create_categories([dict({"name": "Home", "description": "Household"}, **extra)])
+            self.assertEqual(str(context.exception), message)
+        self.mock_repo.create_many.assert_not_called()
+
     def test_get_category_by_id_successful(self):
         category_id = ObjectId()
         category = {"id": category_id, "name": "Electronics"}
@@ -78,16 +122,102 @@ class TestProductCategoryService(unittest.TestCase):
     
     def test_delete_category_successful(self):
         category_id = ObjectId()
-        self.mock_repo.delete.return_value = True
+        self.mock_repo.hide.return_value = MagicMock(id=category_id)
+        self.mock_product_repo.count.return_value = 20
         result = ProductCategoryService.delete_category(category_id)
-        self.assertTrue(result)
+        self.assertIs(result, True)
+        self.mock_repo.hide.assert_called_once_with(category_id)
         self.mock_repo.delete.assert_called_once_with(category_id)
+        self.mock_job_repo.create.assert_not_called()
     
     def test_delete_category_not_found(self):
         category_id = ObjectId()
-        self.mock_repo.delete.return_value = False
+        self.mock_repo.hide.return_value = None
+        self.mock_job_repo.get_active.return_value = None
         result = ProductCategoryService.delete_category(category_id)
         self.assertFalse(result)
+        self.mock_repo.delete.assert_not_called()
+
+    def test_delete_category_already_being_deleted_returns_job(self):
+        self.mock_repo.hide.return_value = None
+        job = self.mock_job_repo.get_active.return_value
+        self.assertIs(ProductCategoryService.delete_category(ObjectId()), job)
+
+    @patch('product.services.product_category_service.get_setting', fake_setting)
+    @patch('product.services.product_category_service.jobs.submit')
+    def test_delete_large_category_starts_background_job(self, submit):
+        category = MagicMock(id=ObjectId())
+        self.mock_repo.hide.return_value = category
+        self.mock_product_repo.count.side_effect = [DELETE_SETTINGS['CATEGORY_DELETE_INLINE_LIMIT'] + 1, 5000]
+        result = ProductCategoryService.delete_category(category.id)
+        self.mock_product_repo.count.side_effect = None
+        self.assertIs(result, self.mock_job_repo.create.return_value)
+        self.mock_job_repo.create.assert_called_once_with(category, 5000)
+        submit.assert_called_once_with(ProductCategoryService.run_deletion_job, result.id)
+        self.mock_repo.delete.assert_not_called()
+
+    @patch('product.services.product_category_service.get_setting', fake_setting)
+    @patch('product.services.product_category_service.time.sleep')
+    def test_run_deletion_job_deletes_in_batches(self, sleep):
+        job_id, category_id = ObjectId(), ObjectId()
+        self.mock_job_repo.start.return_value = MagicMock(category=category_id)
+        self.mock_product_repo.delete_category_batch.side_effect = [1000, 1000, 3, 0]
+        ProductCategoryService.run_deletion_job(job_id)
+        self.assertEqual(self.mock_product_repo.delete_category_batch.call_count, 4)
+        self.mock_product_repo.delete_category_batch.assert_called_with(category_id, DELETE_SETTINGS['CATEGORY_DELETE_BATCH_SIZE'])
+        self.assertEqual([c.args for c in self.mock_job_repo.record_batch.call_args_list],
+                         [(job_id, 1000), (job_id, 1000), (job_id, 3)])
+        self.assertEqual(sleep.call_count, 3)
+        self.mock_repo.delete.assert_called_once_with(category_id)
+        self.mock_job_repo.finish.assert_called_once_with(job_id, 'done')
+
+    @patch('product.services.product_category_service.time.sleep')
+    def test_run_deletion_job_records_failure(self, sleep):
+        job_id = ObjectId()
+        self.mock_product_repo.delete_category_batch.side_effect = RuntimeError("connection lost")
+        ProductCategoryService.run_deletion_job(job_id)
+        self.mock_repo.delete.assert_not_called()
+        self.mock_job_repo.finish.assert_called_once_with(job_id, 'failed', "connection lost")
+
+    def test_get_category_by_id_served_from_cache(self):
+        category_id = ObjectId()
+        self.mock_repo.get_by_name_or_id.return_value = {"id": category_id, "name": "Electronics"}
+        first = ProductCategoryService.get_category_by_id(category_id)
+        second = ProductCategoryService.get_category_by_id(category_id)
+        self.assertEqual(first, second)
+        self.mock_repo.get_by_name_or_id.assert_called_once_with(category_id)
+        stats = ProductCategoryService.cache_stats()
+        self.assertGreaterEqual(stats["hits"], 1)
+        self.assertGreaterEqual(stats["misses"], 1)
+
+    def test_get_category_by_id_does_not_cache_missing(self):
+        self.mock_repo.get_by_name_or_id.return_value = None
+        ProductCategoryService.get_category_by_id("Unknown")
+        ProductCategoryService.get_category_by_id("Unknown")
+        self.assertEqual(self.mock_repo.get_by_name_or_id.call_count, 2)
+
+    def test_get_all_categories_served_from_cache(self):
+        self.mock_repo.get_all.return_value = [{"name": "Electronics"}]
+        ProductCategoryService.get_all_categories()
+        result = ProductCategoryService.get_all_categories()
+        self.assertEqual(result, [{"name": "Electronics"}])
+        self.mock_repo.get_all.assert_called_once()
+
+    def test_get_categories_by_ids_fetches_only_misses(self):
+        cached_id, missing_id = ObjectId(), ObjectId()
+        self.mock_repo.get_by_ids.return_value = {cached_id: "cached"}
+        ProductCategoryService.get_categories_by_ids([cached_id])
+        self.mock_repo.get_by_ids.return_value = {missing_id: "fetched"}
+        result = ProductCategoryService.get_categories_by_ids([cached_id, missing_id])
+        self.assertEqual(result, {cached_id: "cached", missing_id: "fetched"})
+        self.mock_repo.get_by_ids.assert_called_with([missing_id])
+
+    def test_writes_invalidate_cache(self):
+        self.mock_repo.get_all.return_value = [{"name": "Electronics"}]
+        ProductCategoryService.get_all_categories()
+        ProductCategoryService.update_category(ObjectId(), {"name": "Gadgets", "description": "Devices"})
+        ProductCategoryService.get_all_categories()
+        self.assertEqual(self.mock_repo.get_all.call_count, 2)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from product.services.product_count_service import ProductCountService
+
+class TestProductCountService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mock_repo = MagicMock()
+        ProductCountService.product_repository = cls.mock_repo
+
+    def setUp(self):
+        self.mock_repo.reset_mock()
+        ProductCountService.product_repository = self.mock_repo
+        ProductCountService.invalidate()
+
+    def test_exact_mode_counts_every_call(self):
+        self.mock_repo.count.return_value = 42
+        self.assertEqual(ProductCountService.get_count("exact"), (42, "exact"))
+        self.assertEqual(ProductCountService.get_count("exact"), (42, "exact"))
+        self.assertEqual(self.mock_repo.count.call_count, 2)
+
+    def test_estimated_mode_uses_collection_metadata(self):
+        self.mock_repo.estimated_count.return_value = 40
+        self.assertEqual(ProductCountService.get_count("estimated"), (40, "estimated"))
+        self.mock_repo.count.assert_not_called()
+
+    def test_none_mode_skips_counting(self):
+        self.assertEqual(ProductCountService.get_count("none"), (None, "none"))
+        self.mock_repo.count.assert_not_called()
+        self.mock_repo.estimated_count.assert_not_called()
+
+    def test_cached_mode_reuses_count_until_write(self):
+        self.mock_repo.count.return_value = 10
+        self.assertEqual(ProductCountService.get_count("cached"), (10, "exact"))
+        self.assertEqual(ProductCountService.get_count("cached"), (10, "estimated"))
+        self.mock_repo.count.assert_called_once()
+        ProductCountService.record_created()
+        self.mock_repo.count.return_value = 11
+        self.assertEqual(ProductCountService.get_count("cached"), (11, "exact"))
+
+    @patch.object(ProductCountService, "default_mode", return_value="incremental")
+    def test_incremental_mode_applies_deltas(self, _):
+        self.mock_repo.count.return_value = 10
+        self.assertEqual(ProductCountService.get_count(), (10, "exact"))
+        ProductCountService.record_created(3)
+        ProductCountService.record_deleted()
+        # Served from this process's counter, which cannot see other processes' writes
+        self.assertEqual(ProductCountService.get_count(), (12, "estimated"))
+        self.mock_repo.count.assert_called_once()
+
+    @patch.object(ProductCountService, "default_mode", return_value="cached")
+    def test_modes_keep_separate_counts(self, _):
+        self.mock_repo.count.return_value = 10
+        ProductCountService.get_count("incremental")
+        ProductCountService.get_count("cached")
+        ProductCountService.record_created(2)
+        # The incremental counter follows writes even when it is not the default mode
+        self.assertEqual(ProductCountService.get_count("incremental"), (12, "estimated"))
+        self.mock_repo.count.return_value = 13
+        self.assertEqual(ProductCountService.get_count("cached"), (13, "exact"))
+        self.assertEqual(self.mock_repo.count.call_count, 3)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            ProductCountService.get_count("sometimes")
+
+    def test_async_count_shares_the_cache(self):
+        async_repo = MagicMock(count=AsyncMock(return_value=7))
+        with patch.object(ProductCountService, "async_product_repository", async_repo):
+            self.assertEqual(asyncio.run(ProductCountService.aget_count("cached")), (7, "exact"))
+            self.assertEqual(ProductCountService.get_count("cached"), (7, "estimated"))
+        self.mock_repo.count.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from bson import ObjectId
+from product.models import ProductCategory
+from product.services.product_facet_service import ProductFacetService, STOCK_FIELDS
+from product.services.product_category_service import ProductCategoryService
+
+class TestProductFacetService(unittest.TestCase):
+
+    def setUp(self):
+        self.category = ProductCategory(id=ObjectId(), name="Electronics", description="Devices")
+        self.mock_repo = MagicMock()
+        self.mock_repo.facets.return_value = {
+            "total": [{"count": 3}],
+            "categories": [{"_id": self.category.id, "count": 3}],
+            "brands": [{"_id": "Dell", "count": 2}, {"_id": "HP", "count": 1}],
+            "price": [{"_id": 10, "count": 2}, {"_id": "other", "count": 1}],
+        }
+        self.original_repo = ProductFacetService.product_repository
+        ProductFacetService.product_repository = self.mock_repo
+        ProductFacetService.invalidate_cache()
+        patcher = patch.object(ProductCategoryService, "get_categories_by_ids", return_value={self.category.id: self.category})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        ProductFacetService.product_repository = self.original_repo
+
+    @patch("product.services.product_facet_service.get_setting", side_effect=lambda name, default: {
+        "PRODUCT_FACET_PRICE_BOUNDARIES": (0, 10, 100),
+    }.get(name, default))
+    def test_shapes_facets_and_fills_empty_buckets(self, _):
+        facets = ProductFacetService.get_facets({"brand": "Dell"})
+        self.mock_repo.facets.assert_called_once_with({"brand": "Dell"}, (0, 10, 100), 50)
+        self.assertEqual(facets["count"], 3)
+        self.assertEqual(facets["categories"], [{"id": str(self.category.id), "name": "Electronics", "count": 3}])
+        self.assertEqual(facets["brands"], [{"brand": "Dell", "count": 2}, {"brand": "HP", "count": 1}])
+        self.assertEqual(facets["price"], [
+            {"min": "0.00", "max": "10.00", "count": 0},
+            {"min": "10.00", "max": "100.00", "count": 2},
+            {"min": "100.00", "max": None, "count": 1},
+        ])
+
+    def test_results_are_cached_per_filter_signature(self):
+        ProductFacetService.get_facets({"category": self.category.id, "price": {"$lte": 50.0, "$gte": 5.0}})
+        ProductFacetService.get_facets({"price": {"$gte": 5.0, "$lte": 50.0}, "category": self.category.id})
+        ProductFacetService.get_facets({})
+        self.assertEqual(self.mock_repo.facets.call_count, 2)
+
+    def test_stock_writes_only_drop_results_filtered_on_stock(self):
+        ProductFacetService.get_facets({})
+        ProductFacetService.get_facets({"quantity": {"$gt": 0}})
+        ProductFacetService.invalidate_cache(STOCK_FIELDS)
+        ProductFacetService.get_facets({})
+        ProductFacetService.get_facets({"quantity": {"$gt": 0}})
+        self.assertEqual(self.mock_repo.facets.call_count, 3)
+
+    def test_result_computed_across_a_write_is_not_cached(self):
+        def facets_then_write(*args):
+            ProductFacetService.invalidate_cache()
+            return self.mock_repo.facets.return_value
+        self.mock_repo.facets.side_effect = facets_then_write
+        ProductFacetService.get_facets({})
+        ProductFacetService.get_facets({})
+        self.assertEqual(self.mock_repo.facets.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
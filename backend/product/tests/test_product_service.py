@@ -1,6 +1,9 @@
 import unittest
-from unittest.mock import MagicMock
-from product.services.product_service import ProductService
+from unittest.mock import MagicMock, patch
+from product.services.product_service import ProductService, ProductNotFoundError, InsufficientStockError
+from product.services.product_category_service import ProductCategoryService
+from product.models import ProductCategory
+from mongoengine import NotUniqueError
 from bson import ObjectId
 
 class TestProductService(unittest.TestCase):
@@ -11,29 +14,73 @@ class TestProductService(unittest.TestCase):
     
     def setUp(self):
         self.mock_repo.reset_mock()
+        self.mock_repo.update.side_effect = None
         ProductService.product_repository = self.mock_repo
 
-    def test_get_all_products(self):
+    @patch.object(ProductCategoryService, "get_categories_by_ids")
+    def test_get_all_products(self, mock_get_categories):
         valid_id = ObjectId()
-        self.mock_repo.get_all.return_value = [{"id": valid_id, "name": "Laptop"}]
-        products = ProductService.get_all_products()
+        laptop = MagicMock(id=valid_id)
+        laptop.name = "Laptop"
+        self.mock_repo.get_all_paginated.return_value = ([laptop], False)
+        products, has_next = ProductService.get_all_products()
         self.assertEqual(len(products), 1)
-        self.assertEqual(products[0]["name"], "Laptop")
-        self.mock_repo.get_all.assert_called_once()
+        self.assertEqual(products[0].name, "Laptop")
+        self.assertFalse(has_next)
+        self.mock_repo.get_all_paginated.assert_called_once_with(1, 10, None, 'asc', raw=False, fields=None, query=None, hint=('_id',))
+        # Categories are rendered from their references, never looked up per page
+        mock_get_categories.assert_not_called()
+
+    def test_get_products_by_cursor_first_page(self):
+        first, last = MagicMock(id=ObjectId()), MagicMock(id=ObjectId())
+        self.mock_repo.get_page_after.return_value = ([first, last], True)
+        products, next_cursor, prev_cursor = ProductService.get_products_by_cursor(page_size=2)
+        self.assertEqual(products, [first, last])
+        self.assertIsNotNone(next_cursor)
+        self.assertIsNone(prev_cursor)
+        self.mock_repo.get_page_after.assert_called_once_with(2, '_id', 'asc', 'next', None, None, raw=False, fields=None, query=None, hint=('_id',))
+
+    def test_get_products_by_cursor_follows_next_cursor(self):
+        first, last = MagicMock(id=ObjectId()), MagicMock(id=ObjectId())
+        self.mock_repo.get_page_after.return_value = ([first, last], True)
+        _, next_cursor, _ = ProductService.get_products_by_cursor(page_size=2)
+        self.mock_repo.get_page_after.reset_mock()
+        self.mock_repo.get_page_after.return_value = ([MagicMock(id=ObjectId())], False)
+        _, following_cursor, prev_cursor = ProductService.get_products_by_cursor(cursor=next_cursor, page_size=2)
+        self.assertIsNone(following_cursor)
+        self.assertIsNotNone(prev_cursor)
+        self.mock_repo.get_page_after.assert_called_once_with(2, '_id', 'asc', 'next', last.id, last.id, raw=False, fields=None, query=None, hint=('_id',))
+
+    @patch("product.services.product_service.get_setting", return_value=2)
+    def test_filtered_listing_over_sort_cap_falls_back_to_index_order(self, _):
+        category = ObjectId()
+        self.mock_repo.get_all_paginated.return_value = ([], False)
+        self.mock_repo.count.return_value = 3
+        ProductService.get_all_products(sort_by="name", filters={"category": category})
+        self.mock_repo.count.assert_called_once_with({"category": category}, ('category', '_id'), limit=3)
+        self.mock_repo.get_all_paginated.assert_called_once_with(
+            1, 10, "name", 'asc', raw=False, fields=None, query={"category": category}, hint=('name',)
+        )
+
+    def test_get_products_by_cursor_invalid_cursor(self):
+        with self.assertRaises(ValueError) as context:
+            ProductService.get_products_by_cursor(cursor="not-a-cursor")
+        self.assertEqual(str(context.exception), "Invalid cursor.")
+        self.mock_repo.get_page_after.assert_not_called()
 
     def test_get_product_by_id_valid(self):
         valid_id = ObjectId()
         self.mock_repo.get_by_id.return_value = {"id": valid_id, "name": "Laptop"}
         product = ProductService.get_product_by_id(valid_id)
         self.assertEqual(product["name"], "Laptop")
-        self.mock_repo.get_by_id.assert_called_once_with(valid_id)
+        self.mock_repo.get_by_id.assert_called_once_with(valid_id, raw=False, fields=None)
 
     def test_get_product_by_id_invalid(self):
         invalid_id = ObjectId()
         self.mock_repo.get_by_id.return_value = None
         product = ProductService.get_product_by_id(invalid_id)
         self.assertIs(product, None)
-        self.mock_repo.get_by_id.assert_called_once_with(invalid_id)
+        self.mock_repo.get_by_id.assert_called_once_with(invalid_id, raw=False, fields=None)
 
     def test_get_product_by_category(self):
         valid_id = ObjectId()
@@ -41,7 +88,7 @@ class TestProductService(unittest.TestCase):
         products = ProductService.get_product_by_category("electronics")
         self.assertEqual(len(products), 1)
         self.assertEqual(products[0]["name"], "Phone")
-        self.mock_repo.get_by_category.assert_called_once_with("electronics")
+        self.mock_repo.get_by_category.assert_called_once_with("electronics", raw=False, fields=None)
 
     def test_find_products_by_name(self):
         self.mock_repo.find_by_name.return_value = {"name": "Tablet"}
@@ -58,6 +105,62 @@ class TestProductService(unittest.TestCase):
         self.assertEqual(product["name"], "Tablet")
         self.mock_repo.create.assert_called_once()
 
+    @patch.object(ProductCategoryService, "get_categories_by_ids")
+    def test_bulk_create_products_reports_per_item_results(self, mock_get_categories):
+        category = ProductCategory(id=ObjectId(), name="Electronics", description="Devices")
+        mock_get_categories.return_value = {category.id: category}
+        self.mock_repo.insert_many.return_value = {1: "A product with this name already exists."}
+        item = {"description": "Portable", "category": str(category.id), "price": "9.99", "brand": "JBL", "quantity": 3}
+        items = [
+            dict(item, name="Speaker"),
+            dict(item, name="Laptop"),
+            dict(item, name="Phone", price=-5),
+            dict(item, name="Tablet"),
+        ]
+        results = ProductService.bulk_create_products(items)
+        self.assertIn("id", results[0])
+        self.assertEqual(results[1], {"index": 1, "error": "A product with this name already exists."})
+        self.assertEqual(results[2], {"index": 2, "error": "Price must be a valid number (float)."})
+        self.assertIn("id", results[3])
+        mock_get_categories.assert_called_once_with({category.id})
+        inserted_documents = self.mock_repo.insert_many.call_args[0][0]
+        self.assertEqual([doc["name"] for doc in inserted_documents], ["Speaker", "Laptop", "Tablet"])
+
+    @patch.object(ProductCategoryService, "get_categories_by_ids", return_value={})
+    def test_bulk_create_products_unknown_category(self, _):
+        category_id = str(ObjectId())
+        results = ProductService.bulk_create_products([
+            {"name": "Speaker", "description": "Portable", "category": category_id, "price": "9.99", "brand": "JBL", "quantity": 3}
+        ])
+        self.assertEqual(results, [{"index": 0, "error": f"Category '{category_id}' does not exist."}])
+        self.mock_repo.insert_many.assert_not_called()
+
+    @patch.object(ProductCategoryService, "get_categories_by_ids")
+    def test_bulk_create_products_rejects_non_string_fields(self, mock_get_categories):
+        category = ProductCategory(id=ObjectId(), name="Electronics", description="Devices")
+        mock_get_categories.return_value = {category.id: category}
+        self.mock_repo.insert_many.return_value = {}
+        item = {"name": "Speaker", "description": "Portable", "category": str(category.id), "price": "9.99", "brand": "JBL", "quantity": 3}
+        results = ProductService.bulk_create_products([dict(item, name=123), dict(item, brand=["JBL"]), item])
+        self.assertEqual(results[0], {"index": 0, "error": "Product name must be a string."})
+        self.assertEqual(results[1], {"index": 1, "error": "Product brand must be a string."})
+        self.assertIn("id", results[2])
+
+    @patch.object(ProductCategoryService, "get_categories_by_ids")
+    def test_bulk_create_products_reports_unstorable_numbers_per_item(self, mock_get_categories):
+        category = ProductCategory(id=ObjectId(), name="Electronics", description="Devices")
+        mock_get_categories.return_value = {category.id: category}
+        self.mock_repo.insert_many.return_value = {}
+        item = {"name": "Speaker", "description": "Portable", "category": str(category.id), "price": "9.99", "brand": "JBL", "quantity": 3}
+        results = ProductService.bulk_create_products([
+            dict(item, price="nan"), dict(item, price="1e30"), dict(item, quantity=10 ** 30), dict(item, quantity=3.7), item,
+        ])
+        self.assertEqual([result.get("error") for result in results], [
+            "Price must be a valid number (float).", "Price must be a valid number (float).",
+            "Quantity must be a valid integer.", "Quantity must be a valid integer.", None,
+        ])
+        self.assertEqual(len(self.mock_repo.insert_many.call_args[0][0]), 1)
+
     def test_create_product_invalid(self):
         invalid_product_data = {
             "name": "",  # Invalid: empty name
@@ -86,40 +189,153 @@ class TestProductService(unittest.TestCase):
 
     def test_update_product_successful(self):
         valid_id = ObjectId()
-        mock_product = MagicMock()
-        mock_product.id = valid_id
-        mock_product.name = "Laptop"
-        mock_product.brand = "HP"
-        self.mock_repo.get_by_id.return_value = mock_product
-        self.mock_repo.find_by_name.return_value = None
-        self.mock_repo.update.return_value = {"id": valid_id, "name": "Gaming Laptop", "brand": "HP", "description": "Laptop with Graphic cards", "category": "Electronics", "price": "5000", "quantity": 30}
+        updated = MagicMock(id=valid_id, category=None)
+        updated.name = "Gaming Laptop"
+        self.mock_repo.update.return_value = updated
         updated_product = ProductService.update_product(valid_id, {"name": "Gaming Laptop", "brand": "HP",  "description": "Laptop with Graphic cards", "category": "Electronics", "price": "5000", "quantity": 30})
-        self.assertEqual(updated_product["name"], "Gaming Laptop")
+        self.assertEqual(updated_product.name, "Gaming Laptop")
         self.mock_repo.update.assert_called_once()
+        # One find-and-modify: no fetch and no name pre-check
+        self.mock_repo.get_by_id.assert_not_called()
+        self.mock_repo.find_by_name.assert_not_called()
 
-    def test_update_product_not_found(self):
-        self.mock_repo.get_by_id.return_value = None 
+    def test_update_product_partial(self):
+        valid_id = ObjectId()
+        self.mock_repo.update.return_value = MagicMock(id=valid_id, quantity=3, category=None)
+        ProductService.update_product(valid_id, {"quantity": 3, "created_at": "ignored"})
+        self.mock_repo.update.assert_called_once_with(valid_id, {"quantity": 3})
+
+    def test_update_product_partial_invalid_field(self):
         with self.assertRaises(ValueError) as context:
+            ProductService.update_product(ObjectId(), {"price": "-1"})
+        self.assertEqual(str(context.exception), "Price must be a valid number (float).")
+        self.mock_repo.update.assert_not_called()
+
+    def test_update_product_not_found(self):
+        self.mock_repo.update.return_value = None
+        with self.assertRaises(ProductNotFoundError) as context:
             ProductService.update_product("non_existing_id", {"name": "Updated Laptop"})
         self.assertEqual(str(context.exception), "Product not found.")
-        self.mock_repo.get_by_id.assert_called_once_with("non_existing_id")
+        self.mock_repo.update.assert_called_once_with("non_existing_id", {"name": "Updated Laptop"})
 
     def test_update_product_duplicate_name(self):
         valid_id = ObjectId()
-        duplicate_id = ObjectId()
-        mock_product = MagicMock()
-        mock_product.id = valid_id
-        mock_product.name = "Laptop"
-        mock_product.brand = "HP"
-        mock_duplicate_product = MagicMock()
-        mock_duplicate_product.id = duplicate_id
-        mock_duplicate_product.name = "Laptop"
-        self.mock_repo.get_by_id.return_value = mock_product  
-        self.mock_repo.find_by_name.return_value = mock_duplicate_product  
+        # The unique index rejects the write instead of a find_by_name pre-check
+        self.mock_repo.update.side_effect = NotUniqueError("E11000 duplicate key error")
         with self.assertRaises(ValueError) as context:
             ProductService.update_product(valid_id, {"name": "Laptop", "brand": "HP", "description": "Laptop with Graphic cards", "category": "Electronics", "price": "5000", "quantity": 30})
         self.assertEqual(str(context.exception), "A product with this name already exists.")
-        self.mock_repo.update.assert_not_called() 
+        self.mock_repo.find_by_name.assert_not_called()
+
+    def test_adjust_stock_returns_new_quantity(self):
+        valid_id = ObjectId()
+        self.mock_repo.adjust_stock.return_value = 7
+        self.assertEqual(ProductService.adjust_stock(valid_id, -3), 7)
+        self.mock_repo.adjust_stock.assert_called_once_with(valid_id, -3)
+        self.mock_repo.get_by_id.assert_not_called()
+
+    def test_adjust_stock_insufficient(self):
+        self.mock_repo.adjust_stock.return_value = None
+        self.mock_repo.get_by_id.return_value = {"_id": ObjectId(), "quantity": 2}
+        with self.assertRaises(InsufficientStockError) as context:
+            ProductService.adjust_stock(ObjectId(), -3)
+        self.assertEqual(context.exception.quantity, 2)
+
+    def test_adjust_stock_not_found(self):
+        self.mock_repo.adjust_stock.return_value = None
+        self.mock_repo.get_by_id.return_value = None
+        with self.assertRaises(ProductNotFoundError):
+            ProductService.adjust_stock(ObjectId(), 5)
+
+    def test_adjust_stock_invalid_delta(self):
+        for delta in (0, None, "3", 1.5, True, 2 ** 63, -2 ** 63):
+            with self.assertRaises(ValueError):
+                ProductService.adjust_stock(ObjectId(), delta)
+        self.mock_repo.adjust_stock.assert_not_called()
+
+    def test_bulk_adjust_stock_builds_guarded_updates(self):
+        valid_id = ObjectId()
+        self.mock_repo.bulk_update.return_value = (2, 2, {})
+        matched, modified, failures = ProductService.bulk_adjust_stock([
+            {"id": str(valid_id), "delta": -2},
+            {"name": "Laptop", "set": 4},
+        ])
+        self.assertEqual((matched, modified, failures), (2, 2, []))
+        (decrement, replace), = self.mock_repo.bulk_update.call_args[0]
+        self.assertEqual(decrement[0], {"_id": valid_id, "quantity": {"$gte": 2}})
+        self.assertEqual(decrement[1]["$inc"], {"quantity": -2})
+        self.assertEqual(replace[0], {"name": "Laptop"})
+        self.assertEqual(replace[1]["$set"]["quantity"], 4)
+        self.mock_repo.get_stock_levels.assert_not_called()
+
+    def test_bulk_adjust_stock_reports_failures(self):
+        existing_id, missing_id = ObjectId(), ObjectId()
+        self.mock_repo.bulk_update.return_value = (0, 0, {})
+        self.mock_repo.get_stock_levels.return_value = [{"_id": existing_id, "name": "Laptop", "quantity": 1}]
+        matched, _, failures = ProductService.bulk_adjust_stock([
+            {"id": str(existing_id), "delta": -5},
+            {"name": "Laptop", "delta": 1, "set": 2},
+            {"id": str(missing_id), "delta": 3},
+        ], chunk_size=1)
+        self.assertEqual(matched, 0)
+        self.assertEqual(failures, [
+            {"index": 0, "error": "Insufficient stock.", "quantity": 1},
+            {"index": 1, "error": "Each operation needs exactly one of 'delta' or 'set'."},
+            {"index": 2, "error": "Product not found."},
+        ])
+        self.assertEqual(self.mock_repo.bulk_update.call_count, 2)
+
+    def test_bulk_adjust_stock_repeated_products_are_written_in_separate_chunks(self):
+        product_id = ObjectId()
+        self.mock_repo.bulk_update.side_effect = [(2, 2, {}), (0, 0, {})]
+        self.mock_repo.get_stock_levels.return_value = [{"_id": product_id, "name": "Laptop", "quantity": 1}]
+        matched, modified, failures = ProductService.bulk_adjust_stock([
+            {"id": str(product_id), "delta": -2},
+            {"name": "Speaker", "delta": -1},
+            {"id": str(product_id), "delta": -2},
+        ])
+        self.mock_repo.bulk_update.side_effect = None
+        self.assertEqual((matched, modified), (2, 2))
+        self.assertEqual(failures, [{"index": 2, "error": "Insufficient stock.", "quantity": 1}])
+        first, second = (call[0][0] for call in self.mock_repo.bulk_update.call_args_list)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        # Each chunk stamps its own updated_at so the read-back can tell them apart
+        self.assertLess(first[0][1]["$set"]["updated_at"], second[0][1]["$set"]["updated_at"])
+
+    def test_bulk_adjust_stock_does_not_fail_products_the_chunk_changed(self):
+        changed_id, missing_id = ObjectId(), ObjectId()
+
+        def bulk_update(chunk):
+            stamp = chunk[0][1]["$set"]["updated_at"]
+            self.mock_repo.get_stock_levels.return_value = [
+                {"_id": changed_id, "name": "Laptop", "quantity": 1, "updated_at": stamp}
+            ]
+            return 1, 1, {}
+
+        self.mock_repo.bulk_update.side_effect = bulk_update
+        _, _, failures = ProductService.bulk_adjust_stock([
+            {"id": str(changed_id), "delta": -2},
+            {"id": str(missing_id), "delta": -1},
+        ])
+        self.mock_repo.bulk_update.side_effect = None
+        self.assertEqual(failures, [{"index": 1, "error": "Product not found."}])
+
+    def test_bulk_adjust_stock_rejects_values_beyond_int64(self):
+        self.mock_repo.bulk_update.return_value = (1, 1, {})
+        _, _, failures = ProductService.bulk_adjust_stock([
+            {"name": "Laptop", "delta": 2 ** 63},
+            {"name": "Laptop", "set": 2 ** 63},
+            {"name": "Laptop", "set": 2 ** 63 - 1},
+        ])
+        self.assertEqual([failure["index"] for failure in failures], [0, 1])
+        self.assertEqual(len(self.mock_repo.bulk_update.call_args[0][0]), 1)
+
+    @patch("product.services.product_service.get_setting", return_value=250)
+    def test_stream_products_uses_configured_batch_size(self, _):
+        self.mock_repo.stream_all.return_value = iter([])
+        ProductService.stream_products()
+        self.mock_repo.stream_all.assert_called_once_with(250)
 
     def test_delete_product_successful(self):
         valid_id = ObjectId()
@@ -142,6 +358,16 @@ class TestProductService(unittest.TestCase):
             ProductService.validate_product_data({"name": "Phone", "price": -100, "description": "128MP camera and 256GB Storage", "quantity": 5, "brand": "Samsung", "category": "electronics"})
         self.assertEqual(str(context.exception), "Price must be a valid number (float).")
     
+    def test_validate_product_data_rejects_unstorable_numbers(self):
+        product = {"name": "Phone", "description": "Camera", "price": 500, "quantity": 5, "brand": "Samsung", "category": "electronics"}
+        for price in ("nan", "inf", "-inf", "1e30", 1e300, True, None, "0.001"):
+            with self.assertRaises(ValueError, msg=price):
+                ProductService.validate_product_data(dict(product, price=price))
+        for quantity in (3.7, True, 10 ** 30, float("inf"), float("nan"), "3.5"):
+            with self.assertRaises(ValueError, msg=quantity):
+                ProductService.validate_product_data(dict(product, quantity=quantity))
+        ProductService.validate_product_data(dict(product, price="1e20", quantity=3.0))
+
     def test_validate_product_data_invalid_quantity(self):
         with self.assertRaises(ValueError) as context:
             ProductService.validate_product_data({"name": "Phone", "price": 500, "description": "128MP camera and 256GB Storage", "quantity": -2, "brand": "Samsung", "category": "electronics"})
@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime
+from bson import ObjectId
+from product.query_planner import declared_indexes, parse_filters, plan_query
+
+INDEXES = (('category', '_id'), ('price', '_id'), ('name',), ('_id',), ('category', 'price', '_id'))
+
+class TestParseFilters(unittest.TestCase):
+
+    def test_builds_raw_filter(self):
+        category = ObjectId()
+        query = parse_filters({
+            "category": str(category), "brand": "Dell", "min_price": "10", "max_price": "99.50",
+            "in_stock": "true", "created_after": "2025-01-01", "updated_before": "2025-02-01T12:00:00+05:30",
+        })
+        self.assertEqual(query, {
+            "category": category, "brand": "Dell", "price": {"$gte": 10.0, "$lte": 99.5},
+            "quantity": {"$gt": 0}, "created_at": {"$gte": datetime(2025, 1, 1)},
+            "updated_at": {"$lt": datetime(2025, 2, 1, 6, 30)},
+        })
+
+    def test_no_parameters_means_no_filter(self):
+        self.assertEqual(parse_filters({"page": "2", "sort_by": "price"}), {})
+
+    def test_rejects_invalid_values(self):
+        for params, message in (
+            ({"category": "nope"}, "Invalid category ID."),
+            ({"min_price": "cheap"}, "min_price must be a number."),
+            ({"min_price": "NaN"}, "min_price must be a number."),
+            ({"min_price": "20", "max_price": "10"}, "min_price cannot be greater than max_price."),
+            ({"in_stock": "yes"}, "in_stock must be 'true' or 'false'."),
+            ({"created_before": "last week"}, "created_before must be an ISO 8601 date or datetime."),
+        ):
+            with self.subTest(params=params), self.assertRaisesRegex(ValueError, message):
+                parse_filters(params)
+
+class TestPlanQuery(unittest.TestCase):
+
+    def test_declared_indexes_exclude_text_index(self):
+        self.assertIn(('category', 'price', '_id'), declared_indexes())
+        self.assertFalse(any('description' in index for index in declared_indexes()))
+
+    def test_equality_prefix_then_sort_key(self):
+        plan = plan_query({"category": ObjectId(), "price": {"$gte": 5.0}}, "price", INDEXES)
+        self.assertEqual(plan, (('category', 'price', '_id'), False, None))
+
+    def test_range_only_filter_walks_the_sort_index(self):
+        plan = plan_query({"quantity": {"$gt": 0}}, "name", INDEXES)
+        self.assertEqual(plan, (('name',), False, None))
+
+    def test_equality_without_sort_index_sorts_matches_in_memory(self):
+        plan = plan_query({"category": ObjectId()}, "name", INDEXES)
+        self.assertEqual(plan, (('category', '_id'), True, (('name',), False, None)))
+
+    def test_refuses_whole_collection_sort(self):
+        with self.assertRaisesRegex(ValueError, "Cannot sort by 'created_at'.*Sortable: id, name, price."):
+            plan_query({"brand": "Dell"}, "created_at", INDEXES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import io
+import unittest
+from bson import ObjectId
+from django.core.management import call_command
+from mongoengine import connect, disconnect
+from mongoengine.connection import get_db
+from pymongo import monitoring
+from product.models import Product, ProductCategory
+from product.repositories.product_repository import ProductRepository
+from product.repositories.product_category_repository import ProductCategoryRepository
+from product.query_planner import plan_query
+from product.seeds.seed_data import seed
+from product.seeds.clear_data import clear
+
+EXPLAINABLE_COMMANDS = {'find', 'count', 'distinct', 'aggregate', 'findAndModify', 'update', 'delete'}
+# Driver/session fields that the explain command does not accept
+SESSION_FIELDS = {'lsid', '$db', '$clusterTime', '$readPreference', 'txnNumber', 'readConcern', 'writeConcern'}
+
+
+class CommandRecorder(monitoring.CommandListener):
+    """Records the commands the repositories send so each one can be explained."""
+
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        if event.command_name in EXPLAINABLE_COMMANDS:
+            self.commands.append({k: v for k, v in event.command.items() if k not in SESSION_FIELDS})
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def plan_stages(plan):
+    """Yield every stage name in an explain plan tree."""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+
+class TestRepositoryQueryPlans(unittest.TestCase):
+    """Runs explain() on every query the repositories issue and fails on collection scans."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.recorder = CommandRecorder()
+        connect(
+            db="product_test_db",
+            host="localhost",
+            port=27017,
+            event_listeners=[cls.recorder]
+        )
+
+    def setUp(self):
+        clear()
+        seed()
+        Product.ensure_indexes()
+        ProductCategory.ensure_indexes()
+        self.category = ProductCategory.objects.first()
+        self.product = Product.objects.first()
+        self.recorder.commands.clear()
+
+    def tearDown(self):
+        clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def assertNoCollectionScan(self, operation):
+        self.recorder.commands.clear()
+        operation()
+        self.assertTrue(self.recorder.commands, "operation issued no explainable command")
+        for command in self.recorder.commands:
+            explain = get_db().command({'explain': command, 'verbosity': 'queryPlanner'})
+            stages = list(plan_stages(explain['queryPlanner']['winningPlan']))
+            self.assertNotIn('COLLSCAN', stages, f"{command} falls back to a collection scan: {stages}")
+
+    def assertNoBlockingSort(self, operation):
+        self.recorder.commands.clear()
+        operation()
+        for command in self.recorder.commands:
+            explain = get_db().command({'explain': command, 'verbosity': 'queryPlanner'})
+            stages = list(plan_stages(explain['queryPlanner']['winningPlan']))
+            self.assertNotIn('SORT', stages, f"{command} sorts in memory: {stages}")
+
+    def test_product_list_pages(self):
+        self.assertNoCollectionScan(lambda: ProductRepository.get_all_paginated(2, 5))
+        self.assertNoCollectionScan(lambda: ProductRepository.get_all_paginated(1, 5, raw=True))
+        self.assertNoCollectionScan(lambda: list(ProductRepository.stream_all(100)))
+        for sort_by in ('price', 'created_at', 'updated_at', 'name'):
+            self.assertNoCollectionScan(lambda: ProductRepository.get_all_paginated(1, 5, sort_by, 'desc'))
+
+    def test_product_keyset_pages(self):
+        self.assertNoCollectionScan(lambda: ProductRepository.get_page_after(5))
+        for field in ('price', 'created_at', 'updated_at'):
+            value = Product._fields[field].to_mongo(getattr(self.product, field))
+            self.assertNoCollectionScan(
+                lambda: ProductRepository.get_page_after(5, field, 'asc', 'next', value, self.product.id)
+            )
+            self.assertNoCollectionScan(
+                lambda: ProductRepository.get_page_after(5, field, 'desc', 'prev', value, self.product.id)
+            )
+
+    def test_filtered_listings(self):
+        filters = (
+            {'category': self.category.id},
+            {'category': self.category.id, 'price': {'$gte': 10.0, '$lte': 2000.0}},
+            {'brand': 'Dell', 'quantity': {'$gt': 0}},
+            {'created_at': {'$gte': self.product.created_at}},
+        )
+        for query in filters:
+            for sort_field, sort_by in (('_id', None), ('price', 'price'), ('created_at', 'created_at'), ('name', 'name')):
+                plan = plan_query(query, sort_field)
+                self.assertNoCollectionScan(
+                    lambda: ProductRepository.get_all_paginated(1, 5, sort_by, 'asc', query=query, hint=plan.index)
+                )
+                if not plan.blocking_sort:
+                    self.assertNoBlockingSort(
+                        lambda: ProductRepository.get_all_paginated(1, 5, sort_by, 'asc', query=query, hint=plan.index)
+                    )
+
+    def test_filtered_facets(self):
+        self.assertNoCollectionScan(lambda: ProductRepository.facets({'category': self.category.id}, (0, 100), 10))
+        self.assertNoCollectionScan(lambda: ProductRepository.facets({'brand': 'Dell'}, (0, 100), 10))
+
+    def test_product_lookups(self):
+        self.assertNoCollectionScan(lambda: ProductRepository.get_by_id(str(self.product.id)))
+        self.assertNoCollectionScan(lambda: ProductRepository.get_by_id(str(self.product.id), raw=True))
+        self.assertNoCollectionScan(lambda: list(ProductRepository.get_by_category(str(self.category.id))))
+        self.assertNoCollectionScan(lambda: ProductRepository.find_by_name(self.product.name))
+        self.assertNoCollectionScan(lambda: ProductRepository.search_text(self.product.name, 5))
+        self.assertNoCollectionScan(lambda: ProductRepository.delete(str(ObjectId())))
+        self.assertNoCollectionScan(lambda: ProductRepository.adjust_stock(str(self.product.id), -1))
+        self.assertNoCollectionScan(lambda: ProductRepository.update(str(self.product.id), {'brand': 'Acme'}))
+
+    def test_category_lookups(self):
+        self.assertNoCollectionScan(lambda: ProductCategoryRepository.get_by_name_or_id(str(self.category.id)))
+        self.assertNoCollectionScan(lambda: ProductCategoryRepository.get_by_name_or_id(self.category.name))
+        self.assertNoCollectionScan(lambda: list(ProductCategoryRepository.get_all()))
+        self.assertNoCollectionScan(lambda: ProductCategoryRepository.get_by_ids([self.category.id]))
+        self.assertNoCollectionScan(lambda: ProductCategoryRepository.create_many(
+            [{"name": "Books", "description": "Printed matter"}], skip_duplicates=True
+        ))
+
+    def test_category_cascade_delete(self):
+        self.assertNoCollectionScan(lambda: ProductCategoryRepository.delete(str(self.category.id)))
+
+
+    def test_sync_indexes_keeps_declared_text_index(self):
+        for _ in range(2):
+            output = io.StringIO()
+            call_command('sync_indexes', stdout=output)
+            self.assertNotIn('product_text', output.getvalue())
+            self.assertIn('product_text', Product._get_collection().index_information())
+        self.assertIn('products: indexes up to date', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
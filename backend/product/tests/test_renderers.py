@@ -0,0 +1,102 @@
+import gzip
+import json
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from bson import DBRef, ObjectId
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from product import fast_serializers, middleware
+from product.fast_serializers import dumps
+from product.middleware import CompressionMiddleware, accepted_encodings
+from product.renderers import FastJSONRenderer
+
+
+class TestFastJSONEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "id": ObjectId("65f1c0ffee0000000000abcd"),
+            "category": DBRef("product_category", ObjectId("65f1c0ffee0000000000dcba")),
+            "price": Decimal("19.90"),
+            "created_at": datetime(2025, 3, 1, 20, 0, 0),
+            "name": "Café  ",
+            "tags": [1, 2.5, None, True],
+        }
+
+    def test_native_values_are_rendered(self):
+        self.assertEqual(json.loads(dumps(self.data)), {
+            "id": "65f1c0ffee0000000000abcd",
+            "category": "65f1c0ffee0000000000dcba",
+            "price": "19.90",
+            "created_at": "2025-03-02 01:30:00",
+            "name": "Café  ",
+            "tags": [1, 2.5, None, True],
+        })
+
+    def test_stdlib_fallback_produces_the_same_bytes(self):
+        encoded = dumps(self.data)
+        with patch.object(fast_serializers, "orjson", None):
+            self.assertEqual(dumps(self.data), encoded)
+        self.assertIn(b"\\u2028", encoded)
+
+    def test_unknown_types_are_rejected(self):
+        with self.assertRaises(TypeError):
+            dumps({"value": object()})
+
+    def test_renderer_output(self):
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(None), b"")
+        self.assertEqual(renderer.render({"at": datetime(2025, 1, 1)}), b'{"at":"2025-01-01 05:30:00"}')
+        indented = renderer.render({"at": datetime(2025, 1, 1)}, "application/json; indent=2")
+        self.assertEqual(json.loads(indented), {"at": "2025-01-01 05:30:00"})
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.body = json.dumps([{"name": f"Product {i}", "price": "19.99"} for i in range(200)]).encode()
+
+    def run_middleware(self, response, accept_encoding="gzip, deflate, br"):
+        request = self.factory.get("/api/products/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    @patch.object(middleware, "brotli", None)
+    def test_large_responses_are_gzipped(self):
+        response = self.run_middleware(HttpResponse(self.body, headers={"ETag": '"abc"'}))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_small_responses_are_left_alone(self):
+        response = self.run_middleware(HttpResponse(b'{"id":"1"}'))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, b'{"id":"1"}')
+
+    def test_unaccepted_encodings_are_not_used(self):
+        response = self.run_middleware(HttpResponse(self.body), accept_encoding="identity, gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    @patch.object(middleware, "brotli", None)
+    def test_streaming_responses_are_compressed(self):
+        response = self.run_middleware(StreamingHttpResponse(iter([self.body[:500], self.body[500:]])))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), self.body)
+
+    def test_brotli_is_preferred_when_installed(self):
+        if middleware.brotli is None:
+            self.skipTest("brotli is not installed")
+        response = self.run_middleware(HttpResponse(self.body))
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(middleware.brotli.decompress(response.content), self.body)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings("gzip;q=0.8, br;q=0, deflate"), {"gzip", "deflate"})
+        self.assertEqual(accepted_encodings(None), set())
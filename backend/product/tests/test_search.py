@@ -0,0 +1,79 @@
+import unittest
+from datetime import datetime
+from bson import ObjectId
+from product.search import InMemorySearchIndex, parse_query, tokenize
+from product.services.product_service import ProductService
+
+def make_product(name, brand="Acme", description="General purpose item"):
+    return {"_id": ObjectId(), "name": name, "brand": brand, "description": description, "category": ObjectId(),
+            "price": 9.99, "quantity": 5, "created_at": datetime(2025, 1, 1), "updated_at": datetime(2025, 1, 1)}
+
+class TestInMemorySearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.name_hit = make_product("Gaming Laptop")
+        self.brand_hit = make_product("Notebook Pro", brand="Laptop World")
+        self.description_hit = make_product("Desk Lamp", description="Clips onto any laptop stand")
+        self.other = make_product("Coffee Mug", brand="Dell")
+        self.index = InMemorySearchIndex([self.description_hit, self.brand_hit, self.name_hit, self.other])
+
+    def names(self, hits):
+        return [hit["name"] for hit in hits]
+
+    def test_tokenize_drops_stop_words_and_folds_plurals(self):
+        self.assertEqual(tokenize("The Laptops and Batteries"), ["laptop", "battery"])
+        self.assertEqual(parse_query("laptop -gaming"), ({"laptop"}, {"gaming"}))
+
+    def test_weights_rank_name_over_brand_over_description(self):
+        hits = self.index.search_text("laptops", 10)
+        self.assertEqual(self.names(hits), ["Gaming Laptop", "Notebook Pro", "Desk Lamp"])
+        self.assertTrue(hits[0]["score"] > hits[1]["score"] > hits[2]["score"])
+
+    def test_any_term_matches_and_negation_excludes(self):
+        self.assertCountEqual(self.names(self.index.search_text("mug lamp", 10)), ["Coffee Mug", "Desk Lamp"])
+        self.assertEqual(self.names(self.index.search_text("laptop -gaming", 10)), ["Notebook Pro", "Desk Lamp"])
+
+    def test_after_cursor_continues_ranking(self):
+        first = self.index.search_text("laptop", 1)[0]
+        rest = self.index.search_text("laptop", 10, after=(first["score"], first["_id"]))
+        self.assertEqual(self.names(rest), ["Notebook Pro", "Desk Lamp"])
+
+    def test_remove_and_reindex(self):
+        self.index.remove(self.name_hit["_id"])
+        self.index.add(dict(self.other, name="Laptop Sleeve"))
+        self.assertEqual(self.names(self.index.search_text("laptop", 10)), ["Laptop Sleeve", "Notebook Pro", "Desk Lamp"])
+        self.assertEqual(len(self.index), 3)
+
+class TestSearchProducts(unittest.TestCase):
+
+    def setUp(self):
+        self.products = [make_product(f"Laptop {n}", description="laptop " * n) for n in range(1, 6)]
+        self.original_backend = ProductService.search_backend
+        ProductService.search_backend = InMemorySearchIndex(self.products)
+
+    def tearDown(self):
+        ProductService.search_backend = self.original_backend
+
+    def test_pages_cover_every_hit_once(self):
+        seen, cursor = [], None
+        while True:
+            hits, cursor = ProductService.search_products("laptop", page_size=2, cursor=cursor)
+            seen += [hit["_id"] for hit in hits]
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), sorted(product["_id"] for product in self.products))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_cursor_is_bound_to_its_query(self):
+        _, cursor = ProductService.search_products("laptop", page_size=2)
+        with self.assertRaisesRegex(ValueError, "does not belong"):
+            ProductService.search_products("lamp", page_size=2, cursor=cursor)
+        with self.assertRaisesRegex(ValueError, "Invalid cursor"):
+            ProductService.search_products("laptop", page_size=2, cursor="garbage")
+
+    def test_empty_query_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "required"):
+            ProductService.search_products("   ")
+
+if __name__ == '__main__':
+    unittest.main()
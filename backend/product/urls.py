@@ -18,11 +18,33 @@ Including another URLconf
 from django.urls import path
 from .controllers.product_controller import ProductController  # Import from controller layer
 from .controllers.product_category_controller import ProductCategoryController
+from .controllers.product_stock_controller import ProductStockController
+from .controllers.product_export_controller import ProductExportController
+from .controllers.product_search_controller import ProductSearchController
+from .controllers.product_facet_controller import ProductFacetController
+from .controllers.db_pool_controller import DatabasePoolController
+from .controllers.category_deletion_controller import CategoryDeletionJobController
+from .controllers.category_cache_stats_controller import CategoryCacheStatsController
+from .controllers.async_product_controller import AsyncProductController, AsyncProductCategoryController
 
 urlpatterns = [
     path('products/', ProductController.as_view(), name='product_list'),                    
+    path('products/export/', ProductExportController.as_view(), name='product_export'),
+    path('products/facets/', ProductFacetController.as_view(), name='product_facets'),
+    path('products/search/', ProductSearchController.as_view(), name='product_search'),
+    path('products/stock/', ProductStockController.as_view(), name='product_stock_bulk'),
     path('products/<str:product_id>/', ProductController.as_view(), name='product_detail'),  # Use str for MongoDB ObjectId
+    path('products/<str:product_id>/stock/', ProductStockController.as_view(), name='product_stock'),
     path('categories/', ProductCategoryController.as_view(), name='category_list'),  
+    path('categories/cache-stats/', CategoryCacheStatsController.as_view(), name='category_cache_stats'),
+    path('categories/deletions/<str:job_id>/', CategoryDeletionJobController.as_view(), name='category_deletion_job'),
     path('categories/<str:category_id>/', ProductCategoryController.as_view(), name='category_detail'),
     path('categories/<str:category_id>/products/', ProductCategoryController.as_view(), {'products': True}, name='products_by_category'),
+    path('db/pool-stats/', DatabasePoolController.as_view(), name='db_pool_stats'),
+
+    # Async read paths (serve under ASGI; see django_app/asgi.py)
+    path('async/products/', AsyncProductController.as_view(), name='async_product_list'),
+    path('async/products/<str:product_id>/', AsyncProductController.as_view(), name='async_product_detail'),
+    path('async/categories/', AsyncProductCategoryController.as_view(), name='async_category_list'),
+    path('async/categories/<str:category_id>/products/', AsyncProductCategoryController.as_view(), {'products': True}, name='async_products_by_category'),
 ]
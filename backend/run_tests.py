@@ -1,6 +1,13 @@
 # run_tests.py
+import os
 import unittest
 
+import django
+
+# The controller, renderer and middleware tests need configured settings
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+django.setup()
+
 loader = unittest.TestLoader()
 tests = loader.discover('product/tests')
 testRunner = unittest.TextTestRunner()